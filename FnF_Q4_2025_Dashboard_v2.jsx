@@ -1,5 +1,6 @@
 import React, { useState, useMemo } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, LineChart, Line, PieChart, Pie, Cell, ComposedChart, Area } from 'recharts';
+import { usePeriodData } from './dataShards.js';
 
 // ============================================
 // F&F Corporation Q4 2025 Financial Dashboard
@@ -82,6 +83,9 @@ const saveToStorage = (key, data) => {
   }
 };
 
+// 기간별 조각으로 받아오는 재무제표 (shard_artifacts.STATEMENTS 이름)
+const PERIOD_STATEMENTS = ['financial_detail_data', 'entity_is_data'];
+
 export default function FnFQ4Dashboard() {
   const [activeTab, setActiveTab] = useState('summary');
   const [selectedAccount, setSelectedAccount] = useState('매출액');
@@ -89,6 +93,8 @@ export default function FnFQ4Dashboard() {
   const [isNonOperatingExpanded, setIsNonOperatingExpanded] = useState(false);
   const [incomeViewMode, setIncomeViewMode] = useState('quarter'); // 'quarter' | 'annual'
   const [selectedPeriod, setSelectedPeriod] = useState('2025_Q4'); // 선택된 조회기간 ('2025_Q1' ~ '2025_Q4')
+  // 선택 기간 + 비교 기간의 분기 조각만 로드 (public/data/manifest.json, shard_artifacts.py)
+  const { data: periodData, loading: periodLoading, error: periodError } = usePeriodData(PERIOD_STATEMENTS, selectedPeriod);
   const [incomeEditMode, setIncomeEditMode] = useState(false); // 손익계산서 증감 분석 편집 모드
   const [bsEditMode, setBsEditMode] = useState(false); // 재무상태표 증감 분석 편집 모드
   const [incomeEditData, setIncomeEditData] = useState(() => loadFromStorage(STORAGE_KEYS.INCOME_EDIT)); // localStorage에서 초기값 로드
@@ -664,104 +670,10 @@ export default function FnFQ4Dashboard() {
       당기순이익: 402711,    // 연결 당기순이익
     },
   };
-
-  // ============================================
-  // 손익계산서 세부 계정 데이터 (증감 분석용) - financial_detail_data.json 기반
   // ============================================
-  const incomeDetailData = {
-    '2024_1Q_Year': { 매출액: 507029, 제품매출: 165016, 상품매출: 5934, 수수료매출: 360, 임대매출: 68, 기타매출: 3595, 매출원가: 174545, 매출총이익: 332484, 판매비와관리비: 202273, 급여: 18472, 퇴직급여: 1186, 복리후생비: 3796, 광고선전비: 24097, 운반비: 6120, 지급수수료: 112650, 감가상각비: 18718, 무형자산상각비: 1847, 영업이익: 130211 },
-    '2024_1Q': { 매출액: 507029, 제품매출: 165016, 상품매출: 5934, 수수료매출: 360, 임대매출: 68, 기타매출: 3595, 매출원가: 174545, 매출총이익: 332484, 판매비와관리비: 202273, 급여: 18472, 퇴직급여: 1186, 복리후생비: 3796, 광고선전비: 24097, 운반비: 6120, 지급수수료: 112650, 감가상각비: 18718, 무형자산상각비: 1847, 영업이익: 130211 },
-    '2024_2Q_Year': { 매출액: 898502, 제품매출: 278476, 상품매출: 8382, 수수료매출: 716, 임대매출: 138, 기타매출: 7862, 매출원가: 294719, 매출총이익: 603782, 판매비와관리비: 381770, 급여: 39262, 퇴직급여: 2398, 복리후생비: 7263, 광고선전비: 41052, 운반비: 9961, 지급수수료: 211146, 감가상각비: 38092, 무형자산상각비: 4011, 영업이익: 222012 },
-    '2024_2Q': { 매출액: 391473, 제품매출: 113459, 상품매출: 2448, 수수료매출: 356, 임대매출: 70, 기타매출: 4267, 매출원가: 120174, 매출총이익: 271299, 판매비와관리비: 179497, 급여: 20790, 퇴직급여: 1212, 복리후생비: 3467, 광고선전비: 16955, 운반비: 3840, 지급수수료: 98496, 감가상각비: 19373, 무형자산상각비: 2164, 영업이익: 91801 },
-    '2024_3Q_Year': { 매출액: 1349465, 제품매출: 427107, 상품매출: 10931, 수수료매출: 1018, 임대매출: 208, 기타매출: 22723, 매출원가: 460761, 매출총이익: 888704, 판매비와관리비: 558387, 급여: 58004, 퇴직급여: 3581, 복리후생비: 11135, 광고선전비: 60954, 운반비: 15655, 지급수수료: 301915, 감가상각비: 57437, 무형자산상각비: 7933, 영업이익: 330317 },
-    '2024_3Q': { 매출액: 450963, 제품매출: 148632, 상품매출: 2549, 수수료매출: 302, 임대매출: 70, 기타매출: 14861, 매출원가: 166042, 매출총이익: 284921, 판매비와관리비: 176616, 급여: 18742, 퇴직급여: 1184, 복리후생비: 3872, 광고선전비: 19902, 운반비: 5695, 지급수수료: 90769, 감가상각비: 19346, 무형자산상각비: 3921, 영업이익: 108305 },
-    '2024_4Q_Year': { 매출액: 1896010, 제품매출: 602266, 상품매출: 15361, 수수료매출: 1475, 임대매출: 278, 기타매출: 31390, 매출원가: 649017, 매출총이익: 1246993, 판매비와관리비: 796255, 급여: 79511, 퇴직급여: 4759, 복리후생비: 15120, 광고선전비: 93133, 운반비: 22114, 지급수수료: 431368, 감가상각비: 77149, 무형자산상각비: 11660, 영업이익: 450737 },
-    '2024_4Q': { 매출액: 546544, 제품매출: 175158, 상품매출: 4430, 수수료매출: 458, 임대매출: 70, 기타매출: 8667, 매출원가: 188256, 매출총이익: 358289, 판매비와관리비: 237868, 급여: 21507, 퇴직급여: 1178, 복리후생비: 3985, 광고선전비: 32179, 운반비: 6459, 지급수수료: 129453, 감가상각비: 19712, 무형자산상각비: 3728, 영업이익: 120420 },
-    '2024_Year': { 매출액: 1896010, 제품매출: 602266, 상품매출: 15361, 수수료매출: 1475, 임대매출: 278, 기타매출: 31390, 매출원가: 649017, 매출총이익: 1246993, 판매비와관리비: 796255, 급여: 79511, 퇴직급여: 4759, 복리후생비: 15120, 광고선전비: 93133, 운반비: 22114, 지급수수료: 431368, 감가상각비: 77149, 무형자산상각비: 11660, 영업이익: 450737 },
-    '2025_1Q_Year': { 매출액: 505616, 제품매출: 170204, 상품매출: 3836, 수수료매출: 324, 임대매출: 71, 기타매출: 1842, 매출원가: 175883, 매출총이익: 329733, 판매비와관리비: 206117, 급여: 20176, 퇴직급여: 1462, 복리후생비: 4424, 광고선전비: 24609, 운반비: 5928, 지급수수료: 108860, 감가상각비: 20870, 무형자산상각비: 3638, 영업이익: 123616 },
-    '2025_1Q': { 매출액: 505616, 제품매출: 170204, 상품매출: 3836, 수수료매출: 324, 임대매출: 71, 기타매출: 1842, 매출원가: 175883, 매출총이익: 329733, 판매비와관리비: 206117, 급여: 20176, 퇴직급여: 1462, 복리후생비: 4424, 광고선전비: 24609, 운반비: 5928, 지급수수료: 108860, 감가상각비: 20870, 무형자산상각비: 3638, 영업이익: 123616 },
-    '2025_2Q_Year': { 매출액: 884487, 제품매출: 284912, 상품매출: 6144, 수수료매출: 593, 임대매출: 449, 기타매출: 4560, 매출원가: 295847, 매출총이익: 588640, 판매비와관리비: 380993, 급여: 39940, 퇴직급여: 2575, 복리후생비: 8368, 광고선전비: 44148, 운반비: 10444, 지급수수료: 199507, 감가상각비: 39444, 무형자산상각비: 7179, 영업이익: 207646 },
-    '2025_2Q': { 매출액: 378871, 제품매출: 114708, 상품매출: 2308, 수수료매출: 268, 임대매출: 378, 기타매출: 2717, 매출원가: 119964, 매출총이익: 258906, 판매비와관리비: 174877, 급여: 19763, 퇴직급여: 1112, 복리후생비: 3944, 광고선전비: 19539, 운반비: 4516, 지급수수료: 90646, 감가상각비: 18574, 무형자산상각비: 3542, 영업이익: 84030 },
-    '2025_3Q_Year': { 매출액: 1358744, 제품매출: 441007, 상품매출: 9784, 수수료매출: 811, 임대매출: 1013, 기타매출: 9948, 매출원가: 461150, 매출총이익: 897594, 판매비와관리비: 561928, 급여: 59251, 퇴직급여: 3529, 복리후생비: 12092, 광고선전비: 69180, 운반비: 16761, 지급수수료: 287096, 감가상각비: 58133, 무형자산상각비: 10753, 영업이익: 335666 },
-    '2025_3Q': { 매출액: 474257, 제품매출: 156095, 상품매출: 3640, 수수료매출: 218, 임대매출: 564, 기타매출: 5389, 매출원가: 165303, 매출총이익: 308955, 판매비와관리비: 180935, 급여: 19311, 퇴직급여: 955, 복리후생비: 3725, 광고선전비: 25032, 운반비: 6317, 지급수수료: 87590, 감가상각비: 18689, 무형자산상각비: 3573, 영업이익: 128020 },
-    '2025_4Q_Year': { 매출액: 1933996, 제품매출: 610308, 상품매출: 15937, 수수료매출: 1160, 임대매출: 1731, 기타매출: 15333, 매출원가: 642187, 매출총이익: 1291809, 판매비와관리비: 823266, 급여: 80199, 퇴직급여: 4612, 복리후생비: 16516, 광고선전비: 109084, 운반비: 24855, 지급수수료: 434024, 감가상각비: 77445, 무형자산상각비: 14402, 영업이익: 468543 },
-    '2025_4Q': { 매출액: 575252, 제품매출: 169301, 상품매출: 6153, 수수료매출: 349, 임대매출: 718, 기타매출: 5385, 매출원가: 181038, 매출총이익: 394214, 판매비와관리비: 261337, 급여: 20948, 퇴직급여: 1083, 복리후생비: 4423, 광고선전비: 39905, 운반비: 8094, 지급수수료: 146928, 감가상각비: 19312, 무형자산상각비: 3650, 영업이익: 132877 },
-    '2025_Year': { 매출액: 1933996, 제품매출: 610308, 상품매출: 15937, 수수료매출: 1160, 임대매출: 1731, 기타매출: 15333, 매출원가: 642187, 매출총이익: 1291809, 판매비와관리비: 823266, 급여: 80199, 퇴직급여: 4612, 복리후생비: 16516, 광고선전비: 109084, 운반비: 24855, 지급수수료: 434024, 감가상각비: 77445, 무형자산상각비: 14402, 영업이익: 468543 },
-  };
-
+  // 손익계산서 세부 계정 데이터 (증감 분석용) - financial_detail_data.json 분기 조각에서 선택/비교 기간만 로드
   // ============================================
-  // 법인별 세부 계정 데이터 (증감 분석용) - financial_detail_data.json 기반
-  // ============================================
-  const entityDetailData = {
-    '매출액': {
-      '2024_1Q': { 'OC(국내)': 388852, '중국': 238976, '홍콩': 22211, '베트남': 66, '빅텐츠': 212, '엔터테인먼트': 416, 'ST미국': 9208 },
-      '2024_1Q_Year': { 'OC(국내)': 388852, '중국': 238976, '홍콩': 22211, '베트남': 66, '빅텐츠': 212, '엔터테인먼트': 416, 'ST미국': 9208 },
-      '2024_2Q': { 'OC(국내)': 664484, '중국': 393520, '홍콩': 39176, '베트남': 150, '빅텐츠': 900, '엔터테인먼트': 1424, 'ST미국': 18600 },
-      '2024_2Q_Year': { 'OC(국내)': 664484, '중국': 393520, '홍콩': 39176, '베트남': 150, '빅텐츠': 900, '엔터테인먼트': 1424, 'ST미국': 18600 },
-      '2024_3Q': { 'OC(국내)': 1081765, '중국': 643675, '홍콩': 54736, '베트남': 259, '빅텐츠': 9175, '엔터테인먼트': 2203, 'ST미국': 26856 },
-      '2024_3Q_Year': { 'OC(국내)': 1081765, '중국': 643675, '홍콩': 54736, '베트남': 259, '빅텐츠': 9175, '엔터테인먼트': 2203, 'ST미국': 26856 },
-      '2024_4Q': { 'OC(국내)': 1517994, '중국': 857840, '홍콩': 75035, '베트남': 413, '빅텐츠': 9175, '엔터테인먼트': 3030, 'ST미국': 37069 },
-      '2024_4Q_Year': { 'OC(국내)': 1517994, '중국': 857840, '홍콩': 75035, '베트남': 413, '빅텐츠': 9175, '엔터테인먼트': 3030, 'ST미국': 37069 },
-      '2024_Year': { 'OC(국내)': 1517994, '중국': 857840, '홍콩': 75035, '베트남': 413, '빅텐츠': 9175, '엔터테인먼트': 3030, 'ST미국': 37069 },
-      '2025_1Q': { 'OC(국내)': 396770, '중국': 258540, '홍콩': 20663, '베트남': 134, '빅텐츠': 0, '엔터테인먼트': 761, 'ST미국': 8505 },
-      '2025_1Q_Year': { 'OC(국내)': 396770, '중국': 258540, '홍콩': 20663, '베트남': 134, '빅텐츠': 0, '엔터테인먼트': 761, 'ST미국': 8505 },
-      '2025_2Q': { 'OC(국내)': 704163, '중국': 429243, '홍콩': 36405, '베트남': 287, '빅텐츠': 0, '엔터테인먼트': 1894, 'ST미국': 17474 },
-      '2025_2Q_Year': { 'OC(국내)': 704163, '중국': 429243, '홍콩': 36405, '베트남': 287, '빅텐츠': 0, '엔터테인먼트': 1894, 'ST미국': 17474 },
-      '2025_3Q': { 'OC(국내)': 1214834, '중국': 713162, '홍콩': 53313, '베트남': 425, '빅텐츠': 0, '엔터테인먼트': 4630, 'ST미국': 33406 },
-      '2025_3Q_Year': { 'OC(국내)': 1214834, '중국': 713162, '홍콩': 53313, '베트남': 425, '빅텐츠': 0, '엔터테인먼트': 4630, 'ST미국': 33406 },
-      '2025_4Q': { 'OC(국내)': 1694696, '중국': 960334, '홍콩': 76275, '베트남': 656, '빅텐츠': 0, '엔터테인먼트': 7161, 'ST미국': 48561 },
-      '2025_4Q_Year': { 'OC(국내)': 1694696, '중국': 960334, '홍콩': 76275, '베트남': 656, '빅텐츠': 0, '엔터테인먼트': 7161, 'ST미국': 48561 },
-      '2025_Year': { 'OC(국내)': 1694696, '중국': 960334, '홍콩': 76275, '베트남': 656, '빅텐츠': 0, '엔터테인먼트': 7161, 'ST미국': 48561 },
-    },
-    '제품매출': {
-      '2024_1Q': { 'OC(국내)': 142846, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 0 },
-      '2024_Year': { 'OC(국내)': 533273, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 0 },
-      '2025_1Q': { 'OC(국내)': 142911, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 0 },
-      '2025_Year': { 'OC(국내)': 613289, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 0 },
-    },
-    '상품매출': {
-      '2024_1Q': { 'OC(국내)': 4011, '중국': 173679, '홍콩': 9231, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 1923 },
-      '2024_Year': { 'OC(국내)': 6887, '중국': 664166, '홍콩': 32067, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 8474 },
-      '2025_1Q': { 'OC(국내)': 1593, '중국': 203778, '홍콩': 9671, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 2243 },
-      '2025_Year': { 'OC(국내)': 3210, '중국': 731265, '홍콩': 34810, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 12727 },
-    },
-    '급여': {
-      '2024_1Q': { 'OC(국내)': 8781, '중국': 6513, '홍콩': 1928, '베트남': 0, '빅텐츠': 181, '엔터테인먼트': 312, 'ST미국': 706 },
-      '2024_Year': { 'OC(국내)': 39082, '중국': 26130, '홍콩': 7811, '베트남': 0, '빅텐츠': 587, '엔터테인먼트': 1419, 'ST미국': 4165 },
-      '2025_1Q': { 'OC(국내)': 8629, '중국': 7851, '홍콩': 2109, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 391, 'ST미국': 1089 },
-      '2025_Year': { 'OC(국내)': 36167, '중국': 28888, '홍콩': 8945, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 1684, 'ST미국': 3961 },
-    },
-    '퇴직급여': {
-      '2024_1Q': { 'OC(국내)': 1156, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 14, '엔터테인먼트': 16, 'ST미국': 0 },
-      '2024_Year': { 'OC(국내)': 4610, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 52, '엔터테인먼트': 97, 'ST미국': 0 },
-      '2025_1Q': { 'OC(국내)': 1127, '중국': 0, '홍콩': 301, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 35, 'ST미국': 0 },
-      '2025_Year': { 'OC(국내)': 4360, '중국': 0, '홍콩': 0, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 252, 'ST미국': 0 },
-    },
-    '광고선전비': {
-      '2024_1Q': { 'OC(국내)': 10689, '중국': 12045, '홍콩': 422, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 3, 'ST미국': 937 },
-      '2024_Year': { 'OC(국내)': 40355, '중국': 45269, '홍콩': 2014, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 7, 'ST미국': 5489 },
-      '2025_1Q': { 'OC(국내)': 8143, '중국': 14554, '홍콩': 534, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 1379 },
-      '2025_Year': { 'OC(국내)': 36492, '중국': 60570, '홍콩': 2817, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 0, 'ST미국': 9277 },
-    },
-    '지급수수료': {
-      '2024_1Q': { 'OC(국내)': 103398, '중국': 6675, '홍콩': 3518, '베트남': 1, '빅텐츠': 106, '엔터테인먼트': 43, 'ST미국': 1537 },
-      '2024_Year': { 'OC(국내)': 396902, '중국': 26100, '홍콩': 4302, '베트남': 19, '빅텐츠': 355, '엔터테인먼트': 155, 'ST미국': 4518 },
-      '2025_1Q': { 'OC(국내)': 98102, '중국': 8799, '홍콩': 1124, '베트남': 5, '빅텐츠': 0, '엔터테인먼트': 32, 'ST미국': 1129 },
-      '2025_Year': { 'OC(국내)': 379344, '중국': 34725, '홍콩': 2569, '베트남': 31, '빅텐츠': 0, '엔터테인먼트': 160, 'ST미국': 16606 },
-    },
-    '감가상각비': {
-      '2024_1Q': { 'OC(국내)': 9393, '중국': 5228, '홍콩': 3786, '베트남': 0, '빅텐츠': 41, '엔터테인먼트': 129, 'ST미국': 142 },
-      '2024_Year': { 'OC(국내)': 37807, '중국': 23909, '홍콩': 14320, '베트남': 0, '빅텐츠': 117, '엔터테인먼트': 562, 'ST미국': 434 },
-      '2025_1Q': { 'OC(국내)': 9949, '중국': 7530, '홍콩': 3123, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 157, 'ST미국': 110 },
-      '2025_Year': { 'OC(국내)': 40274, '중국': 24619, '홍콩': 11457, '베트남': 0, '빅텐츠': 0, '엔터테인먼트': 644, 'ST미국': 450 },
-    },
-    '영업이익': {
-      '2024_1Q': { 'OC(국내)': 95454, '중국': 24682, '홍콩': 650, '베트남': -3, '빅텐츠': -191, '엔터테인먼트': -2980, 'ST미국': 2591 },
-      '2024_Year': { 'OC(국내)': 402407, '중국': 36099, '홍콩': 3357, '베트남': 45, '빅텐츠': -4678, '엔터테인먼트': -14173, 'ST미국': 6903 },
-      '2025_1Q': { 'OC(국내)': 111978, '중국': 6110, '홍콩': 3, '베트남': 12, '빅텐츠': 0, '엔터테인먼트': -1538, 'ST미국': 996 },
-      '2025_Year': { 'OC(국내)': 524452, '중국': 40209, '홍콩': 1617, '베트남': 18, '빅텐츠': 0, '엔터테인먼트': -8707, 'ST미국': -1368 },
-    },
-  };
+  const incomeDetailData = periodData.financial_detail_data?.incomeDetailData || {};
 
   // ============================================
   // 문장형 증감 분석 생성 함수
@@ -1541,188 +1453,26 @@ export default function FnFQ4Dashboard() {
   // ============================================
   // 법인별 데이터 (선택된 과목에 따라) - 분기 및 누적
   // 주의: 법인별 데이터는 연결조정 전 법인별 합산 기준
-  // entity_is_data.json에서 자동 생성 (5개 법인: OC(국내), 중국, 홍콩, ST미국, 기타(연결조정))
-  const entityData = {
-    '매출액': {
-      '2024_1Q': { 'OC(국내)': 388851, '중국': 238976, '홍콩': 22210, 'ST미국': 9208, '기타': -152217 },
-      '2024_1Q_Year': { 'OC(국내)': 388851, '중국': 238976, '홍콩': 22210, 'ST미국': 9208, '기타': -152217 },
-      '2024_2Q': { 'OC(국내)': 275632, '중국': 154543, '홍콩': 16965, 'ST미국': 9391, '기타': -65059 },
-      '2024_2Q_Year': { 'OC(국내)': 664483, '중국': 393519, '홍콩': 39175, 'ST미국': 18599, '기타': -217276 },
-      '2024_3Q': { 'OC(국내)': 417280, '중국': 250154, '홍콩': 15559, 'ST미국': 8255, '기타': -240285 },
-      '2024_3Q_Year': { 'OC(국내)': 1081763, '중국': 643673, '홍콩': 54734, 'ST미국': 26854, '기타': -457561 },
-      '2024_4Q': { 'OC(국내)': 436229, '중국': 214165, '홍콩': 20299, 'ST미국': 10212, '기타': -134361 },
-      '2024_Year': { 'OC(국내)': 1517992, '중국': 857838, '홍콩': 75033, 'ST미국': 37066, '기타': -591922 },
-      '2025_1Q': { 'OC(국내)': 396770, '중국': 258540, '홍콩': 20662, 'ST미국': 8505, '기타': -178861 },
-      '2025_1Q_Year': { 'OC(국내)': 396770, '중국': 258540, '홍콩': 20662, 'ST미국': 8505, '기타': -178861 },
-      '2025_2Q': { 'OC(국내)': 307392, '중국': 170703, '홍콩': 15742, 'ST미국': 8968, '기타': -123935 },
-      '2025_2Q_Year': { 'OC(국내)': 704162, '중국': 429243, '홍콩': 36404, 'ST미국': 17473, '기타': -302796 },
-      '2025_3Q': { 'OC(국내)': 510670, '중국': 283919, '홍콩': 16908, 'ST미국': 15931, '기타': -353171 },
-      '2025_3Q_Year': { 'OC(국내)': 1214832, '중국': 713162, '홍콩': 53312, 'ST미국': 33404, '기타': -655967 },
-      '2025_4Q': { 'OC(국내)': 479861, '중국': 247171, '홍콩': 22961, 'ST미국': 15155, '기타': -189897 },
-      '2025_Year': { 'OC(국내)': 1694693, '중국': 960333, '홍콩': 76273, 'ST미국': 48559, '기타': -845864 },
-    },
-    '매출원가': {
-      '2024_1Q': { 'OC(국내)': 147627, '중국': 173679, '홍콩': 9231, 'ST미국': 2030, '기타': -158023 },
-      '2024_1Q_Year': { 'OC(국내)': 147627, '중국': 173679, '홍콩': 9231, 'ST미국': 2030, '기타': -158023 },
-      '2024_2Q': { 'OC(국내)': 89805, '중국': 103635, '홍콩': 7228, 'ST미국': 2144, '기타': -82638 },
-      '2024_2Q_Year': { 'OC(국내)': 237432, '중국': 277314, '홍콩': 16459, 'ST미국': 4174, '기타': -240661 },
-      '2024_3Q': { 'OC(국내)': 158791, '중국': 198826, '홍콩': 7135, 'ST미국': 2240, '기타': -200950 },
-      '2024_3Q_Year': { 'OC(국내)': 396223, '중국': 476140, '홍콩': 23594, 'ST미국': 6414, '기타': -441611 },
-      '2024_4Q': { 'OC(국내)': 147388, '중국': 188024, '홍콩': 8471, 'ST미국': 2592, '기타': -158220 },
-      '2024_Year': { 'OC(국내)': 543611, '중국': 664164, '홍콩': 32065, 'ST미국': 9006, '기타': -599831 },
-      '2025_1Q': { 'OC(국내)': 145093, '중국': 203777, '홍콩': 9671, 'ST미국': 1966, '기타': -184625 },
-      '2025_1Q_Year': { 'OC(국내)': 145093, '중국': 203777, '홍콩': 9671, 'ST미국': 1966, '기타': -184625 },
-      '2025_2Q': { 'OC(국내)': 102777, '중국': 135221, '홍콩': 6988, 'ST미국': 2337, '기타': -127359 },
-      '2025_2Q_Year': { 'OC(국내)': 247870, '중국': 338998, '홍콩': 16659, 'ST미국': 4303, '기타': -311984 },
-      '2025_3Q': { 'OC(국내)': 202040, '중국': 208506, '홍콩': 8019, 'ST미국': 2844, '기타': -256107 },
-      '2025_3Q_Year': { 'OC(국내)': 449910, '중국': 547504, '홍콩': 24678, 'ST미국': 7147, '기타': -568091 },
-      '2025_4Q': { 'OC(국내)': 170198, '중국': 183758, '홍콩': 10131, 'ST미국': 5427, '기타': -188477 },
-      '2025_Year': { 'OC(국내)': 620108, '중국': 731262, '홍콩': 34809, 'ST미국': 12574, '기타': -756568 },
-    },
-    '매출총이익': {
-      '2024_1Q': { 'OC(국내)': 241223, '중국': 65297, '홍콩': 12979, 'ST미국': 7177, '기타': 5807 },
-      '2024_1Q_Year': { 'OC(국내)': 241223, '중국': 65297, '홍콩': 12979, 'ST미국': 7177, '기타': 5807 },
-      '2024_2Q': { 'OC(국내)': 185826, '중국': 50908, '홍콩': 9736, 'ST미국': 7246, '기타': 17582 },
-      '2024_2Q_Year': { 'OC(국내)': 427049, '중국': 116205, '홍콩': 22715, 'ST미국': 14423, '기타': 23389 },
-      '2024_3Q': { 'OC(국내)': 258489, '중국': 51327, '홍콩': 8424, 'ST미국': 6015, '기타': -39334 },
-      '2024_3Q_Year': { 'OC(국내)': 685538, '중국': 167532, '홍콩': 31139, 'ST미국': 20438, '기타': -15945 },
-      '2024_4Q': { 'OC(국내)': 288841, '중국': 26140, '홍콩': 11827, 'ST미국': 7620, '기타': 23860 },
-      '2024_Year': { 'OC(국내)': 974379, '중국': 193672, '홍콩': 42966, 'ST미국': 28058, '기타': 7915 },
-      '2025_1Q': { 'OC(국내)': 251676, '중국': 54762, '홍콩': 10991, 'ST미국': 6539, '기타': 5765 },
-      '2025_1Q_Year': { 'OC(국내)': 251676, '중국': 54762, '홍콩': 10991, 'ST미국': 6539, '기타': 5765 },
-      '2025_2Q': { 'OC(국내)': 204615, '중국': 35481, '홍콩': 8754, 'ST미국': 6631, '기타': 3425 },
-      '2025_2Q_Year': { 'OC(국내)': 456291, '중국': 90243, '홍콩': 19745, 'ST미국': 13170, '기타': 9190 },
-      '2025_3Q': { 'OC(국내)': 308629, '중국': 75412, '홍콩': 8888, 'ST미국': 13087, '기타': -97062 },
-      '2025_3Q_Year': { 'OC(국내)': 764920, '중국': 165655, '홍콩': 28633, 'ST미국': 26257, '기타': -87872 },
-      '2025_4Q': { 'OC(국내)': 309663, '중국': 63413, '홍콩': 12830, 'ST미국': 9727, '기타': -1419 },
-      '2025_Year': { 'OC(국내)': 1074583, '중국': 229068, '홍콩': 41463, 'ST미국': 35984, '기타': -89291 },
-    },
-    '인건비': {
-      '2024_1Q': { 'OC(국내)': 9937, '중국': 6512, '홍콩': 1928, 'ST미국': 705, '기타': 576 },
-      '2024_1Q_Year': { 'OC(국내)': 9937, '중국': 6512, '홍콩': 1928, 'ST미국': 705, '기타': 576 },
-      '2024_2Q': { 'OC(국내)': 11938, '중국': 6388, '홍콩': 1977, 'ST미국': 1061, '기타': 636 },
-      '2024_2Q_Year': { 'OC(국내)': 21875, '중국': 12900, '홍콩': 3905, 'ST미국': 1766, '기타': 1212 },
-      '2024_3Q': { 'OC(국내)': 10187, '중국': 6042, '홍콩': 1724, 'ST미국': 1270, '기타': 702 },
-      '2024_3Q_Year': { 'OC(국내)': 32062, '중국': 18942, '홍콩': 5629, 'ST미국': 3036, '기타': 1914 },
-      '2024_4Q': { 'OC(국내)': 11626, '중국': 7185, '홍콩': 2181, 'ST미국': 1128, '기타': 563 },
-      '2024_Year': { 'OC(국내)': 43688, '중국': 26127, '홍콩': 7810, 'ST미국': 4164, '기타': 2477 },
-      '2025_1Q': { 'OC(국내)': 9754, '중국': 7850, '홍콩': 2409, 'ST미국': 1088, '기타': 537 },
-      '2025_1Q_Year': { 'OC(국내)': 9754, '중국': 7850, '홍콩': 2409, 'ST미국': 1088, '기타': 537 },
-      '2025_2Q': { 'OC(국내)': 10692, '중국': 7019, '홍콩': 1717, 'ST미국': 822, '기타': 625 },
-      '2025_2Q_Year': { 'OC(국내)': 20446, '중국': 14869, '홍콩': 4126, 'ST미국': 1910, '기타': 1162 },
-      '2025_3Q': { 'OC(국내)': 9632, '중국': 6734, '홍콩': 2155, 'ST미국': 1043, '기타': 701 },
-      '2025_3Q_Year': { 'OC(국내)': 30078, '중국': 21603, '홍콩': 6281, 'ST미국': 2953, '기타': 1863 },
-      '2025_4Q': { 'OC(국내)': 10445, '중국': 7284, '홍콩': 2661, 'ST미국': 1006, '기타': 633 },
-      '2025_Year': { 'OC(국내)': 40523, '중국': 28887, '홍콩': 8942, 'ST미국': 3959, '기타': 2496 },
-    },
-    '광고선전비': {
-      '2024_1Q': { 'OC(국내)': 10689, '중국': 12044, '홍콩': 422, 'ST미국': 937, '기타': 4 },
-      '2024_1Q_Year': { 'OC(국내)': 10689, '중국': 12044, '홍콩': 422, 'ST미국': 937, '기타': 4 },
-      '2024_2Q': { 'OC(국내)': 9145, '중국': 5745, '홍콩': 634, 'ST미국': 1430, '기타': 1 },
-      '2024_2Q_Year': { 'OC(국내)': 19834, '중국': 17789, '홍콩': 1056, 'ST미국': 2367, '기타': 5 },
-      '2024_3Q': { 'OC(국내)': 7102, '중국': 10838, '홍콩': 415, 'ST미국': 1542, '기타': 5 },
-      '2024_3Q_Year': { 'OC(국내)': 26936, '중국': 28627, '홍콩': 1471, 'ST미국': 3909, '기타': 10 },
-      '2024_4Q': { 'OC(국내)': 13417, '중국': 16640, '홍콩': 541, 'ST미국': 1578, '기타': 2 },
-      '2024_Year': { 'OC(국내)': 40353, '중국': 45267, '홍콩': 2012, 'ST미국': 5487, '기타': 12 },
-      '2025_1Q': { 'OC(국내)': 8142, '중국': 14553, '홍콩': 533, 'ST미국': 1379, '기타': 2 },
-      '2025_1Q_Year': { 'OC(국내)': 8142, '중국': 14553, '홍콩': 533, 'ST미국': 1379, '기타': 2 },
-      '2025_2Q': { 'OC(국내)': 8488, '중국': 9118, '홍콩': 554, 'ST미국': 1386, '기타': -7 },
-      '2025_2Q_Year': { 'OC(국내)': 16630, '중국': 23671, '홍콩': 1087, 'ST미국': 2765, '기타': -5 },
-      '2025_3Q': { 'OC(국내)': 6683, '중국': 16327, '홍콩': 584, 'ST미국': 1462, '기타': -25 },
-      '2025_3Q_Year': { 'OC(국내)': 23313, '중국': 39998, '홍콩': 1671, 'ST미국': 4227, '기타': -30 },
-      '2025_4Q': { 'OC(국내)': 13177, '중국': 20569, '홍콩': 1144, 'ST미국': 5049, '기타': -35 },
-      '2025_Year': { 'OC(국내)': 36490, '중국': 60567, '홍콩': 2815, 'ST미국': 9276, '기타': -65 },
-    },
-    '수수료': {
-      '2024_1Q': { 'OC(국내)': 103398, '중국': 6674, '홍콩': 3517, 'ST미국': 1537, '기타': -2477 },
-      '2024_1Q_Year': { 'OC(국내)': 103398, '중국': 6674, '홍콩': 3517, 'ST미국': 1537, '기타': -2477 },
-      '2024_2Q': { 'OC(국내)': 89435, '중국': 6021, '홍콩': 495, 'ST미국': 2037, '기타': 508 },
-      '2024_2Q_Year': { 'OC(국내)': 192833, '중국': 12695, '홍콩': 4012, 'ST미국': 3574, '기타': -1969 },
-      '2024_3Q': { 'OC(국내)': 82954, '중국': 4851, '홍콩': -263, 'ST미국': 2108, '기타': 1119 },
-      '2024_3Q_Year': { 'OC(국내)': 275787, '중국': 17546, '홍콩': 3749, 'ST미국': 5682, '기타': -850 },
-      '2024_4Q': { 'OC(국내)': 121113, '중국': 8552, '홍콩': 551, 'ST미국': -1166, '기타': 402 },
-      '2024_Year': { 'OC(국내)': 396900, '중국': 26098, '홍콩': 4300, 'ST미국': 4516, '기타': -448 },
-      '2025_1Q': { 'OC(국내)': 98102, '중국': 8798, '홍콩': 1124, 'ST미국': 1128, '기타': -292 },
-      '2025_1Q_Year': { 'OC(국내)': 98102, '중국': 8798, '홍콩': 1124, 'ST미국': 1128, '기타': -292 },
-      '2025_2Q': { 'OC(국내)': 82021, '중국': 7042, '홍콩': 892, 'ST미국': 1403, '기타': -712 },
-      '2025_2Q_Year': { 'OC(국내)': 180123, '중국': 15840, '홍콩': 2016, 'ST미국': 2531, '기타': -1004 },
-      '2025_3Q': { 'OC(국내)': 78829, '중국': 6166, '홍콩': 1202, 'ST미국': 1306, '기타': 86 },
-      '2025_3Q_Year': { 'OC(국내)': 258952, '중국': 22006, '홍콩': 3218, 'ST미국': 3837, '기타': -918 },
-      '2025_4Q': { 'OC(국내)': 120391, '중국': 12717, '홍콩': -650, 'ST미국': 12768, '기타': 1701 },
-      '2025_Year': { 'OC(국내)': 379343, '중국': 34723, '홍콩': 2568, 'ST미국': 16605, '기타': 783 },
-    },
-    '감가상각비': {
-      '2024_1Q': { 'OC(국내)': 10413, '중국': 5331, '홍콩': 3792, 'ST미국': 148, '기타': 880 },
-      '2024_1Q_Year': { 'OC(국내)': 10413, '중국': 5331, '홍콩': 3792, 'ST미국': 148, '기타': 880 },
-      '2024_2Q': { 'OC(국내)': 10777, '중국': 6017, '홍콩': 3759, 'ST미국': -150, '기타': 1134 },
-      '2024_2Q_Year': { 'OC(국내)': 21190, '중국': 11348, '홍콩': 7551, 'ST미국': -2, '기타': 2014 },
-      '2024_3Q': { 'OC(국내)': 11821, '중국': 6247, '홍콩': 3540, 'ST미국': 344, '기타': 1314 },
-      '2024_3Q_Year': { 'OC(국내)': 33011, '중국': 17595, '홍콩': 11091, 'ST미국': 342, '기타': 3328 },
-      '2024_4Q': { 'OC(국내)': 12446, '중국': 6711, '홍콩': 3263, 'ST미국': 120, '기타': 898 },
-      '2024_Year': { 'OC(국내)': 45457, '중국': 24306, '홍콩': 14354, 'ST미국': 462, '기타': 4226 },
-      '2025_1Q': { 'OC(국내)': 12795, '중국': 7629, '홍콩': 3123, 'ST미국': 118, '기타': 842 },
-      '2025_1Q_Year': { 'OC(국내)': 12795, '중국': 7629, '홍콩': 3123, 'ST미국': 118, '기타': 842 },
-      '2025_2Q': { 'OC(국내)': 13172, '중국': 6120, '홍콩': 1876, 'ST미국': 121, '기타': 825 },
-      '2025_2Q_Year': { 'OC(국내)': 25967, '중국': 13749, '홍콩': 4999, 'ST미국': 239, '기타': 1667 },
-      '2025_3Q': { 'OC(국내)': 12849, '중국': 5468, '홍콩': 3008, 'ST미국': 118, '기타': 818 },
-      '2025_3Q_Year': { 'OC(국내)': 38816, '중국': 19217, '홍콩': 8007, 'ST미국': 357, '기타': 2485 },
-      '2025_4Q': { 'OC(국내)': 12720, '중국': 5799, '홍콩': 3462, 'ST미국': 119, '기타': 861 },
-      '2025_Year': { 'OC(국내)': 51536, '중국': 25016, '홍콩': 11469, 'ST미국': 476, '기타': 3346 },
-    },
-    '기타판관비': {
-      '2024_1Q': { 'OC(국내)': 11333, '중국': 10054, '홍콩': 2670, 'ST미국': 1260, '기타': -12 },
-      '2024_1Q_Year': { 'OC(국내)': 11333, '중국': 10054, '홍콩': 2670, 'ST미국': 1260, '기타': -12 },
-      '2024_2Q': { 'OC(국내)': 10453, '중국': 6031, '홍콩': 2375, 'ST미국': 1707, '기타': -57 },
-      '2024_2Q_Year': { 'OC(국내)': 21786, '중국': 16085, '홍콩': 5045, 'ST미국': 2967, '기타': -69 },
-      '2024_3Q': { 'OC(국내)': 9321, '중국': 10054, '홍콩': 2552, 'ST미국': 1183, '기타': -356 },
-      '2024_3Q_Year': { 'OC(국내)': 31107, '중국': 26139, '홍콩': 7597, 'ST미국': 4150, '기타': -425 },
-      '2024_4Q': { 'OC(국내)': 14468, '중국': 9636, '홍콩': 3536, 'ST미국': 2377, '기타': 100 },
-      '2024_Year': { 'OC(국내)': 45575, '중국': 35775, '홍콩': 11133, 'ST미국': 6527, '기타': -325 },
-      '2025_1Q': { 'OC(국내)': 10906, '중국': 9821, '홍콩': 3799, 'ST미국': 1829, '기타': 147 },
-      '2025_1Q_Year': { 'OC(국내)': 10906, '중국': 9821, '홍콩': 3799, 'ST미국': 1829, '기타': 147 },
-      '2025_2Q': { 'OC(국내)': 9642, '중국': 6522, '홍콩': 3527, 'ST미국': 1905, '기타': 106 },
-      '2025_2Q_Year': { 'OC(국내)': 20548, '중국': 16343, '홍콩': 7326, 'ST미국': 3734, '기타': 253 },
-      '2025_3Q': { 'OC(국내)': 8069, '중국': 10664, '홍콩': 3186, 'ST미국': 3728, '기타': 141 },
-      '2025_3Q_Year': { 'OC(국내)': 28617, '중국': 27007, '홍콩': 10512, 'ST미국': 7462, '기타': 394 },
-      '2025_4Q': { 'OC(국내)': 13623, '중국': 12658, '홍콩': 3539, 'ST미국': -427, '기타': 123 },
-      '2025_Year': { 'OC(국내)': 42240, '중국': 39665, '홍콩': 14051, 'ST미국': 7035, '기타': 517 },
-    },
-    '영업이익': {
-      '2024_1Q': { 'OC(국내)': 95453, '중국': 24681, '홍콩': 650, 'ST미국': 2590, '기타': 6837 },
-      '2024_1Q_Year': { 'OC(국내)': 95453, '중국': 24681, '홍콩': 650, 'ST미국': 2590, '기타': 6837 },
-      '2024_2Q': { 'OC(국내)': 54078, '중국': 20705, '홍콩': 496, 'ST미국': -2591, '기타': 19113 },
-      '2024_2Q_Year': { 'OC(국내)': 149531, '중국': 45386, '홍콩': 1146, 'ST미국': -1, '기타': 25950 },
-      '2024_3Q': { 'OC(국내)': 137103, '중국': 13295, '홍콩': 455, 'ST미국': 3320, '기타': -45869 },
-      '2024_3Q_Year': { 'OC(국내)': 286634, '중국': 58681, '홍콩': 1601, 'ST미국': 3319, '기타': -19919 },
-      '2024_4Q': { 'OC(국내)': 115771, '중국': -22584, '홍콩': 1754, 'ST미국': 3582, '기타': 21897 },
-      '2024_Year': { 'OC(국내)': 402405, '중국': 36097, '홍콩': 3355, 'ST미국': 6901, '기타': 1978 },
-      '2025_1Q': { 'OC(국내)': 111977, '중국': 6110, '홍콩': 2, 'ST미국': 996, '기타': 4531 },
-      '2025_1Q_Year': { 'OC(국내)': 111977, '중국': 6110, '홍콩': 2, 'ST미국': 996, '기타': 4531 },
-      '2025_2Q': { 'OC(국내)': 80599, '중국': -341, '홍콩': 187, 'ST미국': 993, '기타': 2591 },
-      '2025_2Q_Year': { 'OC(국내)': 192576, '중국': 5769, '홍콩': 189, 'ST미국': 1989, '기타': 7122 },
-      '2025_3Q': { 'OC(국내)': 192567, '중국': 30053, '홍콩': -1247, 'ST미국': 5429, '기타': -98783 },
-      '2025_3Q_Year': { 'OC(국내)': 385143, '중국': 35822, '홍콩': -1058, 'ST미국': 7418, '기타': -91661 },
-      '2025_4Q': { 'OC(국내)': 139306, '중국': 4385, '홍콩': 2673, 'ST미국': -8788, '기타': -4700 },
-      '2025_Year': { 'OC(국내)': 524449, '중국': 40207, '홍콩': 1615, 'ST미국': -1370, '기타': -96361 },
-    },
-    '당기순이익': {
-      '2024_1Q': { 'OC(국내)': 72186, '중국': 18059, '홍콩': 318, 'ST미국': 2208, '기타': 3550 },
-      '2024_1Q_Year': { 'OC(국내)': 72186, '중국': 18059, '홍콩': 318, 'ST미국': 2208, '기타': 3550 },
-      '2024_2Q': { 'OC(국내)': 48504, '중국': 15349, '홍콩': 267, 'ST미국': -2157, '기타': 11988 },
-      '2024_2Q_Year': { 'OC(국내)': 120690, '중국': 33408, '홍콩': 585, 'ST미국': 51, '기타': 15538 },
-      '2024_3Q': { 'OC(국내)': 105886, '중국': 9478, '홍콩': 1, 'ST미국': -528, '기타': -35036 },
-      '2024_3Q_Year': { 'OC(국내)': 226576, '중국': 42886, '홍콩': 586, 'ST미국': -477, '기타': -19498 },
-      '2024_4Q': { 'OC(국내)': 96955, '중국': -17666, '홍콩': 1540, 'ST미국': -3392, '기타': 28448 },
-      '2024_Year': { 'OC(국내)': 323531, '중국': 25220, '홍콩': 2126, 'ST미국': -3869, '기타': 8950 },
-      '2025_1Q': { 'OC(국내)': 79838, '중국': 3692, '홍콩': -174, 'ST미국': -3054, '기타': 2267 },
-      '2025_1Q_Year': { 'OC(국내)': 79838, '중국': 3692, '홍콩': -174, 'ST미국': -3054, '기타': 2267 },
-      '2025_2Q': { 'OC(국내)': 64206, '중국': -1458, '홍콩': 397, 'ST미국': -2519, '기타': 2012 },
-      '2025_2Q_Year': { 'OC(국내)': 144044, '중국': 2234, '홍콩': 223, 'ST미국': -5573, '기타': 4279 },
-      '2025_3Q': { 'OC(국내)': 150942, '중국': 21685, '홍콩': -1312, 'ST미국': 2759, '기타': -73379 },
-      '2025_3Q_Year': { 'OC(국내)': 294986, '중국': 23919, '홍콩': -1089, 'ST미국': -2814, '기타': -69100 },
-      '2025_4Q': { 'OC(국내)': 104502, '중국': 2426, '홍콩': 2129, 'ST미국': -1412, '기타': 49163 },
-      '2025_Year': { 'OC(국내)': 399488, '중국': 26345, '홍콩': 1040, 'ST미국': -4226, '기타': -19937 },
-    },
+  // entity_is_data.json 분기 조각에서 선택/비교 기간만 로드 (5개 법인: OC(국내), 중국, 홍콩, ST미국, 기타(연결조정))
+  const entityData = periodData.entity_is_data || {};
+
+  // 분기 조각 로드 상태 (조각에 의존하는 손익 증감 분석/법인별 분석 영역에 표시, 받는 동안에는 이전 데이터 유지)
+  const renderPeriodDataStatus = (section) => {
+    if (periodError) {
+      return (
+        <div className="px-3 py-2 rounded-md border border-rose-200 bg-rose-50 text-xs text-rose-600">
+          {section} 데이터를 불러오지 못했습니다: {periodError.message || String(periodError)}
+        </div>
+      );
+    }
+    if (periodLoading) {
+      return (
+        <div className="px-3 py-2 rounded-md border border-zinc-200 bg-zinc-50 text-xs text-zinc-500">
+          {section} 데이터를 불러오는 중...
+        </div>
+      );
+    }
+    return null;
   };
 
   // ============================================
@@ -3584,6 +3334,8 @@ export default function FnFQ4Dashboard() {
           </div>
         </div>
 
+        {renderPeriodDataStatus('손익 세부 계정')}
+
         {/* 손익계산서 테이블 & 법인별 분석 */}
         <div className="flex flex-col xl:flex-row gap-4">
         {/* 좌측: 손익계산서 테이블 */}
@@ -3732,6 +3484,7 @@ export default function FnFQ4Dashboard() {
               {incomeItems.find(i => i.key === selectedAccount)?.label || selectedAccount} 법인별 분석
             </h3>
             <p className="text-xs text-zinc-400">{periodLabel} 기준 법인별 비중</p>
+            {(periodLoading || periodError) && <div className="mt-3">{renderPeriodDataStatus('법인별 손익')}</div>}
             
             {/* 도넛 차트 영역 */}
             <div className="flex justify-around mt-4">
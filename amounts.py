@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+금액 셀 파서 / 단위 변환
+- 회계 서식 문자열('1,234', '(1,234)', '-', '', '#REF!')을 원 단위 int64로 변환합니다.
+- parse_won_array 는 컬럼 전체를 한 번에 변환합니다 (바이트 배열 위의 numpy 연산, 정수가 아닌 셀만 개별 변환).
+- 백만원 변환은 정수 연산으로 하며, 반올림 방식을 명시합니다.
+- 합계/차이/누적은 모두 원 단위 정수로 계산하고, 백만원 변환은 출력 직전에 한 번만 합니다 (to_millions).
+
+반올림 방식 (ROUNDING_MODES):
+    'truncate'  : 0 방향 버림 (int(float(s)) 와 같음)
+    'floor'     : 음의 무한대 방향 버림 (// 와 같음, -1원 → -1백만원)
+    'half-even' : 가장 가까운 값, .5는 짝수로 (round(), np.rint 와 같음)
+    'half-up'   : 가장 가까운 값, .5는 0에서 먼 쪽으로
+
+사용 예:
+    won = parse_won_array(['1,234,567', '(2,000,000)', '-'])   # [1234567, -2000000, 0]
+    won_to_million(won)                                        # [1, -2, 0]
+    to_millions({'매출액': {'2025_4Q': 1_500_000}})            # {'매출액': {'2025_4Q': 2}}
+"""
+
+import math
+from typing import Any, Iterable
+
+import numpy as np
+
+ROUNDING_MODES = ('truncate', 'floor', 'half-even', 'half-up')
+
+MILLION = 1_000_000
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _round_float(value: float, rounding: str) -> int:
+    """소수 원 금액을 정수 원으로 (NaN/inf는 0)"""
+    if not math.isfinite(value) or not INT64_MIN <= value <= INT64_MAX:
+        return 0
+    if rounding == 'truncate':
+        return int(value)
+    if rounding == 'floor':
+        return math.floor(value)
+    if rounding == 'half-even':
+        return round(value)
+    if rounding == 'half-up':
+        return int(math.copysign(math.floor(abs(value) + 0.5), value))
+    raise ValueError(f"Unknown rounding mode: {rounding}")
+
+
+def parse_won(value: Any, rounding: str = 'truncate') -> int:
+    """셀 하나를 원 단위 정수로 변환 (변환할 수 없거나 int64 범위를 벗어나면 0)"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return _round_float(float(value), rounding)
+    if not value:
+        return 0
+    clean = value.replace(',', '')
+    try:
+        won = int(clean)
+        return won if INT64_MIN <= won <= INT64_MAX else 0
+    except ValueError:
+        pass
+    clean = clean.replace('"', '').replace(' ', '').strip()
+    negative = clean.startswith('(') and clean.endswith(')')
+    if negative:
+        clean = clean[1:-1]
+    try:
+        won = _round_float(float(clean), rounding)
+    except ValueError:
+        return 0
+    if not INT64_MIN <= won <= INT64_MAX:
+        return 0
+    return -won if negative else won
+
+
+def parse_won_array(values: Iterable, rounding: str = 'truncate') -> np.ndarray:
+    """
+    셀 목록(또는 배열)을 원 단위 int64 배열로 한 번에 변환 (parse_won 과 같은 결과)
+    - 빠른 경로: 셀을 '\n'으로 이어 붙여 쉼표/공백/따옴표를 str.replace 로 한 번에 지우고,
+      바이트 배열에서 숫자 자릿값을 누적합(cumsum/reduceat)으로 계산합니다.
+    - 숫자/부호/괄호 외 문자가 있는 셀(소수, '#REF!' 등)만 parse_won 으로 개별 변환합니다.
+    """
+    if isinstance(values, np.ndarray):
+        values = values.ravel().tolist()
+    elif not isinstance(values, list):
+        values = list(values)
+    n = len(values)
+    won = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return won
+
+    # 문자열이 아닌 셀(pandas 숫자/NaN 등)은 빈칸으로 이어 붙이고 나중에 개별 변환
+    try:
+        text = '\n'.join(values)
+        non_text = []
+    except TypeError:
+        text = '\n'.join(v if isinstance(v, str) else '' for v in values)
+        non_text = [i for i, v in enumerate(values) if not isinstance(v, str) and v is not None]
+    text = text.replace(',', '').replace(' ', '').replace('"', '')
+    buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    if buf.size == 0:
+        # 셀 하나가 구분자를 지우고 비는 경우 ('', ' ', ',', 숫자 셀 하나 등)
+        for i in non_text:
+            won[i] = parse_won(values[i], rounding)
+        return won
+
+    # 셀(토큰) 경계
+    sep = buf == 10
+    ends = np.append(np.flatnonzero(sep), buf.size)
+    if ends.size != n:
+        # 셀 안에 줄바꿈이 있으면 경계를 알 수 없으므로 셀 단위로 처리
+        return np.array([parse_won(v, rounding) for v in values], dtype=np.int64)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    token = np.cumsum(sep, dtype=np.int32)
+
+    digit = (buf >= 48) & (buf <= 57)
+    minus = buf == 45
+    opening = buf == 40
+    closing = buf == 41
+    other = ~(digit | minus | opening | closing | sep)
+
+    # 숫자 개수, 부호/괄호 개수 (셀별)
+    digits_before = np.concatenate(([0], np.cumsum(digit, dtype=np.int32)))
+    first_digit = digits_before[starts]
+    n_digits = digits_before[ends] - first_digit
+    n_minus = np.bincount(token[minus], minlength=n)
+    n_open = np.bincount(token[opening], minlength=n)
+    n_close = np.bincount(token[closing], minlength=n)
+
+    # 빠른 경로 조건: 다른 문자 없음, '-'는 맨 앞 한 개, 괄호는 양 끝 한 쌍, 18자리 이하
+    lengths = ends - starts
+    head = np.where(lengths > 0, buf[np.minimum(starts, buf.size - 1)], 0)
+    tail = np.where(lengths > 0, buf[np.maximum(ends - 1, 0)], 0)
+    parens = (n_open == 1) & (n_close == 1) & (head == 40) & (tail == 41)
+    simple = (
+        (np.bincount(token[other], minlength=n) == 0)
+        & ((n_minus == 0) | ((n_minus == 1) & (head == 45)))
+        & (((n_open == 0) & (n_close == 0)) | parens)
+        & (n_digits <= 18)
+    )
+
+    # 자릿값: 각 숫자 뒤에 오는 같은 셀 안 숫자 개수
+    positions = np.flatnonzero(digit)
+    if positions.size:
+        exponent = digits_before[ends[token[positions]]] - digits_before[positions + 1]
+        contrib = (buf[positions] - 48).astype(np.int64) * (10 ** np.arange(19, dtype=np.int64))[exponent]
+        has_digits = n_digits > 0
+        won[has_digits] = np.add.reduceat(contrib, first_digit[has_digits])
+    won = np.where((n_minus == 1) | parens, -won, won)
+
+    for i in np.flatnonzero(~simple).tolist() + non_text:
+        won[i] = parse_won(values[i], rounding)
+    return won
+
+
+def won_to_million(won, rounding: str = 'half-even'):
+    """
+    원 → 백만원 (정수 연산, float 변환 없음)
+    won: int 또는 int64 배열. 결과도 같은 형태
+    """
+    if isinstance(won, (int, np.integer)):
+        return int(won_to_million(np.asarray(won, dtype=np.int64), rounding))
+
+    won = np.asarray(won, dtype=np.int64)
+    q, r = np.divmod(won, MILLION)          # floor 몫, 0 <= r < MILLION
+    if rounding == 'floor':
+        return q
+    if rounding == 'truncate':
+        return q + ((r != 0) & (won < 0))
+    if rounding == 'half-even':
+        return q + ((r > MILLION // 2) | ((r == MILLION // 2) & (q % 2 == 1)))
+    if rounding == 'half-up':
+        # 나머지가 정확히 절반일 때: 양수는 q + 1, 음수는 floor 몫 q 가 이미 0에서 먼 쪽
+        return q + ((r > MILLION // 2) | ((r == MILLION // 2) & (won >= 0)))
+    raise ValueError(f"Unknown rounding mode: {rounding}")
+
+
+def to_millions(data, rounding: str = 'half-even'):
+    """중첩 dict/list 안의 원 단위 정수를 백만원으로 변환 (출력 단계에서 한 번만 호출)"""
+    if isinstance(data, dict):
+        return {key: to_millions(value, rounding) for key, value in data.items()}
+    if isinstance(data, list):
+        return [to_millions(item, rounding) for item in data]
+    if isinstance(data, (int, np.integer)) and not isinstance(data, bool):
+        return won_to_million(int(data), rounding)
+    return data
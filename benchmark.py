@@ -0,0 +1,962 @@
+# -*- coding: utf-8 -*-
+"""
+파서 성능 측정 스크립트
+- 실제 CSV(2024_BS.csv, 2025_BS.csv)와 분기 블록을 복제해 늘린 합성 CSV로 파서 처리 시간을 비교합니다.
+
+사용법:
+    python benchmark.py bs                 # BS 파서 (기본 100분기)
+    python benchmark.py bs --quarters 200
+    python benchmark.py ledger             # 중첩 dict vs 원장 큐브 (시간/메모리)
+    python benchmark.py labels --rows 300000   # 부분 문자열 스캔 vs 라벨 인덱스
+    python benchmark.py numbers            # 셀 단위 re.sub 파서 vs parse_won_array (2024+2025 BS/IS 전체)
+    python benchmark.py periods --years 12 # 분기별 calculate_ytd 반복 vs period_engine 누적합
+    python benchmark.py is --scales 10 100 # IS 세부 계정 추출: 행/셀 단위 루프 vs 행 마스크 + 행렬 곱 (합성 10배/100배 행)
+    python benchmark.py artifact --scale 10   # 출력 JSON vs .fnfc 컬럼형 바이너리: 전송 크기(gzip/brotli), 파싱 시간 (기간 10배)
+    python benchmark.py suite              # 파서 진입점별 처리량(행/초)/최대 메모리 → 기준선 대비 느려지면 종료 코드 1
+    python benchmark.py suite --years 2 --quarters 4 --entities 12 --accounts 20000 --encoding utf-8-sig
+    python benchmark.py suite --save-baseline   # 현재 결과를 기준선(benchmark_baseline.json)으로 저장
+    python benchmark.py startup            # 스크립트별 시작 비용 (python -X importtime) → 새 인터프리터 + import 전체 시간이 예산(150ms) 초과면 종료 코드 1
+    python benchmark.py db --years 12      # SQLite 원장(ledger_db): 실제 파일 적재 + 합성 이력(2~12년) 적재/재적재/조각 조회 시간
+"""
+
+import argparse
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+import build_cache
+import columnar_artifact
+import csv_source
+import extract_entity_is_data
+import generate_entity_is_data
+import ledger_db
+import parse_bs_data
+import parse_csv_to_json
+import parse_financial_data
+import synthetic_csv
+from amounts import parse_won, parse_won_array, won_to_million
+from build_cache import load_source
+from entity_dimension import block_entities
+from column_layout import detect_layout
+from csv_source import read_text
+from label_index import LabelIndex
+from period_engine import PeriodAxis, qtd_to_ytd, ytd_to_qtd
+from query_service import SliceQuery
+from rollup_engine import load_mapping
+from shard_artifacts import STATEMENTS, quarter_of
+
+BASE_DIR = Path(__file__).parent
+BS_FILES = [BASE_DIR / "2024_BS.csv", BASE_DIR / "2025_BS.csv"]
+IS_FILES = [BASE_DIR / "2024_IS.csv", BASE_DIR / "2025_IS.csv"]
+IS_MAPPING_CSV = BASE_DIR / "손익계산서_맵핑표.csv"
+BASELINE_FILE = BASE_DIR / "benchmark_baseline.json"
+
+
+# ============================================
+# 비교 기준: 이전 BS 파서 (줄 단위 csv.reader + 이중 루프)
+# ============================================
+
+def legacy_parse_number(value):
+    """이전 parse_bs_data.parse_number 구현 (비교용)"""
+    if not value or value.strip() == '':
+        return 0
+    clean = value.replace(',', '').replace('"', '').strip()
+    if clean == '':
+        return 0
+    try:
+        return int(float(clean))
+    except ValueError:
+        return 0
+
+
+# 이전 parse_bs_data.ENTITY_MAP (헤더 법인명 → 표시명, 비교용)
+LEGACY_ENTITY_MAP = {
+    'F&F': 'F&F', 'F&F Shanghai': '중국', 'FnF HONGKONG': '홍콩', 'F&F 베트남': '베트남',
+    '빅텐츠': '빅텐츠', '엔터테인먼트': '엔터테인먼트', '세르지오': 'ST(미국)',
+}
+
+
+def legacy_parse_bs_csv(filepath):
+    """이전 parse_bs_csv 구현 (비교용). 각 줄마다 csv.reader를 만들고 파일을 두 번 순회합니다."""
+    content, _ = read_text(filepath)
+    lines = content.strip().split('\n')
+    headers = next(csv.reader([lines[0]]))
+    blocks = detect_layout(headers).blocks
+
+    account_mapping = parse_bs_data.load_account_mapping()
+    for _ in range(2):
+        data = {}
+        for line in lines[1:]:
+            try:
+                row = next(csv.reader([line]))
+            except Exception:
+                continue
+            if not row:
+                continue
+            account_name = row[blocks[0].start].strip() if blocks else ''
+            if not account_name or account_name in parse_bs_data.SKIP_ACCOUNTS:
+                continue
+            category = account_mapping.get(account_name)
+            if not category:
+                continue
+            if account_name not in data:
+                data[account_name] = {'category': category, 'periods': {}}
+            for block in blocks:
+                period_key = block.period_key
+                if period_key not in data[account_name]['periods']:
+                    data[account_name]['periods'][period_key] = {'entities': {}, 'consolidated': 0}
+                for entity, idx in block.entities:
+                    if idx < len(row):
+                        entity_display = LEGACY_ENTITY_MAP.get(entity, entity)
+                        data[account_name]['periods'][period_key]['entities'][entity_display] = legacy_parse_number(row[idx])
+                if block.balance and block.balance < len(row):
+                    data[account_name]['periods'][period_key]['consolidated'] = legacy_parse_number(row[block.balance])
+    return data
+
+
+def legacy_parse_number_re(value):
+    """이전 parse_csv_to_json.parse_number 구현 (비교용). 셀마다 re.sub"""
+    if not value or value.strip() in ['', '0', '-']:
+        return 0
+    value = value.strip()
+    is_negative = '(' in value and ')' in value
+    value = re.sub(r'[(),\s]', '', value)
+    try:
+        num = float(value)
+        return -num if is_negative else num
+    except ValueError:
+        return 0
+
+
+def legacy_resolve(account_mapping, account_name):
+    """이전 parse_csv_to_json 계정 매핑 (비교용). 맵핑 순서대로 부분 문자열 검색"""
+    for csv_key, db_key in account_mapping.items():
+        if csv_key in account_name:
+            return db_key
+    return None
+
+
+def legacy_aggregate_by_category(data_sources):
+    """이전 aggregate_by_category 구현 (비교용). 중첩 dict를 계정/기간/법인 단위로 순회합니다."""
+    entities = ['F&F', '중국', '홍콩', '베트남', '빅텐츠', '엔터테인먼트', 'ST(미국)']
+    all_periods = set()
+    for data in data_sources:
+        for acc_data in data.values():
+            all_periods.update(acc_data['periods'].keys())
+    aggregated = {}
+    for cat in parse_bs_data.ASSET_CATEGORIES + parse_bs_data.LIABILITY_CATEGORIES + parse_bs_data.EQUITY_CATEGORIES:
+        aggregated[cat] = {period: {'consolidated': 0, 'entities': {e: 0 for e in entities}} for period in sorted(all_periods)}
+    for data in data_sources:
+        for acc_data in data.values():
+            category = acc_data['category']
+            for period, period_data in acc_data['periods'].items():
+                aggregated[category][period]['consolidated'] += period_data.get('consolidated', 0)
+                for entity, value in period_data.get('entities', {}).items():
+                    if entity in aggregated[category][period]['entities']:
+                        aggregated[category][period]['entities'][entity] += value
+    return aggregated
+
+
+def legacy_calculate_ytd(quarterly_data, up_to_quarter, entities):
+    """이전 generate_entity_is_data.calculate_ytd 구현 (비교용). 호출마다 모든 계정의 분기를 다시 합산"""
+    result = {}
+    for account in quarterly_data[1].keys():
+        ytd = {entity: 0 for entity in entities}
+        for q in range(1, up_to_quarter + 1):
+            if q in quarterly_data and account in quarterly_data[q]:
+                for entity in ytd.keys():
+                    ytd[entity] += quarterly_data[q][account].get(entity, 0)
+        result[account] = ytd
+    return result
+
+
+def legacy_parse_is_file(filepath, file_year, target_accounts):
+    """이전 parse_financial_data.parse_is_file 구현 (비교용). 행마다 계정명 해석, 분기/법인/측정값마다 셀 단위 변환"""
+    source = load_source(filepath)
+    account_index = LabelIndex(target_accounts)
+    blocks = [(f"{b.quarter}Q", block_entities(b), b.ytd, b.qtd) for b in source.layout.blocks]
+    display = {e: name for name, members in parse_financial_data.ENTITY_RULES.buckets for e in members}
+
+    consolidated_data, entity_data = {}, {}
+    for row_idx in range(1, len(source)):
+        row = source.values[row_idx]
+        matched_key = account_index.resolve(source.labels[row_idx].strip())
+        if not matched_key:
+            continue
+        for q_name, (labels, cols), ytd_col, qtd_col in blocks:
+            entity_values = {}
+            for label, col in zip(labels, cols):
+                entity_values[display.get(label, label)] = won_to_million(parse_won(row[col]))
+            consolidated_val = won_to_million(parse_won(row[ytd_col])) if ytd_col is not None else 0
+            quarter_val = won_to_million(parse_won(row[qtd_col])) if qtd_col is not None else 0
+            period_quarter, period_year = f"{file_year}_{q_name}", f"{file_year}_{q_name}_Year"
+            consolidated_data.setdefault(period_year, {})[matched_key] = consolidated_val
+            consolidated_data.setdefault(period_quarter, {})[matched_key] = quarter_val
+            entity_data.setdefault(matched_key, {})[period_quarter] = entity_values
+            entity_data[matched_key][period_year] = entity_values.copy()
+    return consolidated_data, entity_data
+
+
+# ============================================
+# 합성 입력 생성
+# ============================================
+
+def scale_bs_csv(source_path, quarters):
+    """source_path의 마지막 분기 블록을 복제해 quarters개 분기를 가진 CSV 텍스트 생성"""
+    content, _ = read_text(source_path)
+    rows = list(csv.reader(io.StringIO(content.strip())))
+    last = detect_layout(rows[0]).blocks[-1]
+    start, end = last.start, last.end
+
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    for row_idx, row in enumerate(rows):
+        block = row[start:end]
+        scaled = []
+        for q in range(quarters):
+            cells = list(block)
+            if row_idx == 0:
+                cells[0] = f"{q // 4:02d}.{q % 4 + 1}Q"
+            scaled.extend(cells)
+        writer.writerow(scaled)
+    return out.getvalue()
+
+
+def scale_rows_csv(source_path, scale):
+    """source_path의 계정 행(헤더 제외)을 scale번 반복한 CSV 텍스트 생성 (열 구성은 그대로)"""
+    content, _ = read_text(source_path)
+    rows = list(csv.reader(io.StringIO(content.strip())))
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(rows[0])
+    for _ in range(scale):
+        writer.writerows(rows[1:])
+    return out.getvalue()
+
+
+def scale_periods(data, scale, seed=0):
+    """
+    출력 JSON의 기간 단계마다 이전 연도를 복제해 기간 수를 scale 배로 (금액은 ±10% 흔들어 압축률이 과장되지 않게)
+    예: 2024~2025 → scale 10 이면 2006~2025
+    """
+    rng = random.Random(seed)
+    years = sorted({key.partition('_')[0] for key in _period_keys(data)})
+    span = len(years)
+
+    def jitter(node):
+        if isinstance(node, dict):
+            return {key: jitter(value) for key, value in node.items()}
+        if isinstance(node, int):
+            return int(node * rng.uniform(0.9, 1.1))
+        return node
+
+    def walk(node):
+        if not isinstance(node, dict):
+            return node
+        if node and all(quarter_of(key) for key in node):
+            out = {}
+            for k in range(scale - 1, -1, -1):
+                for key, value in node.items():
+                    year, sep, rest = key.partition('_')
+                    out[f"{int(year) - k * span}{sep}{rest}"] = walk(value) if k == 0 else jitter(walk(value))
+            return out
+        return {key: walk(value) for key, value in node.items()}
+
+    return walk(data)
+
+
+def _period_keys(node):
+    if isinstance(node, dict):
+        if node and all(quarter_of(key) for key in node):
+            yield from node
+        else:
+            for value in node.values():
+                yield from _period_keys(value)
+
+
+def synthetic_labels(rows, seed=0):
+    """실제 BS/IS 계정명에 공백 변형을 섞어 rows개 라벨 생성 (계정 단위 시산표 입력 모사)"""
+    labels = []
+    for path in BS_FILES + IS_FILES:
+        content, _ = read_text(path)
+        labels.extend(row[0].strip() for row in csv.reader(io.StringIO(content.strip())) if row and row[0].strip())
+    rng = random.Random(seed)
+    out = []
+    for _ in range(rows):
+        label = rng.choice(labels)
+        if rng.random() < 0.3:
+            pos = rng.randrange(len(label) + 1)
+            label = label[:pos] + rng.choice([' ', '\u3000']) + label[pos:]
+        out.append(label)
+    return out
+
+
+def time_call(func, *args, repeat=5):
+    """repeat회 실행 중 최소 시간(초)"""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_call(func, *args):
+    """(소요 시간 초, tracemalloc 최대 메모리 바이트, 반환값)"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def print_row(label, legacy, current):
+    print(f"  {label:<28} {legacy * 1000:>10.2f}ms {current * 1000:>10.2f}ms {legacy / current:>7.2f}x")
+
+
+# ============================================
+# 벤치마크
+# ============================================
+
+def bench_bs(quarters):
+    print("=" * 70)
+    print("BS 파서 (이전 parse_bs_csv vs parse_bs_data.parse_bs_csv, 한 번 스트리밍 → 원장)")
+    print("=" * 70)
+    print(f"  {'입력':<28} {'이전':>12} {'현재':>12} {'배율':>8}")
+
+    def run_legacy(paths):
+        for path in paths:
+            legacy_parse_bs_csv(path)
+
+    def run_current(paths):
+        parse_bs_data.load_bs_ledger(paths)   # 등록된 원본이 없으므로 파일마다 parse_bs_csv
+
+    print_row("2024_BS + 2025_BS", time_call(run_legacy, BS_FILES), time_call(run_current, BS_FILES))
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(scale_bs_csv(BS_FILES[-1], quarters))
+        print_row(f"합성 {quarters}분기", time_call(run_legacy, [tmp_path], repeat=3), time_call(run_current, [tmp_path], repeat=3))
+    finally:
+        os.remove(tmp_path)
+
+
+def bench_ledger(quarters):
+    print("=" * 70)
+    print("BS 집계: 중첩 dict vs 원장 큐브 (parse_bs_data.aggregate_by_category)")
+    print("=" * 70)
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(scale_bs_csv(BS_FILES[-1], quarters))
+
+        def run_legacy():
+            data = legacy_parse_bs_csv(tmp_path)
+            return data, legacy_aggregate_by_category([data])
+
+        def run_current():
+            ledger = parse_bs_data.load_bs_ledger([tmp_path])
+            return ledger, parse_bs_data.aggregate_by_category(ledger)
+
+        legacy_time, legacy_peak, _ = measure_call(run_legacy)
+        current_time, current_peak, (ledger, _) = measure_call(run_current)
+    finally:
+        os.remove(tmp_path)
+
+    print(f"  합성 {quarters}분기, 원장 shape={ledger.values.shape}, 배열 {ledger.values.nbytes / 1024:,.0f}KB")
+    print(f"  {'':<28} {'이전':>12} {'현재':>12} {'배율':>8}")
+    print_row("적재 + 집계 시간", legacy_time, current_time)
+    print(f"  {'최대 메모리':<28} {legacy_peak / 1024:>10,.0f}KB {current_peak / 1024:>10,.0f}KB {legacy_peak / current_peak:>7.2f}x")
+
+
+def amount_cells():
+    """2024+2025 BS/IS 파일의 금액 셀 전체 (계정명 컬럼 제외)"""
+    cells = []
+    for path in BS_FILES + IS_FILES:
+        content, _ = read_text(path)
+        rows = list(csv.reader(io.StringIO(content.strip())))
+        label_cols = {block.start for block in detect_layout(rows[0]).blocks}
+        for row in rows[1:]:
+            cells.extend(value for col, value in enumerate(row) if col not in label_cols)
+    return cells
+
+
+def bench_numbers():
+    print("=" * 70)
+    print("금액 셀 파서: 셀 단위 re.sub vs parse_won / parse_won_array")
+    print("=" * 70)
+
+    cells = amount_cells()
+    print(f"  2024+2025 BS/IS 금액 셀 {len(cells):,}개")
+
+    legacy = [legacy_parse_number_re(value) for value in cells]
+    current = parse_won_array(cells)
+    mismatches = sum(1 for a, b in zip(legacy, current.tolist()) if int(a) != b)
+    print(f"  결과 불일치: {mismatches}개")
+
+    print(f"  {'':<28} {'이전':>12} {'현재':>12} {'배율':>8}")
+    legacy_time = time_call(lambda: [legacy_parse_number_re(value) for value in cells])
+    print_row("셀 단위 parse_won", legacy_time, time_call(lambda: [parse_won(value) for value in cells]))
+    print_row("parse_won_array (한 번에)", legacy_time, time_call(parse_won_array, cells))
+
+
+def bench_labels(rows):
+    print("=" * 70)
+    print("계정 라벨 해석: 부분 문자열 스캔 vs LabelIndex")
+    print("=" * 70)
+
+    mapping = load_mapping(IS_MAPPING_CSV).as_dict()
+    labels = synthetic_labels(rows)
+    print(f"  맵핑 {len(mapping)}개, 라벨 {len(labels):,}행 (고유 {len(set(labels)):,}개)")
+    print(f"  {'':<28} {'이전':>12} {'현재':>12} {'배율':>8}")
+
+    def run_legacy():
+        return [legacy_resolve(mapping, label) for label in labels]
+
+    def run_current():
+        index = LabelIndex(mapping)
+        return [index.resolve(label) for label in labels]
+
+    def run_current_prefix():
+        index = LabelIndex(mapping, prefix=True)
+        return [index.resolve(label) for label in labels]
+
+    legacy = time_call(run_legacy, repeat=3)
+    print_row("정확/정규화 일치", legacy, time_call(run_current, repeat=3))
+    print_row("+ 접두어 일치", legacy, time_call(run_current_prefix, repeat=3))
+
+    # 정확/정규화 일치에서 결과가 달라지는 라벨 (이전 방식의 오매칭)
+    index = LabelIndex(mapping)
+    changed = sorted({label.strip() for label in set(labels)
+                      if legacy_resolve(mapping, label) != index.resolve(label) and index.resolve(label) is not None})
+    print(f"  이전 방식과 결과가 다른 라벨(맵핑 존재): {len(changed)}개")
+
+
+def bench_periods(years, accounts=200):
+    print("=" * 70)
+    print("기간 연산: 계정 × 분기마다 calculate_ytd vs period_engine (QTD→YTD→QTD)")
+    print("=" * 70)
+
+    entities = ['OC(국내)', '중국', '홍콩', 'ST미국', '기타']
+    periods = PeriodAxis(tuple(range(2025 - years + 1, 2026)))
+    rng = np.random.default_rng(0)
+    qtd = rng.integers(-10 ** 12, 10 ** 12, size=(accounts, len(entities), len(periods)), dtype=np.int64)
+    names = [f"계정{a}" for a in range(accounts)]
+
+    # 연도별 {분기: {계정: {법인: 값}}} (이전 구현 입력 형식)
+    by_year = {
+        year: {q: {name: dict(zip(entities, qtd[a, :, periods.index(year, q)].tolist())) for a, name in enumerate(names)}
+               for q in range(1, 5)}
+        for year in periods.years
+    }
+
+    def run_legacy():
+        # 이전 main(): 계정마다, 분기마다 calculate_ytd 호출
+        out = {}
+        for year, data in by_year.items():
+            for account in names:
+                for q in range(1, 5):
+                    out[(year, q, account)] = legacy_calculate_ytd(data, q, entities)[account]
+        return out
+
+    def run_current():
+        return ytd_to_qtd(qtd_to_ytd(qtd))
+
+    legacy = run_legacy()
+    current = qtd_to_ytd(qtd)
+    mismatches = sum(
+        1 for (year, q, account), values in legacy.items()
+        if list(values.values()) != current[names.index(account), :, periods.index(year, q)].tolist()
+    )
+    print(f"  {years}년 × 4분기, 계정 {accounts}개 × 법인 {len(entities)}개, 결과 불일치: {mismatches}개")
+    print(f"  {'':<28} {'이전':>12} {'현재':>12} {'배율':>8}")
+    print_row("YTD (+ QTD 역변환)", time_call(run_legacy, repeat=1), time_call(run_current))
+
+
+def bench_is(scales):
+    print("=" * 70)
+    print("IS 세부 계정 추출 (parse_financial_data.parse_is_file)")
+    print("=" * 70)
+
+    target_accounts = parse_financial_data.TARGET_ACCOUNTS
+
+    def quiet(func, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+
+    print(f"  {'입력':<28} {'이전':>12} {'현재':>12} {'배율':>8}")
+    for scale in [1] + list(scales):
+        fd, tmp_path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(scale_rows_csv(IS_FILES[-1], scale))
+            source = load_source(tmp_path)   # 파싱은 한 번만 (두 구현 모두 캐시된 금액 행렬 사용)
+
+            legacy = legacy_parse_is_file(tmp_path, "2025", target_accounts)
+            current = quiet(parse_financial_data.parse_is_file, tmp_path, "2025")
+            # 현재 구현은 연간(Year) 키를 추가하므로 공통 키만 비교
+            same = all(current[0][k] == v for k, v in legacy[0].items()) and \
+                all(current[1][a][k] == v for a, periods in legacy[1].items() for k, v in periods.items())
+            print_row(f"{scale}배 ({len(source) - 1:,}행){'' if same else ' 불일치!'}",
+                      time_call(legacy_parse_is_file, tmp_path, "2025", target_accounts, repeat=3),
+                      time_call(quiet, parse_financial_data.parse_is_file, tmp_path, "2025", repeat=3))
+        finally:
+            os.remove(tmp_path)
+
+
+# 브라우저 쪽 측정 (node 가 있을 때): brotli 크기 + JSON.parse vs columnarDecoder.decodeArtifact
+_NODE_BENCH = r"""
+import fs from 'fs';
+import zlib from 'zlib';
+import { decodeArtifact } from %(decoder)s;
+const names = JSON.parse(process.argv[2]);
+const dir = process.argv[3];
+const best = (fn, repeat) => {
+  let min = Infinity;
+  for (let i = 0; i < repeat; i += 1) {
+    const t0 = process.hrtime.bigint();
+    fn();
+    min = Math.min(min, Number(process.hrtime.bigint() - t0) / 1e6);
+  }
+  return min;
+};
+const out = {};
+for (const name of names) {
+  const text = fs.readFileSync(`${dir}/${name}.json`, 'utf8');
+  const raw = fs.readFileSync(`${dir}/${name}.fnfc`);
+  const ab = raw.buffer.slice(raw.byteOffset, raw.byteOffset + raw.byteLength);
+  const brotli = (buf) => zlib.brotliCompressSync(buf, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 11 } }).length;
+  const same = JSON.stringify(decodeArtifact(ab)) === JSON.stringify(JSON.parse(text));
+  out[name] = {
+    brJson: brotli(Buffer.from(text)), brFnfc: brotli(raw), same,
+    parseJson: best(() => JSON.parse(text), 20), parseFnfc: best(() => decodeArtifact(ab), 20),
+  };
+}
+console.log(JSON.stringify(out));
+"""
+
+
+def _brotli_size(payload):
+    try:
+        import brotli   # 선택 의존성 (없으면 node 측정값 사용)
+    except ImportError:
+        return None
+    return len(brotli.compress(payload, quality=11))
+
+
+def bench_artifact(scale):
+    print("=" * 70)
+    print(f"출력 형식: JSON(indent=2) vs .fnfc 컬럼형 바이너리 (기간 {scale}배)")
+    print("=" * 70)
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        rows = []
+        for name, filename in STATEMENTS.items():
+            path = BASE_DIR / filename
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                data = scale_periods(json.load(f), scale)
+            text = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')   # 현재 출력 형식
+            binary = columnar_artifact.encode(data)
+            (tmp_dir / f"{name}.json").write_bytes(text)
+            (tmp_dir / f"{name}.fnfc").write_bytes(binary)
+            same = columnar_artifact.decode(binary) == data
+            rows.append({
+                'name': name, 'same': same,
+                'json': len(text), 'fnfc': len(binary),
+                'gzJson': len(gzip.compress(text, 9)), 'gzFnfc': len(gzip.compress(binary, 9)),
+                'brJson': _brotli_size(text), 'brFnfc': _brotli_size(binary),
+                'pyJson': time_call(json.loads, text), 'pyFnfc': time_call(columnar_artifact.decode, binary),
+            })
+
+        node = shutil.which('node')
+        js = {}
+        if node:
+            script = tmp_dir / "bench.mjs"
+            decoder = (BASE_DIR / "columnarDecoder.js").resolve().as_uri()
+            script.write_text(_NODE_BENCH % {'decoder': json.dumps(decoder)}, encoding='utf-8')
+            done = subprocess.run([node, str(script), json.dumps([r['name'] for r in rows]), str(tmp_dir)],
+                                  capture_output=True, text=True)
+            if done.returncode == 0:
+                js = json.loads(done.stdout)
+            else:
+                print(f"  node 측정 실패: {done.stderr.strip().splitlines()[-1:]}")
+
+        def kb(n):
+            return f"{n / 1024:,.1f}K" if n is not None else "-"
+
+        print(f"  {'출력':<22} {'원본':>17} {'gzip':>17} {'brotli':>17}")
+        for r in rows:
+            r['brJson'] = r['brJson'] or js.get(r['name'], {}).get('brJson')
+            r['brFnfc'] = r['brFnfc'] or js.get(r['name'], {}).get('brFnfc')
+            mark = '' if r['same'] and js.get(r['name'], {}).get('same', True) else ' 불일치!'
+            print(f"  {r['name'] + mark:<22} {kb(r['json']):>8}→{kb(r['fnfc']):>8} {kb(r['gzJson']):>8}→{kb(r['gzFnfc']):>8}"
+                  f" {kb(r['brJson']):>8}→{kb(r['brFnfc']):>8}")
+        total = {key: sum(r[key] or 0 for r in rows) for key in ('json', 'fnfc', 'gzJson', 'gzFnfc', 'brJson', 'brFnfc')}
+        print(f"  {'합계':<22} {kb(total['json']):>8}→{kb(total['fnfc']):>8} {kb(total['gzJson']):>8}→{kb(total['gzFnfc']):>8}"
+              f" {kb(total['brJson']):>8}→{kb(total['brFnfc']):>8}")
+
+        print(f"\n  {'파싱 시간':<22} {'JSON':>12} {'.fnfc':>12} {'배율':>8}")
+        for r in rows:
+            print_row(f"Python {r['name']}", r['pyJson'], r['pyFnfc'])
+        for name, m in js.items():
+            print_row(f"node {name}", m['parseJson'] / 1000, m['parseFnfc'] / 1000)
+        if not node:
+            print("  (node 가 없어 브라우저 쪽 파싱 시간은 생략)")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# ============================================
+# 시작 비용 (새 인터프리터 + import)
+# ============================================
+
+# 시작 비용 예산 (밀리초): 새 인터프리터 + import 전체 시간
+# 바닥값(인터프리터, 인터프리터 + NumPy)은 어디서 시간이 드는지 보는 참고값이고 예산은 전체 시간에 겁니다
+STARTUP_BUDGET_MS = 150
+
+# 빌드가 실행하는 스크립트 (build_pipeline --jobs 1 은 한 프로세스에서 모두 import)
+STARTUP_MODULES = ['build_pipeline', 'parse_bs_data', 'generate_entity_bs_data', 'generate_entity_is_data',
+                   'parse_financial_data', 'parse_csv_to_json', 'extract_is_data', 'extract_entity_is_data',
+                   'shard_artifacts', 'columnar_artifact']
+
+
+def _import_time(modules):
+    """
+    새 인터프리터에서 modules 를 import → (벽시계 초, [(최상위 import 누적 µs, 이름)], NumPy import 여부)
+    최상위 import: -X importtime 출력에서 modules 가 직접 import 한 모듈 (들여쓰기 1단계)
+    """
+    code = "; ".join(f"import {name}" for name in modules) if modules else "pass"
+    t0 = time.perf_counter()
+    done = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=BASE_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - t0
+    if done.returncode != 0:
+        raise RuntimeError(f"{code}: {done.stderr.strip().splitlines()[-1:]}")
+    direct = []
+    uses_numpy = False
+    for line in done.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        uses_numpy = uses_numpy or name.strip() == 'numpy'
+        if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) == 3:   # ' ' + 들여쓰기 2칸
+            direct.append((int(cumulative), name.strip()))
+    return elapsed, sorted(direct, reverse=True), uses_numpy
+
+
+def _wall_time(args):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - t0
+
+
+def bench_startup(repeat, budget_ms=STARTUP_BUDGET_MS):
+    """
+    스크립트별 시작 비용 (repeat회 중 최소)
+    전체: 새 인터프리터 + import (예산 대상), 자체: 전체 - 바닥값 (인터프리터, NumPy 를 쓰면 인터프리터 + NumPy, 참고값)
+    전체 시간이 예산을 넘는 항목이 있으면 False
+    """
+    print("=" * 70)
+    print(f"시작 비용: 새 인터프리터 + import (최소/{repeat}회, 전체 예산 {budget_ms}ms)")
+    print("=" * 70)
+
+    # 바닥값과 스크립트를 한 바퀴씩 번갈아 측정 (컴퓨터 부하 변화가 양쪽에 같이 들어가도록)
+    cases = [('(인터프리터만)', []), ('(인터프리터 + numpy)', ['numpy'])]
+    cases += [(name, [name]) for name in STARTUP_MODULES]
+    cases.append(('전체 빌드 (--jobs 1)', STARTUP_MODULES))
+    best = {}
+    for _ in range(repeat):
+        for label, modules in cases:
+            run = _import_time(modules)
+            if label not in best or run[0] < best[label][0]:
+                best[label] = run
+
+    interpreter, numpy_floor = best['(인터프리터만)'][0], best['(인터프리터 + numpy)'][0]
+    over = []
+    print(f"  {'모듈':<26} {'전체':>10} {'자체':>10}  큰 import")
+    for label, modules in cases:
+        elapsed, direct, uses_numpy = best[label]
+        if len(modules) == 0 or modules == ['numpy']:
+            print(f"  {label:<26} {elapsed * 1000:>8.1f}ms")
+            continue
+        own = elapsed - (numpy_floor if uses_numpy else interpreter)
+        heavy = ', '.join(f"{name} {us / 1000:.0f}ms" for us, name in direct[:3] if us >= 5000)
+        mark = ''
+        if elapsed * 1000 > budget_ms:
+            over.append(label)
+            mark = ' 초과'
+        print(f"  {label:<26} {elapsed * 1000:>8.1f}ms {own * 1000:>8.1f}ms  {heavy}{mark}")
+
+    # 바뀐 입력이 없는 빌드: 인터프리터 + import + 지문 확인
+    noop = min(_wall_time(['build_pipeline.py', '--no-metrics']) for _ in range(repeat))
+    print(f"\n  {'build_pipeline (최신, 건너뜀)':<26} {noop * 1000:>8.1f}ms  (입력 지문 확인 포함, 예산 대상 아님)")
+    if over:
+        print(f"\n  [예산 초과] {', '.join(over)}")
+    return not over
+
+
+# ============================================
+# 처리량 스위트 (합성 CSV × 파서 진입점, 기준선 비교)
+# ============================================
+
+@contextlib.contextmanager
+def isolated_caches(cache_dir):
+    """블록/스냅샷/인코딩 캐시를 cache_dir 로 돌려 실제 .cache 를 건드리지 않음"""
+    saved = (build_cache.SOURCE_CACHE_DIR, build_cache.BLOCK_CACHE_DIR, csv_source.ENCODING_CACHE)
+    build_cache.SOURCE_CACHE_DIR = cache_dir / "sources"
+    build_cache.BLOCK_CACHE_DIR = cache_dir / "blocks"
+    csv_source.ENCODING_CACHE = cache_dir / "encodings.json"
+    csv_source._cache = None
+    try:
+        yield
+    finally:
+        build_cache.clear_cache()
+        build_cache.SOURCE_CACHE_DIR, build_cache.BLOCK_CACHE_DIR, csv_source.ENCODING_CACHE = saved
+        csv_source._cache = None
+
+
+@contextlib.contextmanager
+def entity_is_inputs(paths):
+    """extract_entity_is_data 의 입력 폴더/파일 설정을 합성 파일로 (연도 → 파일명)"""
+    saved = (extract_entity_is_data.DATA_DIR, extract_entity_is_data.IS_CSV_FILES)
+    extract_entity_is_data.DATA_DIR = str(paths[0].parent)
+    extract_entity_is_data.IS_CSV_FILES = {int(path.name[:4]): path.name for path in paths}
+    try:
+        yield
+    finally:
+        extract_entity_is_data.DATA_DIR, extract_entity_is_data.IS_CSV_FILES = saved
+
+
+def suite_cases(files, mapping_norm):
+    """(진입점 이름, 레이아웃, 실행 함수) - 실행 함수는 매번 원본 파일 적재부터 (캐시 없음)"""
+    def run_bs_ledger(paths):
+        # BS 진입점: 한 번 스트리밍 적재(parse_bs_csv) + 성격별/계정별 집계 (main 과 같은 경로)
+        ledger = parse_bs_data.load_bs_ledger(paths)
+        parse_bs_data.aggregate_by_category(ledger)
+        parse_bs_data.get_detailed_accounts(ledger)
+
+    def run_parse_is_file(paths):
+        for path in paths:
+            parse_financial_data.parse_is_file(path, path.name[:4])
+
+    def run_extract_quarter(paths):
+        for path in paths:
+            source = load_source(path)
+            for block in source.layout.blocks:
+                generate_entity_is_data.extract_quarter_data(source, block)
+
+    def run_year_cumulative(paths):
+        with entity_is_inputs(paths):
+            for path in paths:
+                extract_entity_is_data.extract_year_entity_cumulative(int(path.name[:4]), mapping_norm)
+
+    def run_parse_is_data(paths):
+        for path in paths:
+            parse_csv_to_json.parse_is_data(load_source(path))
+
+    return [
+        # 이전 이름 parse_bs_csv[bs15]/[bs13] (main 이 쓰지 않는 파서라 원장 경로로 바꿈)
+        ('load_bs_ledger[bs15]', 'bs15', lambda: run_bs_ledger(files['bs15'])),
+        ('load_bs_ledger[bs13]', 'bs13', lambda: run_bs_ledger(files['bs13'])),
+        ('parse_is_file', 'is17', lambda: run_parse_is_file(files['is17'])),
+        ('extract_quarter_data', 'entity_is14', lambda: run_extract_quarter(files['entity_is14'])),
+        ('extract_year_entity_cumulative', 'is_settlement', lambda: run_year_cumulative(files['is_settlement'])),
+        ('parse_is_data', 'is17', lambda: run_parse_is_data(files['is17'])),
+    ]
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def bench_suite(years, quarters, entities, accounts, encoding, repeat, tolerance, baseline_path, save):
+    """진입점별 행/초, 최대 메모리 측정 후 기준선과 비교. 느려진 진입점이 있으면 False"""
+    params = {'years': years, 'quarters': quarters, 'entities': entities, 'accounts': accounts, 'encoding': encoding}
+    print("=" * 70)
+    print("파서 처리량 스위트 (" + ", ".join(f"{k}={v}" for k, v in params.items()) + ")")
+    print("=" * 70)
+
+    tmp_dir = Path(tempfile.mkdtemp())
+    results = {}
+    try:
+        files = synthetic_csv.write_dataset(tmp_dir / "csv", years=years, quarters=quarters, entities=entities,
+                                            accounts=accounts, encoding=encoding)
+        mapping_norm = extract_entity_is_data.load_mapping(str(IS_MAPPING_CSV))
+
+        with isolated_caches(tmp_dir / "cache"), contextlib.redirect_stdout(io.StringIO()):
+            rows = {layout: sum(len(csv_source.read_rows(path)[0]) - (2 if layout == 'is_settlement' else 1)
+                                for path in paths)
+                    for layout, paths in files.items()}
+            for name, layout, run in suite_cases(files, mapping_norm):
+                def cold():
+                    build_cache.clear_cache()
+                    run()
+                cold()   # 첫 실행(지연 import, 헤더 레이아웃 캐시 등)은 제외
+                seconds = time_call(cold, repeat=repeat)
+                build_cache.clear_cache()
+                _, peak, _ = measure_call(run)
+                results[name] = {'rows': rows[layout], 'seconds': seconds,
+                                 'rows_per_sec': rows[layout] / seconds, 'peak_bytes': peak}
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    baseline = load_baseline(baseline_path)
+    comparable = baseline is not None and baseline.get('params') == params
+    if baseline is not None and not comparable:
+        print(f"  기준선 조건이 달라 비교 생략: {baseline.get('params')}")
+
+    regressions = []
+    print(f"  {'진입점':<32} {'행':>8} {'시간':>10} {'행/초':>12} {'최대 메모리':>12} {'기준선 대비':>12}")
+    for name, r in results.items():
+        note = ''
+        base = baseline['results'].get(name) if comparable else None
+        if base:
+            speed = r['rows_per_sec'] / base['rows_per_sec']
+            memory = r['peak_bytes'] / base['peak_bytes']
+            note = f"{speed:.2f}x/{memory:.2f}x"
+            if speed < 1 - tolerance:
+                regressions.append(f"{name}: 처리량 {speed:.0%} (허용 {1 - tolerance:.0%})")
+            if memory > 1 + tolerance:
+                regressions.append(f"{name}: 최대 메모리 {memory:.0%} (허용 {1 + tolerance:.0%})")
+        print(f"  {name:<32} {r['rows']:>8,} {r['seconds'] * 1000:>8.1f}ms {r['rows_per_sec']:>12,.0f}"
+              f" {r['peak_bytes'] / 1024:>10,.0f}KB {note:>12}")
+
+    if save:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'params': params,
+                'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n  기준선 저장: {baseline_path}")
+
+    for line in regressions:
+        print(f"  [회귀] {line}")
+    return not regressions
+
+
+# ============================================
+# SQLite 원장 (적재/조회 시간, 이력이 늘어날 때)
+# ============================================
+
+# 합성 이력 데이터셋 (ledger_db.DATASETS 와 같은 이름)
+DB_LAYOUTS = {'bs': 'bs15', 'is': 'is17', 'is_entity': 'entity_is14'}
+
+
+def _db_queries(conn):
+    """(이름, SliceQuery) - 계정 추이는 account 인덱스, 법인 조각은 entity 인덱스를 씀"""
+    account = conn.execute("SELECT a.label FROM account a JOIN dataset d ON d.id = a.dataset_id"
+                           " WHERE d.name = 'is_entity' ORDER BY a.id LIMIT 1 OFFSET 10").fetchone()[0]
+    last = conn.execute("SELECT max(label) FROM period").fetchone()[0]
+    return [
+        ('계정 추이 (전 기간, 중국)', SliceQuery('is_entity', (account,), ('중국',), rules='dashboard')),
+        ('법인 조각 (최근 분기, 연결)', SliceQuery('bs', (), ('연결',), last, last)),
+        ('계정 × 전 법인 (qtd)', SliceQuery('is', (account,), (), None, None, 'qtd')),
+    ]
+
+
+def bench_db(years, repeat):
+    print("=" * 70)
+    print(f"SQLite 원장 (ledger_db): 적재/조회 (조회는 최소/{repeat}회)")
+    print("=" * 70)
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        conn = ledger_db.connect(tmp_dir / "real.sqlite")
+        result = ledger_db.load(conn, jobs=1)
+        again = ledger_db.load(conn, jobs=1)
+        print(f"  실제 2024/2025 파일: 블록 {result.blocks}개, fact {result.cells:,}행 적재 {result.seconds * 1000:.1f}ms,"
+              f" 바뀐 것 없음 {again.seconds * 1000:.1f}ms")
+        conn.close()
+
+        print(f"\n  {'이력':>6} {'fact 행':>10} {'DB 크기':>10} {'적재':>10} {'재적재':>10}  조회")
+        for n in sorted({2, max(years // 2, 2), years}):
+            case_dir = tmp_dir / f"years{n}"
+            files = synthetic_csv.write_dataset(case_dir / "csv", layouts=list(DB_LAYOUTS.values()), years=n,
+                                                encoding='utf-8-sig')
+            datasets = {name: [path.name for path in files[layout]] for name, layout in DB_LAYOUTS.items()}
+            with isolated_caches(case_dir / "cache"):
+                db_path = case_dir / "ledger.sqlite"
+                conn = ledger_db.connect(db_path)
+                result = ledger_db.load(conn, datasets, base_dir=case_dir / "csv", mappings={}, jobs=1)
+                again = ledger_db.load(conn, datasets, base_dir=case_dir / "csv", mappings={}, jobs=1)
+                times = [(name, time_call(ledger_db.slice_db, conn, query, repeat=repeat))
+                         for name, query in _db_queries(conn)]
+                conn.close()
+            queries = ', '.join(f"{name} {seconds * 1000:.2f}ms" for name, seconds in times)
+            print(f"  {n:>4}년 {result.cells:>10,} {db_path.stat().st_size / 1024:>8,.0f}KB"
+                  f" {result.seconds * 1000:>8.1f}ms {again.seconds * 1000:>8.1f}ms  {queries}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파서 성능 측정")
+    parser.add_argument("target", choices=["bs", "ledger", "labels", "numbers", "periods", "is", "artifact", "suite",
+                                           "startup", "db"],
+                        help="측정 대상")
+    parser.add_argument("--quarters", type=int, default=None, help="합성 입력 분기 수 (bs/ledger 기본 100, suite 연도별 기본 4)")
+    parser.add_argument("--rows", type=int, default=300_000, help="합성 라벨 행 수 (labels)")
+    parser.add_argument("--years", type=int, default=None, help="합성 기간 연도 수 (periods/db 기본 12, suite 기본 2)")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100], help="합성 행 배수 (is)")
+    parser.add_argument("--scale", type=int, default=10, help="합성 기간 배수 (artifact)")
+    parser.add_argument("--entities", type=int, default=None, help="법인 컬럼 수 (suite, 기본: 실제 헤더)")
+    parser.add_argument("--accounts", type=int, default=5000, help="파일별 계정 행 수 (suite)")
+    parser.add_argument("--encoding", choices=synthetic_csv.ENCODINGS, default='cp949', help="합성 CSV 인코딩 (suite)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수, 최소 시간 사용 (suite/startup/db)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="새 인터프리터 + import 예산 ms (startup)")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="기준선 대비 허용 폭 (suite, 0.3 = 30%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="기준선 파일 (suite)")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준선으로 저장 (suite)")
+    args = parser.parse_args()
+
+    if args.target == "bs":
+        bench_bs(args.quarters or 100)
+    elif args.target == "ledger":
+        bench_ledger(args.quarters or 100)
+    elif args.target == "labels":
+        bench_labels(args.rows)
+    elif args.target == "numbers":
+        bench_numbers()
+    elif args.target == "periods":
+        bench_periods(args.years or 12)
+    elif args.target == "is":
+        bench_is(args.scales)
+    elif args.target == "artifact":
+        bench_artifact(args.scale)
+    elif args.target == "suite":
+        ok = bench_suite(args.years or 2, args.quarters or 4, args.entities, args.accounts, args.encoding,
+                         args.repeat, args.tolerance, args.baseline, args.save_baseline)
+        sys.exit(0 if ok else 1)
+    elif args.target == "startup":
+        sys.exit(0 if bench_startup(args.repeat, args.budget) else 1)
+    elif args.target == "db":
+        bench_db(args.years or 12, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
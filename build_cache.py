@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+분기 블록 증분 빌드 캐시
+- 원본 CSV 파일 전체와 각 분기 블록(컬럼 구간)의 SHA-256 지문을 계산해, 파싱한 블록 금액을 .cache/blocks/ 에 저장합니다.
+- 파일 지문이 같으면 CSV를 디코딩/파싱하지 않고 저장된 스냅샷과 블록을 그대로 읽습니다.
+- 파일이 바뀌면 블록별 지문을 다시 계산해, 내용이 바뀐 블록(보통 마감한 최신 분기 하나)만 다시 파싱합니다.
+- 결과(ParsedSource)는 원본과 같은 행/열 위치의 int64 행렬이므로, 행 번호/컬럼 인덱스로 읽던 코드도 그대로 쓸 수 있습니다.
+- 계정명 → 행 번호 인덱스(label_index.RowIndex)도 파싱하면서 한 번 만들어 스냅샷에 함께 저장합니다.
+- 스냅샷은 파일 위치 지문으로 구분하고, 다시 파싱한 뒤에는 어느 스냅샷도 쓰지 않는 블록 파일을 지웁니다(prune_blocks).
+
+사용 예:
+    source = load_source('2025_BS.csv')
+    source.layout.quarter(4).balance                   # 연결값 컬럼
+    source.values[row_idx, col]                        # 원 단위 금액
+    source.row('Ⅰ.매출액')                              # 계정명으로 찾은 행 (원 단위 int64 배열)
+    builder.add_source(source)                         # ledger_store.LedgerBuilder
+
+    python build_cache.py            # 캐시 갱신 후 파일/블록별 재사용 여부 출력
+    python build_cache.py --clear    # 캐시 삭제
+    (JSON 재생성은 build_pipeline.py)
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import os
+import shutil
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import profiling
+import run_metrics
+from amounts import parse_won_array
+from column_layout import ColumnLayout, detect_layout
+from csv_source import decode_bytes
+from label_index import RowIndex
+
+# 로컬 캐시 폴더 (빌드 산출물 아님, git 제외)
+BASE_DIR = Path(__file__).parent
+CACHE_DIR = BASE_DIR / ".cache"
+SOURCE_CACHE_DIR = CACHE_DIR / "sources"
+BLOCK_CACHE_DIR = CACHE_DIR / "blocks"
+
+# 저장 형식/파싱 규칙이 바뀌면 올려서 이전 캐시를 무시
+CACHE_VERSION = 2
+
+# 프로세스 안에 들고 있는 파싱 결과 수 (경로별 최신 하나, 오래 안 쓴 경로부터 버림)
+MAX_LOADED = 16
+
+# 빌드 대상 원본 파일
+SOURCE_FILES = [
+    BASE_DIR / "2024_BS.csv",
+    BASE_DIR / "2025_BS.csv",
+    BASE_DIR / "2024_IS.csv",
+    BASE_DIR / "2025_IS.csv",
+    BASE_DIR / "2024 분기IS_법인별.csv",
+    BASE_DIR / "2025_분기IS_법인별.csv",
+]
+
+# 블록 지문 계산 시 셀/행 구분자 (CSV 셀 안에 나올 수 없는 제어 문자)
+_CELL_SEP = '\x1f'
+_ROW_SEP = '\x1e'
+
+
+@dataclass(frozen=True)
+class ParsedSource:
+    """
+    파싱된 CSV 한 파일
+    values[r, c]: 원본 r행 c열 금액 (원, int64). 헤더 행(0행), 계정명 컬럼, 블록 밖 컬럼은 0
+    labels[r]: 원본 r행의 계정명 셀 (첫 블록 기준, 앞뒤 공백 유지)
+    row_index: 정규화 계정명 → 행 번호 (같은 라벨이 반복되면 첫 행)
+    """
+    path: Path
+    digest: str                      # 파일 SHA-256
+    encoding: str
+    header: Tuple[str, ...]
+    labels: Tuple[str, ...]
+    values: np.ndarray
+    block_digests: Tuple[str, ...]   # layout.blocks 순서
+    row_index: RowIndex
+    reparsed: Tuple[str, ...] = ()   # 이번 실행에서 다시 파싱한 블록 라벨 (전부 캐시면 빈 튜플)
+
+    @property
+    def layout(self) -> ColumnLayout:
+        return detect_layout(self.header)
+
+    def row(self, label: str) -> np.ndarray:
+        """계정명(공백 무시)으로 찾은 행 (없으면 KeyError)"""
+        return self.values[self.row_index[label]]
+
+    def __len__(self):
+        return self.values.shape[0]
+
+
+def block_digest(rows: Sequence[Sequence[str]], start: int, end: int) -> str:
+    """분기 블록 컬럼 구간 [start, end)의 지문 (헤더/계정명 포함, 블록 위치와 무관)"""
+    h = hashlib.sha256(f"v{CACHE_VERSION}:{end - start}:{len(rows)}".encode())
+    for row in rows:
+        h.update(_CELL_SEP.join(row[start:end]).encode('utf-8'))
+        h.update(_ROW_SEP.encode())
+    return h.hexdigest()
+
+
+@profiling.traced('parse')
+def parse_block(rows: Sequence[Sequence[str]], start: int, end: int) -> np.ndarray:
+    """블록 구간을 (행 수, 블록 폭) int64 배열로 파싱 (헤더 행과 계정명 컬럼은 0)"""
+    width = end - start
+    cells: List[str] = []
+    for row in rows[1:]:
+        part = row[start:end]
+        if len(part) < width:
+            part = part + [''] * (width - len(part))
+        cells.extend(part)
+    out = np.zeros((len(rows), width), dtype=np.int64)
+    run_metrics.count(cells_parsed=len(cells))
+    if cells:
+        out[1:] = parse_won_array(cells).reshape(len(rows) - 1, width)
+    out[:, 0] = 0
+    return out
+
+
+def _path_key(path: Path) -> str:
+    """파일 위치 지문 (다른 폴더의 같은 이름 파일이 서로의 스냅샷을 지우지 않도록)"""
+    return hashlib.sha256(str(path.resolve()).encode('utf-8')).hexdigest()[:12]
+
+
+def _snapshot_path(path: Path, digest: str) -> Path:
+    return SOURCE_CACHE_DIR / f"{path.stem}-{_path_key(path)}-v{CACHE_VERSION}-{digest[:16]}.npz"
+
+
+def _block_path(digest: str) -> Path:
+    return BLOCK_CACHE_DIR / f"v{CACHE_VERSION}-{digest[:32]}.npy"
+
+
+def _load_block(digest: str, rows: int, width: int) -> Optional[np.ndarray]:
+    try:
+        block = np.load(_block_path(digest))
+    except (OSError, ValueError):
+        return None
+    if block.shape != (rows, width) or block.dtype != np.int64:
+        return None
+    return block
+
+
+def _save(path: Path, writer):
+    """임시 파일에 쓰고 교체 (캐시는 선택 사항이므로 실패해도 무시)"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.stem + '.tmp' + path.suffix)
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _load_snapshot(path: Path, digest: str) -> Optional[ParsedSource]:
+    """파일 지문이 같을 때: 스냅샷(헤더/계정명/블록 지문) + 캐시 블록으로 재조립"""
+    try:
+        with np.load(_snapshot_path(path, digest)) as npz:
+            if str(npz['digest']) != digest:
+                return None
+            header = tuple(npz['header'].tolist())
+            labels = tuple(npz['labels'].tolist())
+            encoding = str(npz['encoding'])
+            block_digests = tuple(npz['block_digests'].tolist())
+            row_index = RowIndex(dict(zip(npz['row_keys'].tolist(), npz['row_offsets'].tolist())))
+    except (OSError, KeyError, ValueError):
+        return None
+
+    layout = detect_layout(header)
+    if len(layout.blocks) != len(block_digests):
+        return None
+    values = np.zeros((len(labels), len(header)), dtype=np.int64)
+    for block, b_digest in zip(layout.blocks, block_digests):
+        cached = _load_block(b_digest, len(labels), block.end - block.start)
+        if cached is None:
+            return None
+        values[:, block.start:block.end] = cached
+    return ParsedSource(path, digest, encoding, header, labels, values, block_digests, row_index)
+
+
+def _save_snapshot(source: ParsedSource):
+    # 같은 파일의 이전 스냅샷은 지움 (블록은 다른 파일/이전 분기와 공유될 수 있으므로 prune_blocks 에서 정리)
+    for old in SOURCE_CACHE_DIR.glob(f"*-{_path_key(source.path)}-v*.npz"):
+        try:
+            old.unlink()
+        except OSError:
+            pass
+    _save(_snapshot_path(source.path, source.digest), lambda tmp: np.savez(
+        tmp,
+        digest=np.array(source.digest),
+        encoding=np.array(source.encoding),
+        header=np.array(source.header, dtype=str),
+        labels=np.array(source.labels, dtype=str),
+        block_digests=np.array(source.block_digests, dtype=str),
+        row_keys=np.array([key for key, _ in source.row_index.items()], dtype=str),
+        row_offsets=np.array([row for _, row in source.row_index.items()], dtype=np.int64),
+    ))
+
+
+def _parse_source(path: Path, data: bytes, digest: str) -> ParsedSource:
+    """파일이 바뀌었을 때: 디코딩 후 블록별 지문을 비교해 바뀐 블록만 파싱"""
+    text, encoding = decode_bytes(path, data)
+    rows = list(csv.reader(io.StringIO(text)))
+    if not rows:
+        return ParsedSource(path, digest, encoding, (), (), np.zeros((0, 0), dtype=np.int64), (), RowIndex({}))
+
+    header = tuple(rows[0])
+    layout = detect_layout(header)
+    values = np.zeros((len(rows), len(header)), dtype=np.int64)
+
+    block_digests, reparsed = [], []
+    for block in layout.blocks:
+        b_digest = block_digest(rows, block.start, block.end)
+        cached = _load_block(b_digest, len(rows), block.end - block.start)
+        if cached is None:
+            cached = parse_block(rows, block.start, block.end)
+            _save(_block_path(b_digest), lambda tmp, arr=cached: np.save(tmp, arr))
+            reparsed.append(block.label)
+        values[:, block.start:block.end] = cached
+        block_digests.append(b_digest)
+
+    account_col = layout.account_col
+    labels = tuple(row[account_col] if account_col < len(row) else '' for row in rows)
+    source = ParsedSource(path, digest, encoding, header, labels, values,
+                          tuple(block_digests), RowIndex.build(labels, start=1), tuple(reparsed))
+    _save_snapshot(source)
+    return source
+
+
+# 프로세스 내 파싱 결과 {경로: ParsedSource} (LRU, 파일이 바뀌면 같은 경로 항목을 교체)
+_loaded: 'OrderedDict[str, ParsedSource]' = OrderedDict()
+
+# 다른 프로세스에서 파싱해 넘겨받은 원본 {경로: (mtime_ns, 크기, ParsedSource)} - 파일이 그대로면 해시도 생략
+_preloaded: Dict[str, Tuple[int, int, ParsedSource]] = {}
+
+
+def _stat_key(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def preload(sources: Sequence[ParsedSource]):
+    """이미 파싱된 원본 등록 (build_pipeline 작업 프로세스용). 이후 load_source 는 파일을 다시 읽지 않음"""
+    for source in sources:
+        _preloaded[str(source.path)] = _stat_key(source.path) + (source,)
+
+
+def preloaded(filepath) -> Optional[ParsedSource]:
+    """등록된 원본 (파일이 등록 뒤 바뀌었거나 없으면 None)"""
+    path = Path(filepath).resolve()
+    entry = _preloaded.get(str(path))
+    try:
+        if entry is not None and entry[:2] == _stat_key(path):
+            return entry[2]
+    except OSError:
+        pass
+    return None
+
+
+def load_source(filepath) -> ParsedSource:
+    """CSV 파일을 파싱해 반환 (등록된 원본 → 프로세스 내 → 파일 스냅샷 → 블록 단위 증분 파싱 순서로 조회)"""
+    path = Path(filepath).resolve()
+    source = preloaded(path)
+    if source is not None:
+        return source
+
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    run_metrics.count(bytes_read=len(data))
+
+    key = str(path)
+    source = _loaded.get(key)
+    if source is None or source.digest != digest:
+        with profiling.span('load_source', file=path.name):
+            source = _load_snapshot(path, digest) or _parse_source(path, data, digest)
+        _loaded[key] = source
+    _loaded.move_to_end(key)
+    while len(_loaded) > MAX_LOADED:
+        _loaded.popitem(last=False)
+    return source
+
+
+def prune_blocks() -> int:
+    """
+    현재 스냅샷 어디에서도 쓰지 않는 블록 파일 삭제 → 지운 개수
+    (작업 프로세스가 동시에 블록을 쓰는 중이 아닐 때, 적재를 마친 메인 프로세스에서 호출)
+    """
+    keep = set()
+    for snapshot in SOURCE_CACHE_DIR.glob("*.npz"):
+        try:
+            with np.load(snapshot) as npz:
+                keep.update(_block_path(digest).name for digest in npz['block_digests'].tolist())
+        except (OSError, KeyError, ValueError):
+            continue   # 읽을 수 없는 스냅샷은 어차피 다시 파싱됨
+    removed = 0
+    for block in BLOCK_CACHE_DIR.glob("*.npy"):
+        if block.name in keep:
+            continue
+        try:
+            block.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def clear_cache():
+    """스냅샷/블록 캐시 삭제"""
+    _loaded.clear()
+    _preloaded.clear()
+    for directory in (SOURCE_CACHE_DIR, BLOCK_CACHE_DIR):
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def print_status(sources: Sequence[ParsedSource]):
+    for source in sources:
+        blocks = len(source.block_digests)
+        if source.reparsed:
+            status = f"블록 {len(source.reparsed)}/{blocks}개 다시 파싱 ({', '.join(source.reparsed)})"
+        else:
+            status = f"캐시 사용 (블록 {blocks}개)"
+        print(f"  {source.path.name:<28} {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분기 블록 증분 빌드 캐시")
+    parser.add_argument("--clear", action="store_true", help="캐시 삭제")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache()
+        print(f"캐시 삭제: {SOURCE_CACHE_DIR}, {BLOCK_CACHE_DIR}")
+        return
+
+    print("원본 파일 지문 확인 중...")
+    with profiling.session('build_cache', **profiling.options(args)):
+        sources = [load_source(path) for path in SOURCE_FILES if path.exists()]
+        removed = prune_blocks()
+    print_status(sources)
+    if removed:
+        print(f"  사용하지 않는 블록 {removed}개 삭제")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 데이터 빌드 파이프라인
+- 출력 JSON 하나를 타깃 하나로 보고, 타깃마다 입력 파일(원본 CSV/맵핑표/정산표)과 생성 스크립트를 선언합니다.
+- 입력 파일과 스크립트 코드의 지문이 지난 빌드와 같고 출력 파일도 그대로면 타깃을 건너뜁니다.
+- 다시 만들 타깃이 쓰는 원본 CSV와 정산표 통합 문서는 parallel_ingest 로 파일마다 한 번씩, 프로세스 풀에서 동시에 적재해
+  작업 프로세스에 배열로 넘깁니다 (적재 시간은 가장 느린 파일 하나에 맞춰짐).
+- 타깃 간 의존성(한 타깃의 출력이 다른 타깃의 입력)은 DAG로 정렬하고, 서로 독립인 타깃은 프로세스 풀에서 동시에 실행합니다.
+- 각 스크립트는 조용히 실행하고 단계별 지표(행/셀/바이트/소요 시간/최대 RSS)를 .cache/metrics.jsonl 에 남깁니다.
+  --verbose 면 스크립트 출력(print)을 .cache/pipeline/logs/<타깃>.log 로 보내고, 오류(traceback)는 항상 로그에 남깁니다.
+- 마지막에 단계별 소요 시간 표를 출력합니다.
+
+사용법:
+    python build_pipeline.py                          # 바뀐 타깃만 빌드
+    python build_pipeline.py --force                  # 전체 다시 빌드
+    python build_pipeline.py entity_bs_data is_data   # 지정한 타깃만
+    python build_pipeline.py --jobs 1                 # 프로세스 풀 없이 순서대로
+    python build_pipeline.py --list                   # 타깃/입력/상태 목록
+    python build_pipeline.py --force --trace          # 단계별 타임라인 (.cache/profile/build_pipeline.trace.json)
+    python build_pipeline.py --force --profile        # 타깃별 cProfile 덤프 + tracemalloc 보고서 (.cache/profile/)
+    python build_pipeline.py --force --verbose        # 스크립트 진행 출력을 타깃별 로그에 남김
+"""
+
+import argparse
+import ast
+import contextlib
+import hashlib
+import importlib
+import json
+import os
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import build_cache
+import excel_source
+import parallel_ingest
+import profiling
+import run_metrics
+
+BASE_DIR = Path(__file__).parent
+PIPELINE_DIR = build_cache.CACHE_DIR / "pipeline"
+STAMP_FILE = PIPELINE_DIR / "stamps.json"
+LOG_DIR = PIPELINE_DIR / "logs"
+
+# 파이프라인이 적재한 원본을 타깃에 넘기는 모듈 (모든 타깃의 코드 지문에 포함)
+INGEST_MODULES = ('build_cache', 'excel_source', 'parallel_ingest')
+
+
+@dataclass(frozen=True)
+class Target:
+    """출력 파일 하나와 그 입력/생성 스크립트"""
+    name: str
+    module: str                                       # main()으로 출력 파일을 쓰는 스크립트
+    resolve: Callable[[], Tuple[List[Path], Path]]    # (입력 파일 목록, 출력 파일)
+    sheets: Optional[Callable[[], Tuple[List[str], str]]] = None   # 입력 통합 문서(.xlsx)에서 읽을 (시트명들, 대상 컬럼)
+
+
+def _files(inputs: Sequence[str], output: str) -> Callable[[], Tuple[List[Path], Path]]:
+    """스크립트 폴더 기준 상대 경로로 선언한 입력/출력"""
+    return lambda: ([BASE_DIR / name for name in inputs], BASE_DIR / output)
+
+
+def _extract_is_files():
+    import extract_is_data as m
+    inputs = [Path(m.DATA_DIR) / name for name in m.IS_FILES.values()] + [BASE_DIR / m.MAPPING_CSV]
+    return inputs, BASE_DIR / m.OUTPUT_JSON
+
+
+def _extract_is_sheets():
+    import extract_is_data as m
+    return list(m.SHEET_NAMES.values()), m.CONSOLIDATED_MARKER
+
+
+def _extract_entity_is_files():
+    import extract_entity_is_data as m
+    inputs = [Path(m.DATA_DIR) / name for name in m.IS_CSV_FILES.values()] + [Path(m.MAPPING_CSV)]
+    return inputs, Path(m.OUTPUT_JSON)
+
+
+def _shard_files():
+    import shard_artifacts as m
+    return [BASE_DIR / name for name in m.STATEMENTS.values()], m.MANIFEST_FILE
+
+
+def _columnar_files():
+    import columnar_artifact as m
+    return [BASE_DIR / name for name in m.STATEMENTS.values()], m.INDEX_FILE
+
+
+TARGETS = [
+    Target('bs_financial_data', 'parse_bs_data',
+           _files(['2024_BS.csv', '2025_BS.csv', '재무상태표_맵핑표.csv'], 'bs_financial_data.json')),
+    Target('entity_bs_data', 'generate_entity_bs_data',
+           _files(['2024_BS.csv', '2025_BS.csv'], 'entity_bs_data.json')),
+    Target('entity_is_data', 'generate_entity_is_data',
+           _files(['2024 분기IS_법인별.csv', '2025_분기IS_법인별.csv'], 'entity_is_data.json')),
+    Target('financial_detail_data', 'parse_financial_data',
+           _files(['2024_IS.csv', '2025_IS.csv'], 'financial_detail_data.json')),
+    Target('dashboard_data_2025Q4', 'parse_csv_to_json',
+           _files(['2025_BS.csv', '2025_IS.csv'], 'dashboard_data_2025Q4.json')),
+    Target('is_data', 'extract_is_data', _extract_is_files, _extract_is_sheets),
+    Target('entity_is_data_mapped', 'extract_entity_is_data', _extract_entity_is_files),
+    Target('data_shards', 'shard_artifacts', _shard_files),
+    Target('data_columnar', 'columnar_artifact', _columnar_files),
+]
+
+
+@dataclass
+class Plan:
+    """빌드 계획에서 타깃 하나의 상태"""
+    target: Target
+    inputs: List[Path]
+    output: Path
+    fingerprint: Dict[str, str]
+    status: str = ''            # '빌드' | '최신' | '입력 없음'
+    missing: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageTime:
+    stage: str
+    status: str
+    seconds: float
+    note: str = ''
+
+
+# ============================================
+# 지문 / 빌드 기록
+# ============================================
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def local_imports(module: str) -> List[str]:
+    """
+    module 이 (간접적으로) import 하는 이 폴더의 모듈 전체 (module 포함, 이름순)
+    소스의 import 문을 ast 로 읽으므로 함수 안의 지연 import 도 포함합니다.
+    """
+    found, pending = set(), [module]
+    while pending:
+        name = pending.pop()
+        path = BASE_DIR / f"{name}.py"
+        if name in found or not path.exists():
+            continue
+        found.add(name)
+        for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+            if isinstance(node, ast.Import):
+                pending += [alias.name.partition('.')[0] for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.partition('.')[0])
+    return sorted(found)
+
+
+def code_digest(module: str) -> str:
+    """타깃 스크립트와 그 스크립트가 import 하는 로컬 모듈(+ INGEST_MODULES) 소스의 지문"""
+    names = sorted(set(local_imports(module)).union(*(local_imports(name) for name in INGEST_MODULES)))
+    h = hashlib.sha256()
+    for name in names:
+        h.update(name.encode())
+        h.update((BASE_DIR / f"{name}.py").read_bytes())
+    return h.hexdigest()
+
+
+def load_stamps() -> Dict[str, dict]:
+    try:
+        with open(STAMP_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_stamps(stamps: Dict[str, dict]):
+    try:
+        STAMP_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = STAMP_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stamps, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, STAMP_FILE)
+    except OSError:
+        pass  # 기록 실패 시 다음 빌드에서 다시 만들 뿐
+
+
+# ============================================
+# 계획 (DAG 정렬 + 건너뛸 타깃 판단)
+# ============================================
+
+def make_plan(targets: Sequence[Target], stamps: Dict[str, dict], force: bool) -> List[List[Plan]]:
+    """
+    타깃을 의존성 순서의 단계(wave) 목록으로 정렬
+    - 한 타깃의 출력이 다른 타깃의 입력이면 앞 단계에 둠
+    - 입력이 바뀐 타깃과 그 뒤 타깃은 '빌드', 나머지는 '최신'
+    - 앞 단계에서 만들 출력은 아직 없어도 빠진 입력으로 보지 않음 (지문은 execute 가 실행 직전에 채움)
+    """
+    plans = {}
+    digests: Dict[Path, str] = {}
+    for target in targets:
+        inputs, output = target.resolve()
+        plans[target.name] = Plan(target, inputs, output, {})
+
+    producers = {plan.output.resolve(): name for name, plan in plans.items()}
+    deps = {name: {producers[p.resolve()] for p in plan.inputs if p.resolve() in producers} - {name}
+            for name, plan in plans.items()}
+
+    waves: List[List[Plan]] = []
+    done = set()
+    while len(done) < len(plans):
+        wave = [name for name in plans if name not in done and deps[name] <= done]
+        if not wave:
+            raise ValueError(f"타깃 의존성에 순환이 있습니다: {sorted(set(plans) - done)}")
+        waves.append([plans[name] for name in wave])
+        done.update(wave)
+
+    rebuilt = set()
+    for wave in waves:
+        for plan in wave:
+            pending = {p for p in plan.inputs
+                       if p.resolve() in producers and plans[producers[p.resolve()]].status == '빌드'}
+            plan.missing = tuple(str(p) for p in plan.inputs if not p.exists() and p not in pending)
+            if plan.missing:
+                plan.status = '입력 없음'
+                continue
+            for p in plan.inputs:
+                if p not in digests and p.exists():
+                    digests[p] = file_digest(p)
+            plan.fingerprint = {'code': code_digest(plan.target.module)}
+            plan.fingerprint.update({str(p): digests[p] for p in plan.inputs if p in digests})
+
+            stamp = stamps.get(plan.target.name)
+            up_to_date = (
+                not force
+                and not deps[plan.target.name] & rebuilt
+                and stamp is not None
+                and stamp.get('fingerprint') == plan.fingerprint
+                and plan.output.exists()
+                and stamp.get('output') == file_digest(plan.output)
+            )
+            plan.status = '최신' if up_to_date else '빌드'
+            if not up_to_date:
+                rebuilt.add(plan.target.name)
+    return waves
+
+
+# ============================================
+# 실행
+# ============================================
+
+def ingest(pending: Sequence[Plan], jobs: int, times: List[StageTime]) -> parallel_ingest.Ingested:
+    """빌드할 타깃이 쓰는 원본 CSV/통합 문서를 파일마다 한 번씩 병렬 적재 (바뀐 분기 블록만 다시 파싱)"""
+    known = {p.resolve() for p in build_cache.SOURCE_FILES}
+    csv_paths = list(dict.fromkeys(p for plan in pending for p in plan.inputs if p.resolve() in known))
+    workbooks = {}
+    for plan in pending:
+        if plan.target.sheets is not None:
+            sheet_names, marker = plan.target.sheets()
+            for p in plan.inputs:
+                if p.suffix.lower() == '.xlsx':
+                    workbooks.setdefault(p, (p, tuple(sheet_names), marker))
+
+    t0 = time.perf_counter()
+    with profiling.span('ingest'), run_metrics.stage('ingest'):
+        result = parallel_ingest.ingest(csv_paths, list(workbooks.values()), jobs, strict=False)
+    for t in result.times:
+        times.append(StageTime(f"적재: {t.name}", '완료', t.seconds, t.note))
+    for path, error in result.errors.items():
+        # 적재 실패는 여기서 멈추지 않음: 해당 타깃이 직접 읽다가 실패해 로그에 남음
+        times.append(StageTime(f"적재: {path.name}", '실패', 0.0, error))
+    if result.times:
+        times.append(StageTime("적재 (벽시계)", '완료', time.perf_counter() - t0, f"파일 {len(result.times)}개"))
+    return result
+
+
+def run_target(name: str, module: str, sources: Sequence[build_cache.ParsedSource],
+               sheets: Sequence[Tuple[Path, str, dict]], log_path: str,
+               profile: Optional[dict] = None, metrics: Optional[dict] = None) -> Tuple[float, Optional[str]]:
+    """
+    작업 프로세스: 넘겨받은 원본/시트를 등록하고 스크립트 main() 실행 → (소요 초, 오류)
+    profile: profiling.session 인자 (타깃별 cProfile/tracemalloc 파일, 같은 프로세스에서 실행하면 파이프라인 세션에 포함)
+    metrics: run_metrics.session 인자 (기본: 조용히 실행하고 지표만 기록)
+    """
+    t0 = time.perf_counter()
+    build_cache.preload(sources)
+    for path, marker, columns in sheets:
+        excel_source.preload(path, marker, columns)
+    cwd = os.getcwd()
+    os.chdir(BASE_DIR)   # 스크립트는 현재 폴더 기준 상대 경로를 씀
+    try:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'w', encoding='utf-8') as log, \
+                contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            try:
+                with profiling.session(name, **(profile or {})), run_metrics.session(name, **(metrics or {})), \
+                        profiling.span(name):
+                    importlib.import_module(module).main()
+            except Exception as e:
+                traceback.print_exc()
+                return time.perf_counter() - t0, f"{type(e).__name__}: {e}"
+    finally:
+        os.chdir(cwd)
+    return time.perf_counter() - t0, None
+
+
+def execute(waves: List[List[Plan]], stamps: Dict[str, dict], jobs: int,
+            profile: Optional[dict] = None, metrics: Optional[dict] = None) -> List[StageTime]:
+    times: List[StageTime] = []
+    pending = [plan for wave in waves for plan in wave if plan.status == '빌드']
+
+    # 빌드할 타깃이 쓰는 원본만, 한 번씩 병렬 적재
+    loaded = ingest(pending, jobs, times)
+
+    # 다른 타깃의 출력인 입력: 앞 단계에서 다시 만들었을 수 있으므로 실행 직전 내용으로 지문 기록
+    outputs = {plan.output.resolve() for wave in waves for plan in wave}
+
+    def submit_args(plan):
+        plan.fingerprint.update({str(p): file_digest(p) for p in plan.inputs if p.resolve() in outputs and p.exists()})
+        plan_sources = [loaded.sources[p.resolve()] for p in plan.inputs if p.resolve() in loaded.sources]
+        plan_sheets = []
+        if plan.target.sheets is not None:
+            marker = plan.target.sheets()[1]
+            plan_sheets = [(p, marker, loaded.sheets[p.resolve()]) for p in plan.inputs if p.resolve() in loaded.sheets]
+        return (plan.target.name, plan.target.module, plan_sources, plan_sheets,
+                str(LOG_DIR / f"{plan.target.name}.log"), profile, metrics)
+
+    def finish(plan, elapsed, error):
+        if error is None:
+            stamps[plan.target.name] = {'fingerprint': plan.fingerprint, 'output': file_digest(plan.output)}
+            times.append(StageTime(plan.target.name, '빌드', elapsed, plan.output.name))
+        else:
+            stamps.pop(plan.target.name, None)
+            times.append(StageTime(plan.target.name, '실패', elapsed, error))
+
+    failed = set()
+    for wave in waves:
+        for plan in wave:
+            if plan.status != '빌드':
+                note = plan.output.name if plan.status == '최신' else f"{len(plan.missing)}개 없음: {plan.missing[0]}"
+                times.append(StageTime(plan.target.name, plan.status, 0.0, note))
+
+        runnable = [plan for plan in wave if plan.status == '빌드']
+        blocked = [plan for plan in runnable if plan.target.name in failed]
+        for plan in blocked:
+            times.append(StageTime(plan.target.name, '건너뜀', 0.0, "선행 타깃 실패"))
+        runnable = [plan for plan in runnable if plan not in blocked]
+
+        if jobs <= 1 or len(runnable) <= 1:
+            for plan in runnable:
+                elapsed, error = run_target(*submit_args(plan))
+                finish(plan, elapsed, error)
+                if error:
+                    failed.add(plan.target.name)
+            continue
+
+        # 풀을 쓸 때만 적재 (concurrent.futures 는 multiprocessing/logging 까지 import)
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(runnable))) as pool:
+            futures = {profiling.submit(pool, run_target, *submit_args(plan)): plan for plan in runnable}
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plan = futures.pop(future)
+                    elapsed, error = profiling.collect(future)
+                    finish(plan, elapsed, error)
+                    if error:
+                        failed.add(plan.target.name)
+    return times
+
+
+def print_table(times: Sequence[StageTime], total: float):
+    print(f"\n{'단계':<32} {'상태':<8} {'시간':>10}  비고")
+    print("-" * 80)
+    for t in times:
+        print(f"{t.stage:<32} {t.status:<8} {t.seconds * 1000:>8.1f}ms  {t.note}")
+    print("-" * 80)
+    print(f"{'전체 (벽시계)':<32} {'':<8} {total * 1000:>8.1f}ms")
+
+
+def run(names: Sequence[str] = (), force: bool = False, jobs: Optional[int] = None,
+        profile: Optional[dict] = None, metrics: Optional[dict] = None) -> List[StageTime]:
+    """타깃 빌드 (names 가 비어 있으면 전체, profile/metrics: 타깃별 profiling.session/run_metrics.session 인자)"""
+    t0 = time.perf_counter()
+    by_name = {target.name: target for target in TARGETS}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"알 수 없는 타깃: {', '.join(unknown)} (가능: {', '.join(by_name)})")
+    targets = [by_name[name] for name in names] if names else TARGETS
+
+    stamps = load_stamps()
+    waves = make_plan(targets, stamps, force)
+    times = execute(waves, stamps, jobs or os.cpu_count() or 1, profile, metrics)
+    save_stamps(stamps)
+
+    print_table(times, time.perf_counter() - t0)
+    if any(t.status == '실패' for t in times):
+        print(f"\n실패한 타깃의 출력은 {LOG_DIR} 를 확인하세요.")
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 데이터 빌드")
+    parser.add_argument("targets", nargs="*", help="빌드할 타깃 (생략하면 전체)")
+    parser.add_argument("--force", action="store_true", help="입력이 그대로여도 다시 빌드")
+    parser.add_argument("--jobs", type=int, default=None, help="동시 실행 프로세스 수 (기본: CPU 수, 1이면 순서대로)")
+    parser.add_argument("--list", action="store_true", help="타깃과 현재 상태만 출력")
+    profiling.add_arguments(parser)
+    run_metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        targets = [t for t in TARGETS if not args.targets or t.name in args.targets]
+        for wave_no, wave in enumerate(make_plan(targets, load_stamps(), args.force), start=1):
+            for plan in wave:
+                print(f"[{wave_no}] {plan.target.name:<24} {plan.status:<8} {plan.target.module}.py -> {plan.output}")
+                for path in plan.inputs:
+                    print(f"      {'✓' if path.exists() else '✗'} {path}")
+        return
+
+    # 추적(trace)은 파이프라인 세션 하나에 모으고, cProfile/tracemalloc 은 타깃(작업 프로세스)마다 따로 남김
+    target_profile = {'profile': True, 'out_dir': args.profile_dir, 'top': args.top} if args.profile else None
+    # 지표는 파이프라인(적재)과 타깃 스크립트가 같은 run ID 로 한 파일에 기록 (--verbose 는 타깃 로그에만 영향)
+    target_metrics = dict(run_metrics.options(args), run_id=run_metrics.new_run_id())
+    with profiling.session('build_pipeline', **profiling.options(args)), \
+            run_metrics.session('build_pipeline', verbose=True, path=target_metrics['path'],
+                                run_id=target_metrics['run_id']):
+        times = run(args.targets, args.force, args.jobs, target_profile, target_metrics)
+    if any(t.status == '실패' for t in times):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
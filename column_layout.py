@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+분기 블록 CSV 컬럼 레이아웃 감지
+- BS(13/15열), IS(17열), 분기IS_법인별(14열) CSV는 모두 "분기명 + 법인 컬럼 + 합계/연결 컬럼" 블록이 가로로 반복됩니다.
+- 헤더를 한 번만 스캔해 분기별 컬럼 위치(법인, 단순합계, 연결값, 누적, 당분기, 전년 컬럼)를 계산하고,
+  같은 헤더에 대해서는 캐시된 불변 객체를 돌려줍니다.
+
+사용 예:
+    layout = detect_layout(rows[0])
+    block = layout.quarter(4)
+    value = cell(row, block.entity_col('세르지오'))
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+from profiling import traced
+
+# 블록 시작 셀: "25.1Q" 형식 또는 "과  목"
+QUARTER_LABEL = re.compile(r'^(\d{2})\.([1-4])[Qq]$')
+SUBJECT_LABEL = re.compile(r'^과\s*목$')
+
+# 블록 내 합계/연결 컬럼 헤더
+BALANCE_LABEL = re.compile(r'^(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일$')
+YTD_LABEL = re.compile(r'^(\d{4})년\s*누적$')
+PREV_YTD_LABEL = re.compile(r'^(\d{4})년\s*전분기\s*누적$')
+QTD_LABEL = re.compile(r'^(\d{4})년\s*(?:당분기|[1-4]분기)(?:\s*연결)?$')
+SIMPLE_SUM_LABEL = re.compile(r'단순합계')
+
+
+@dataclass(frozen=True)
+class QuarterBlock:
+    """한 분기 블록의 컬럼 위치 (모두 0-based 절대 인덱스, 없으면 None)"""
+    label: str                          # 헤더 원문 (예: '25.1Q')
+    year: int
+    quarter: int
+    start: int                          # 계정명 컬럼
+    end: int                            # 블록 끝 (exclusive)
+    entities: Tuple[Tuple[str, int], ...]  # (법인 헤더명, 컬럼) - 헤더 순서
+    simple_sum: Optional[int] = None    # 단순합계
+    balance: Optional[int] = None       # BS 연결값 (당기말)
+    prior_balance: Optional[int] = None  # BS 비교값 (전기말)
+    ytd: Optional[int] = None           # IS 당해연도 누적
+    prev_ytd: Optional[int] = None      # IS 당해연도 전분기 누적
+    qtd: Optional[int] = None           # IS 당분기
+    prior_ytd: Optional[int] = None     # IS 전년도 누적
+    prior_prev_ytd: Optional[int] = None  # IS 전년도 전분기 누적
+    prior_qtd: Optional[int] = None     # IS 전년도 당분기
+
+    @property
+    def period_key(self) -> str:
+        """대시보드 기간 키 (예: 2025_1Q)"""
+        return f"{self.year}_{self.quarter}Q"
+
+    def entity_col(self, name: str) -> Optional[int]:
+        """법인 헤더명(공백 무시)으로 컬럼 인덱스 조회"""
+        key = name.strip()
+        for entity, col in self.entities:
+            if entity == key:
+                return col
+        return None
+
+
+@dataclass(frozen=True)
+class ColumnLayout:
+    """CSV 전체의 분기 블록 목록"""
+    width: int
+    blocks: Tuple[QuarterBlock, ...]
+
+    def quarter(self, quarter: int) -> Optional[QuarterBlock]:
+        """분기 번호(1~4)로 블록 조회 (같은 분기가 여러 번이면 마지막 블록)"""
+        found = None
+        for block in self.blocks:
+            if block.quarter == quarter:
+                found = block
+        return found
+
+    def period(self, period_key: str) -> Optional[QuarterBlock]:
+        """기간 키(예: 2025_4Q)로 블록 조회"""
+        for block in self.blocks:
+            if block.period_key == period_key:
+                return block
+        return None
+
+    @property
+    def account_col(self) -> int:
+        """계정명 컬럼 (첫 번째 블록 기준, 모든 블록의 계정 순서는 같음)"""
+        return self.blocks[0].start if self.blocks else 0
+
+
+def cell(row: Sequence[str], col: Optional[int]) -> str:
+    """row[col] (컬럼이 없거나 범위를 벗어나면 빈 문자열)"""
+    if col is None or col >= len(row):
+        return ''
+    return row[col]
+
+
+def _classify_tail(header: Sequence[str], start: int, end: int, year: Optional[int]):
+    """블록의 법인 컬럼과 합계/연결 컬럼 분류"""
+    entities = []
+    fields = {}
+    balances = []
+    in_entities = True
+
+    for j in range(start + 1, end):
+        h = str(header[j]).strip()
+        if SIMPLE_SUM_LABEL.search(h):
+            fields.setdefault('simple_sum', j)
+            in_entities = False
+            continue
+
+        m = BALANCE_LABEL.match(h)
+        if m:
+            balances.append((int(m.group(1)), j))
+            in_entities = False
+            continue
+
+        for pattern, current, prior in (
+            (YTD_LABEL, 'ytd', 'prior_ytd'),
+            (PREV_YTD_LABEL, 'prev_ytd', 'prior_prev_ytd'),
+            (QTD_LABEL, 'qtd', 'prior_qtd'),
+        ):
+            m = pattern.match(h)
+            if m:
+                label_year = int(m.group(1))
+                if year is None:
+                    year = label_year
+                fields.setdefault(current if label_year == year else prior, j)
+                in_entities = False
+                break
+        else:
+            if in_entities and h:
+                entities.append((h, j))
+
+    # BS: 첫 번째 날짜 컬럼이 당기말 연결값, 그 다음이 비교값
+    if balances:
+        fields['balance'] = balances[0][1]
+        if year is None:
+            year = balances[0][0]
+        if len(balances) > 1:
+            fields['prior_balance'] = balances[1][1]
+
+    return tuple(entities), fields, year
+
+
+@lru_cache(maxsize=64)
+@traced('layout')   # 캐시에 없는 헤더만 기록
+def _detect(header: Tuple[str, ...]) -> ColumnLayout:
+    starts = []
+    for idx, h in enumerate(header):
+        h = h.strip()
+        m = QUARTER_LABEL.match(h)
+        if m:
+            starts.append((idx, h, 2000 + int(m.group(1)), int(m.group(2))))
+        elif SUBJECT_LABEL.match(h):
+            # 분기명이 없는 레이아웃: 연도는 누적 컬럼에서, 분기는 블록 순서로 결정
+            starts.append((idx, h, None, None))
+
+    blocks = []
+    for i, (start, label, year, quarter) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(header)
+        entities, fields, year = _classify_tail(header, start, end, year)
+        blocks.append(QuarterBlock(
+            label=label,
+            year=year or 0,
+            quarter=quarter or len(blocks) + 1,
+            start=start,
+            end=end,
+            entities=entities,
+            **fields,
+        ))
+
+    return ColumnLayout(width=len(header), blocks=tuple(blocks))
+
+
+def detect_layout(header: Sequence) -> ColumnLayout:
+    """헤더 행에서 분기 블록 레이아웃 감지 (동일 헤더는 캐시된 결과 반환)"""
+    # pandas로 읽은 헤더의 NaN(h != h)도 빈 셀로 취급
+    return _detect(tuple('' if h is None or h != h else str(h) for h in header))
@@ -0,0 +1,147 @@
+// ============================================
+// .fnfc 컬럼형 바이너리 디코더 (columnar_artifact.py 가 생성, 형식 설명은 그 파일 참고)
+// - 문자열 표 + (깊이, 종류)별 블록. 값 컬럼은 버퍼를 복사하지 않고 typed array 로 바로 봅니다.
+// - decodeColumns: 블록 단위 컬럼 (차트/집계에서 바로 쓰기)
+// - decodeArtifact: 원본 JSON과 같은 중첩 객체 (키 순서 포함)
+// ============================================
+
+const MAGIC = 'FNFC';
+const FORMAT_VERSION = 1;
+const FLAG_WIDE_KEYS = 1;
+
+// columnar_artifact.py 의 KIND_* 와 같아야 함
+export const KIND = {
+  INT32: 1,
+  INT64: 2,
+  FLOAT64: 3,
+  STRING: 4,
+  EMPTY: 5,
+};
+
+const VALUE_ARRAYS = {
+  [KIND.INT32]: Int32Array,
+  [KIND.INT64]: BigInt64Array,
+  [KIND.FLOAT64]: Float64Array,
+  [KIND.STRING]: Uint32Array,
+};
+
+const align8 = (pos) => pos + ((8 - (pos % 8)) % 8);
+
+export const decodeColumns = (arrayBuffer) => {
+  const buffer = arrayBuffer instanceof ArrayBuffer ? arrayBuffer : arrayBuffer.buffer;
+  const base = arrayBuffer instanceof ArrayBuffer ? 0 : arrayBuffer.byteOffset;
+  if (base % 8 !== 0) {
+    throw new Error('FNFC 버퍼는 8바이트 경계에서 시작해야 합니다');
+  }
+  const view = new DataView(buffer, base);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, base, 4));
+  if (magic !== MAGIC) throw new Error('FNFC 형식이 아닙니다');
+  const version = view.getUint16(4, true);
+  if (version !== FORMAT_VERSION) throw new Error(`지원하지 않는 FNFC 버전: ${version}`);
+  const flags = view.getUint16(6, true);
+  const stringCount = view.getUint32(8, true);
+  const blobBytes = view.getUint32(12, true);
+  const blockCount = view.getUint32(16, true);
+  const KeyArray = flags & FLAG_WIDE_KEYS ? Uint32Array : Uint16Array;
+
+  let pos = 24;
+  const take = (ArrayType, count) => {
+    const arr = new ArrayType(buffer, base + pos, count);
+    pos = align8(pos + arr.byteLength);
+    return arr;
+  };
+
+  const offsets = take(Uint32Array, stringCount + 1);
+  const blob = new Uint8Array(buffer, base + pos, blobBytes);
+  pos = align8(pos + blobBytes);
+  const textDecoder = new TextDecoder('utf-8');
+  const strings = new Array(stringCount);
+  for (let i = 0; i < stringCount; i += 1) {
+    strings[i] = textDecoder.decode(blob.subarray(offsets[i], offsets[i + 1]));
+  }
+
+  const blocks = [];
+  for (let b = 0; b < blockCount; b += 1) {
+    const kind = view.getUint8(pos);
+    const depth = view.getUint8(pos + 1);
+    const rows = view.getUint32(pos + 4, true);
+    const runCount = view.getUint32(pos + 8, true);
+    pos += 16;
+    const runs = take(Uint32Array, 2 * runCount);
+    const keyRuns = take(Uint32Array, depth);
+    const keys = [];
+    for (let level = 0; level < depth; level += 1) {
+      const n = keyRuns[level];
+      if (n === 0) {
+        keys.push(take(KeyArray, rows));
+      } else {
+        const ids = take(KeyArray, n);
+        const lengths = take(Uint32Array, n);
+        const column = new KeyArray(rows);
+        let row = 0;
+        for (let i = 0; i < n; i += 1) {
+          column.fill(ids[i], row, row + lengths[i]);
+          row += lengths[i];
+        }
+        keys.push(column);
+      }
+    }
+    const values = kind === KIND.EMPTY ? null : take(VALUE_ARRAYS[kind], rows);
+    blocks.push({ kind, depth, rows, runs, keys, values });
+  }
+  return { strings, blocks };
+};
+
+const leafValue = (block, strings, row) => {
+  switch (block.kind) {
+    case KIND.INT64:
+      return Number(block.values[row]); // 백만원 단위 금액은 2^53 안
+    case KIND.STRING:
+      return strings[block.values[row]];
+    case KIND.EMPTY:
+      return {};
+    default:
+      return block.values[row];
+  }
+};
+
+export const decodeArtifact = (arrayBuffer) => {
+  const { strings, blocks } = decodeColumns(arrayBuffer);
+
+  // 문서 순서 구간을 모아 정렬 → 원본과 같은 키 순서로 조립
+  const runs = [];
+  blocks.forEach((block, b) => {
+    let row = 0;
+    for (let i = 0; i < block.runs.length; i += 2) {
+      runs.push([block.runs[i], block.runs[i + 1], b, row]);
+      row += block.runs[i + 1];
+    }
+  });
+  runs.sort((x, y) => x[0] - y[0]);
+
+  const root = {};
+  runs.forEach(([, length, b, start]) => {
+    const block = blocks[b];
+    const last = block.depth - 1;
+    for (let row = start; row < start + length; row += 1) {
+      let node = root;
+      for (let level = 0; level < last; level += 1) {
+        const key = strings[block.keys[level][row]];
+        let child = node[key];
+        if (child === undefined) {
+          child = {};
+          node[key] = child;
+        }
+        node = child;
+      }
+      node[strings[block.keys[last][row]]] = leafValue(block, strings, row);
+    }
+  });
+  return root;
+};
+
+export const loadArtifact = async (url) => {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`);
+  return decodeArtifact(await response.arrayBuffer());
+};
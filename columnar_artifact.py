@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+컬럼형 바이너리 산출물 (.fnfc) - 대시보드 JSON의 대안 출력 형식
+- JSON 출력은 같은 계정/법인/기간 문자열과 'consolidated'/'entities' 같은 키를 셀마다 반복합니다.
+  .fnfc 는 모든 문자열을 한 번만 담은 문자열 표(사전 인코딩) + 값 블록(typed array)으로 저장합니다.
+- 잎(leaf) 값은 (경로 깊이, 종류)별 블록으로 모읍니다. 블록 하나 = 깊이만큼의 키 컬럼(문자열 번호) + 값 컬럼.
+  정수 블록은 범위에 맞춰 Int32/Int64, 문자열 값은 문자열 번호(Uint32), 실수는 Float64.
+- 위쪽 단계 키(계정, 기간 등)는 같은 번호가 이어지므로, 더 작을 때만 (번호, 반복 수) 구간으로 저장합니다.
+- 모든 배열은 8바이트 경계에 맞춰, 브라우저에서 복사 없이 typed array 로 바로 볼 수 있습니다 (columnarDecoder.js).
+- 블록마다 잎의 문서 순서 구간(run)을 함께 저장해, 복원한 객체의 키 순서도 원본과 같습니다
+  (JSON.stringify(decode(...)) 가 원본 JSON과 같은 문자열).
+
+형식 (리틀 엔디언):
+    헤더 24B      magic 'FNFC', version u16, flags u16 (bit0: 키 번호 u32, 아니면 u16),
+                  문자열 수 u32, 문자열 바이트 u32, 블록 수 u32, 예약 u32
+    문자열 표     offsets u32[문자열 수 + 1] (UTF-8 바이트 위치), UTF-8 바이트
+    블록 × N      블록 헤더 16B: kind u8, depth u8, 예약 u16, rows u32, runs u32, 예약 u32
+                  문서 순서 구간 (시작 u32, 길이 u32) × runs - 블록의 행이 이 순서대로 문서에 나옴
+                  키 컬럼별 구간 수 u32 × depth (0이면 원본 컬럼)
+                  키 컬럼 depth 개: 원본 (u16/u32 × rows) 또는 연속 구간 (번호 u16/u32 × 구간 수, 길이 u32 × 구간 수)
+                  값 컬럼 (kind 별, EMPTY 는 없음)
+    (각 배열 뒤는 8바이트 경계까지 0으로 채움)
+
+사용법:
+    python columnar_artifact.py          # shard_artifacts.STATEMENTS 출력들을 public/data/columnar/*.fnfc 로
+    data = decode(Path('public/data/columnar/entity_is_data.fnfc').read_bytes())
+"""
+
+import json
+import struct
+import sys
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+import run_metrics
+from profiling import run_main, span
+from shard_artifacts import BASE_DIR, DATA_DIR, STATEMENTS, write_if_changed
+
+COLUMNAR_DIR = DATA_DIR / "columnar"
+INDEX_FILE = COLUMNAR_DIR / "index.json"
+
+MAGIC = b'FNFC'
+FORMAT_VERSION = 1
+FLAG_WIDE_KEYS = 1
+
+# 블록 종류 (columnarDecoder.js 의 KIND 와 같아야 함)
+KIND_INT32 = 1
+KIND_INT64 = 2
+KIND_FLOAT64 = 3
+KIND_STRING = 4
+KIND_EMPTY = 5    # 빈 객체 {}
+
+_HEADER = struct.Struct('<4sHHIIII')
+_BLOCK_HEADER = struct.Struct('<BBHIII')
+_VALUE_DTYPES = {KIND_INT32: '<i4', KIND_INT64: '<i8', KIND_FLOAT64: '<f8', KIND_STRING: '<u4'}
+
+_INT32 = np.iinfo(np.int32)
+_INT64 = np.iinfo(np.int64)
+
+
+class _Strings:
+    """문자열 → 번호 (처음 나온 순서)"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def id(self, text: str) -> int:
+        i = self.ids.get(text)
+        if i is None:
+            i = self.ids[text] = len(self.ids)
+        return i
+
+
+def _leaf_kind(value: Any) -> int:
+    if isinstance(value, bool) or value is None:
+        raise TypeError(f"지원하지 않는 값: {value!r} (정수/실수/문자열/객체만 가능)")
+    if isinstance(value, int):
+        if not _INT64.min <= value <= _INT64.max:
+            raise OverflowError(f"int64 범위를 벗어난 정수: {value}")
+        return KIND_INT32 if _INT32.min <= value <= _INT32.max else KIND_INT64
+    if isinstance(value, float):
+        return KIND_FLOAT64
+    if isinstance(value, str):
+        return KIND_STRING
+    if isinstance(value, dict) and not value:
+        return KIND_EMPTY
+    raise TypeError(f"지원하지 않는 값: {type(value).__name__}")
+
+
+def _pad(out: bytearray):
+    out.extend(b'\0' * (-len(out) % 8))
+
+
+def _key_column(column: np.ndarray) -> Tuple[int, List[np.ndarray]]:
+    """키 컬럼 하나 → (구간 수, 배열들). 연속 구간이 원본보다 작을 때만 구간으로 (아니면 구간 수 0 + 원본)"""
+    rows = len(column)
+    starts = np.concatenate(([0], np.flatnonzero(column[1:] != column[:-1]) + 1))
+    if len(starts) * (column.itemsize + 4) >= rows * column.itemsize:
+        return 0, [column]
+    lengths = np.diff(np.append(starts, rows)).astype('<u4')
+    return len(starts), [column[starts], lengths]
+
+
+def encode(data: Dict[str, Any]) -> bytes:
+    """중첩 dict(잎: 정수/실수/문자열/빈 객체) → .fnfc 바이트"""
+    if not isinstance(data, dict):
+        raise TypeError("최상위 값은 객체여야 합니다")
+    strings = _Strings()
+    groups: Dict[Tuple[int, str], dict] = {}   # (깊이, 종류군) → {'runs', 'keys', 'values', 'kind'}
+    order = 0
+
+    # 문서 순서 깊이 우선 순회 (경로, 자식 반복자) 스택
+    stack: List[Tuple[Tuple[int, ...], Any]] = [((), iter(data.items()))]
+    while stack:
+        path, items = stack[-1]
+        for key, value in items:
+            key_path = path + (strings.id(key),)
+            if isinstance(value, dict) and value:
+                stack.append((key_path, iter(value.items())))
+                break
+            kind = _leaf_kind(value)
+            family = 'int' if kind in (KIND_INT32, KIND_INT64) else str(kind)
+            group = groups.get((len(key_path), family))
+            if group is None:
+                group = groups[(len(key_path), family)] = {'runs': [], 'keys': [], 'values': [], 'kind': kind}
+            runs = group['runs']
+            if runs and runs[-1][0] + runs[-1][1] == order:
+                runs[-1][1] += 1
+            else:
+                runs.append([order, 1])
+            group['keys'].append(key_path)
+            if kind == KIND_STRING:
+                group['values'].append(strings.id(value))
+            elif kind != KIND_EMPTY:
+                group['values'].append(value)
+            if kind == KIND_INT64:
+                group['kind'] = KIND_INT64
+            order += 1
+        else:
+            stack.pop()
+
+    wide = len(strings.ids) > 0xFFFF
+    key_dtype = '<u4' if wide else '<u2'
+    texts = [text.encode('utf-8') for text in strings.ids]
+    offsets = np.zeros(len(texts) + 1, dtype='<u4')
+    np.cumsum([len(t) for t in texts], out=offsets[1:])
+    blob = b''.join(texts)
+
+    out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_WIDE_KEYS if wide else 0,
+                                 len(texts), len(blob), len(groups), 0))
+    out += offsets.tobytes()
+    _pad(out)
+    out += blob
+    _pad(out)
+
+    for (depth, _), group in groups.items():
+        kind = group['kind']
+        rows = len(group['keys'])
+        out += _BLOCK_HEADER.pack(kind, depth, 0, rows, len(group['runs']), 0)
+        out += np.array(group['runs'], dtype='<u4').tobytes()
+        _pad(out)
+        keys = np.array(group['keys'], dtype=key_dtype).reshape(rows, depth)
+        columns = [_key_column(np.ascontiguousarray(keys[:, level])) for level in range(depth)]
+        out += np.array([n for n, _ in columns], dtype='<u4').tobytes()
+        _pad(out)
+        for _, arrays in columns:
+            for arr in arrays:
+                out += arr.tobytes()
+                _pad(out)
+        if kind != KIND_EMPTY:
+            out += np.array(group['values'], dtype=_VALUE_DTYPES[kind]).tobytes()
+            _pad(out)
+    return bytes(out)
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    """.fnfc 바이트 → 중첩 dict (encode 의 역)"""
+    buf = memoryview(data)
+    magic, version, flags, n_strings, blob_bytes, n_blocks, _ = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("FNFC 형식이 아닙니다")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 FNFC 버전: {version}")
+    pos = _HEADER.size
+
+    def take(dtype, count):
+        nonlocal pos
+        arr = np.frombuffer(buf, dtype=dtype, count=count, offset=pos)
+        pos += arr.nbytes
+        pos += -pos % 8
+        return arr
+
+    offsets = take('<u4', n_strings + 1).tolist()
+    blob = bytes(buf[pos:pos + blob_bytes])
+    pos += blob_bytes + (-blob_bytes % 8)
+    strings = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n_strings)]
+    key_dtype = '<u4' if flags & FLAG_WIDE_KEYS else '<u2'
+
+    blocks = []
+    runs = []   # (문서 순서 시작, 길이, 블록 번호, 블록 안 시작 행)
+    for b in range(n_blocks):
+        kind, depth, _, rows, n_runs, _ = _BLOCK_HEADER.unpack_from(buf, pos)
+        pos += _BLOCK_HEADER.size
+        row = 0
+        for start, length in take('<u4', 2 * n_runs).reshape(n_runs, 2).tolist():
+            runs.append((start, length, b, row))
+            row += length
+        columns = []
+        for n_key_runs in take('<u4', depth).tolist():
+            if n_key_runs:
+                ids = take(key_dtype, n_key_runs)
+                column = np.repeat(ids, take('<u4', n_key_runs))
+            else:
+                column = take(key_dtype, rows)
+            columns.append([strings[i] for i in column.tolist()])
+        if kind == KIND_EMPTY:
+            values = [{} for _ in range(rows)]
+        else:
+            values = take(_VALUE_DTYPES[kind], rows).tolist()
+            if kind == KIND_STRING:
+                values = [strings[i] for i in values]
+        blocks.append((depth, columns, values))
+
+    root: Dict[str, Any] = {}
+    for _, length, b, row in sorted(runs):
+        depth, columns, values = blocks[b]
+        for r in range(row, row + length):
+            node = root
+            for level in range(depth - 1):
+                key = columns[level][r]
+                child = node.get(key)
+                if child is None:
+                    child = node[key] = {}
+                node = child
+            node[columns[depth - 1][r]] = values[r]
+    return root
+
+
+def build_artifacts(statements: Dict[str, str] = STATEMENTS) -> dict:
+    """재무제표 출력 JSON들을 .fnfc 로 쓰고 목록(index.json) 반환 (없는 출력 파일은 건너뜀)"""
+    index = {'version': FORMAT_VERSION, 'files': {}}
+    for name, filename in statements.items():
+        path = BASE_DIR / filename
+        if not path.exists():
+            print(f"  건너뜀: {filename} 없음", file=sys.stderr)
+            continue
+        with run_metrics.stage('load', file=filename):
+            raw = path.read_bytes()
+            run_metrics.count(bytes_read=len(raw))
+            data = json.loads(raw)
+        with span('serialize', file=f"{name}.fnfc"):
+            payload = encode(data)
+        if json.dumps(decode(payload), ensure_ascii=False) != json.dumps(data, ensure_ascii=False):
+            raise ValueError(f"{filename}: .fnfc 복원 결과가 원본과 다릅니다")
+        write_if_changed(COLUMNAR_DIR / f"{name}.fnfc", payload)
+        json_bytes = len(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        index['files'][name] = {'path': f"columnar/{name}.fnfc", 'bytes': len(payload), 'json_bytes': json_bytes}
+        if run_metrics.verbose():
+            print(f"  {filename:<28} JSON {json_bytes:>8,}B → .fnfc {len(payload):>8,}B")
+    write_if_changed(INDEX_FILE, json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8'))
+    return index
+
+
+def main():
+    verbose = run_metrics.verbose()
+    if verbose:
+        print("컬럼형 바이너리 산출물 생성...")
+    index = build_artifacts()
+    if verbose:
+        print(f"\n목록: {INDEX_FILE.relative_to(BASE_DIR)} (파일 {len(index['files'])}개)")
+
+
+if __name__ == "__main__":
+    run_main("columnar_artifact", main)
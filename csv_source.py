@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+CSV 바이트 로더
+- 파일을 바이트로 한 번만 읽고, 앞부분 샘플로 인코딩을 판단(BOM → UTF-8 유효성 → CP949)한 뒤 한 번만 디코딩합니다.
+- 판단한 인코딩은 (경로, mtime, 크기) 기준으로 .cache/encodings.json 에 저장해 다음 실행에서는 감지를 건너뜁니다.
+
+사용 예:
+    rows, encoding = read_rows('2025_IS.csv')   # cp949
+    text, encoding = read_text('2025_BS.csv')   # utf-8-sig (BOM 제거)
+    text, encoding = decode_bytes(path, data)   # 이미 읽은 바이트 (해시 계산 후 디코딩 등)
+"""
+
+import codecs
+import csv
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import run_metrics
+from profiling import traced
+
+# 인코딩 캐시 파일 (로컬 전용, git 제외)
+ENCODING_CACHE = Path(__file__).parent / ".cache" / "encodings.json"
+
+# 인코딩 판단에 쓰는 앞부분 바이트 수
+SAMPLE_SIZE = 64 * 1024
+
+# 감지한 인코딩으로 디코딩이 실패했을 때 시도할 순서
+FALLBACK_ENCODINGS = ['utf-8', 'cp949']
+
+_cache: Optional[Dict[str, dict]] = None
+
+
+def sniff_encoding(data: bytes) -> str:
+    """바이트 앞부분으로 인코딩 판단 (BOM → UTF-8 → CP949)"""
+    if data.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    sample = data[:SAMPLE_SIZE]
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # 샘플 끝에서 멀티바이트 문자가 잘린 경우는 UTF-8로 판단
+        if len(sample) < len(data) and e.start >= len(sample) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+    return 'cp949'
+
+
+def _load_cache() -> Dict[str, dict]:
+    global _cache
+    if _cache is None:
+        try:
+            with open(ENCODING_CACHE, 'r', encoding='utf-8') as f:
+                _cache = json.load(f)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def _save_cache():
+    try:
+        ENCODING_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ENCODING_CACHE.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, ENCODING_CACHE)
+    except OSError:
+        pass  # 캐시는 선택 사항 (읽기 전용 환경 등)
+
+
+def read_text(filepath) -> Tuple[str, str]:
+    """
+    CSV 파일을 한 번 읽어 (텍스트, 인코딩) 반환
+    - 줄바꿈은 open() 텍스트 모드와 같게 '\\n' 으로 통일
+    """
+    path = Path(filepath).resolve()
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    run_metrics.count(bytes_read=len(data))
+    return decode_bytes(path, data, stat)
+
+
+@traced('decode')
+def decode_bytes(filepath, data: bytes, stat: Optional[os.stat_result] = None) -> Tuple[str, str]:
+    """이미 읽은 파일 바이트를 (텍스트, 인코딩)으로 디코딩 (read_text 와 같은 인코딩 캐시 사용)"""
+    path = Path(filepath).resolve()
+    if stat is None:
+        stat = os.stat(path)
+
+    cache = _load_cache()
+    key = str(path)
+    entry = cache.get(key)
+    if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+        encoding = entry['encoding']
+    else:
+        encoding = sniff_encoding(data)
+
+    candidates = [encoding] + [enc for enc in FALLBACK_ENCODINGS if enc != encoding]
+    for enc in candidates:
+        try:
+            text = data.decode(enc)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"Cannot read file {filepath} with any encoding")
+
+    if not entry or entry.get('encoding') != enc or entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+        cache[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'encoding': enc}
+        _save_cache()
+
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, enc
+
+
+def read_rows(filepath) -> Tuple[List[List[str]], str]:
+    """CSV 파일을 한 번 읽어 (행 목록, 인코딩) 반환"""
+    text, encoding = read_text(filepath)
+    return list(csv.reader(io.StringIO(text))), encoding
@@ -0,0 +1,129 @@
+import { useEffect, useState } from 'react';
+
+// ============================================
+// 기간별 데이터 조각 로더 (public/data, shard_artifacts.py 가 생성)
+// - manifest.json 은 매번 재검증하고, 조각 파일은 이름에 내용 해시가 있어 CDN/브라우저에서 영구 캐시됩니다.
+// - 선택 기간과 비교 기간의 분기 조각만 받아 재무제표별로 깊은 병합합니다.
+// ============================================
+
+const MANIFEST_VERSION = 1;
+const DATA_BASE = `${import.meta.env.BASE_URL}data/`;
+
+let manifestPromise = null;
+const shardPromises = new Map(); // 조각 경로 → Promise<object>
+
+const fetchJson = async (url, options) => {
+  const response = await fetch(url, options);
+  if (!response.ok) {
+    throw new Error(`${url}: HTTP ${response.status}`);
+  }
+  return response.json();
+};
+
+export const loadManifest = () => {
+  if (!manifestPromise) {
+    manifestPromise = fetchJson(`${DATA_BASE}manifest.json`, { cache: 'no-cache' })
+      .then((manifest) => {
+        if (manifest.version !== MANIFEST_VERSION) {
+          throw new Error(`manifest.json 버전 불일치: ${manifest.version} (기대: ${MANIFEST_VERSION})`);
+        }
+        return manifest;
+      })
+      .catch((error) => {
+        manifestPromise = null; // 다음 호출에서 다시 시도
+        throw error;
+      });
+  }
+  return manifestPromise;
+};
+
+const loadShard = (path) => {
+  if (!shardPromises.has(path)) {
+    const promise = fetchJson(`${DATA_BASE}${path}`).catch((error) => {
+      shardPromises.delete(path);
+      throw error;
+    });
+    shardPromises.set(path, promise);
+  }
+  return shardPromises.get(path);
+};
+
+// 깊은 병합 (shard_artifacts.merge 와 같은 규칙: 객체는 재귀, 나머지는 덮어씀)
+export const mergeShard = (target, source) => {
+  Object.entries(source).forEach(([key, value]) => {
+    const current = target[key];
+    if (value && typeof value === 'object' && !Array.isArray(value)
+        && current && typeof current === 'object' && !Array.isArray(current)) {
+      mergeShard(current, value);
+    } else {
+      target[key] = value;
+    }
+  });
+  return target;
+};
+
+// '2025_Q4' → '2025_4Q'
+export const toQuarterKey = (selectedPeriod) => {
+  const [year, quarter] = selectedPeriod.split('_');
+  return `${year}_${quarter.replace('Q', '')}Q`;
+};
+
+// 선택 기간 + 비교 기간 분기: 당분기, 전년 동분기, 직전 분기, 전기말(전년 4분기)
+export const comparisonQuarters = (selectedPeriod) => {
+  const [year, quarter] = selectedPeriod.split('_');
+  const yearNum = parseInt(year, 10);
+  const quarterNum = parseInt(quarter.replace('Q', ''), 10);
+  const prevQuarter = quarterNum === 1 ? `${yearNum - 1}_4Q` : `${yearNum}_${quarterNum - 1}Q`;
+  return [...new Set([
+    `${yearNum}_${quarterNum}Q`,
+    `${yearNum - 1}_${quarterNum}Q`,
+    prevQuarter,
+    `${yearNum - 1}_4Q`,
+  ])];
+};
+
+// { 재무제표: 병합된 데이터 } - 목록에 없는 분기는 건너뜀
+export const loadPeriodData = async (statements, quarters) => {
+  const manifest = await loadManifest();
+  const entries = statements.map((name) => {
+    const shards = manifest.statements[name] || {};
+    const paths = quarters.filter((q) => shards[q]).map((q) => shards[q].path);
+    return Promise.all(paths.map(loadShard)).then((parts) => [
+      name,
+      parts.reduce((merged, part) => mergeShard(merged, structuredClone(part)), {}),
+    ]);
+  });
+  return Object.fromEntries(await Promise.all(entries));
+};
+
+// 선택 기간이 바뀌면 필요한 조각만 받아 이미 받은 데이터에 병합 (받는 동안에는 이전 데이터 유지)
+export const usePeriodData = (statements, selectedPeriod) => {
+  const [data, setData] = useState({});
+  const [status, setStatus] = useState({ loading: true, error: null });
+  const statementKey = statements.join(',');
+
+  useEffect(() => {
+    let cancelled = false;
+    setStatus((prev) => ({ ...prev, loading: true }));
+    loadPeriodData(statementKey.split(','), comparisonQuarters(selectedPeriod))
+      .then((loaded) => {
+        if (cancelled) return;
+        setData((prev) => {
+          const next = { ...prev };
+          Object.entries(loaded).forEach(([name, part]) => {
+            next[name] = mergeShard(structuredClone(prev[name] || {}), part);
+          });
+          return next;
+        });
+        setStatus({ loading: false, error: null });
+      })
+      .catch((error) => {
+        if (!cancelled) setStatus({ loading: false, error });
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [statementKey, selectedPeriod]);
+
+  return { data, ...status };
+};
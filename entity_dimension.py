@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+법인 차원 (분기 블록 헤더의 법인 컬럼 → 정규 법인명 → 대시보드 법인 버킷)
+- 법인 목록은 고정하지 않고 각 분기 블록 헤더(column_layout.QuarterBlock.entities)에서 읽습니다.
+- 헤더 표기는 공백 무시 + 별칭 표(ENTITY_ALIASES)로 한 번만 정규화해 인터닝해 둡니다.
+  별칭 표에 없는 헤더(새 자회사)는 헤더명 그대로 새 법인이 됩니다.
+- 대시보드 법인 구분은 "버킷 = 법인 + 법인" 규칙(BucketRules)으로 정의합니다.
+  규칙을 버킷 × 법인 행렬로 바꿔 행렬 곱 한 번(rollup_engine.rollup)으로 모든 계정/기간을 합산합니다.
+  - residual 버킷: 연결 − 다른 버킷 법인 합계 (새 자회사는 자동으로 여기 포함)
+  - passthrough: 규칙에 없는 법인을 정규명 그대로 버킷으로 추가 (법인 상세 출력용)
+
+사용 예:
+    rules = BucketRules.parse(['OC(국내) = F&F', '기타 = 베트남 + 빅텐츠 + 엔터'])
+    labels, cols = block_entities(block, consolidated=block.qtd)     # 헤더 순서 정규 법인명, 컬럼
+    names, totals = rules.reduce(source.values[:, cols], labels, axis=1)   # (행, 버킷)
+    names, totals = ledger.entity_rollup(rules)                      # (계정, 버킷, 기간, 측정값)
+"""
+
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from label_index import norm
+from rollup_engine import rollup
+
+# 법인 축의 가상 법인 (블록 내 합계 컬럼)
+CONSOLIDATED = '연결'
+SIMPLE_SUM = '단순합계'
+VIRTUAL_ENTITIES = frozenset([CONSOLIDATED, SIMPLE_SUM])
+
+# 정규 법인명 → 헤더/규칙에서 쓰는 다른 표기 (공백 무시 비교). 정규명과 표기가 같은 헤더는 적지 않아도 됨
+ENTITY_ALIASES = {
+    'F&F': ('별도재무제표',),
+    'F&F Shanghai': ('IFRS(Shanghai)',),
+    'FnF HONGKONG': ('IFRS(HK)',),
+    'F&F 베트남': ('IFRS(베트남)', '베트남'),
+    '빅텐츠': ('IFRS(빅텐츠)',),
+    '엔터테인먼트': ('엔터테인머트', 'IFRS(엔터)', '엔터'),   # IS CSV 헤더는 '엔터테인머트'
+}
+
+_canonical: Dict[str, str] = {}
+for _name, _aliases in ENTITY_ALIASES.items():
+    for _alias in (_name,) + _aliases:
+        _canonical[norm(_alias)] = sys.intern(_name)
+
+# 헤더 원문 → 정규명 (한 번 계산한 헤더는 재사용)
+_interned: Dict[str, str] = {}
+
+
+def canonical_entity(header: str) -> str:
+    """법인 헤더 표기 → 정규 법인명 (별칭 표에 없으면 앞뒤 공백만 제거한 헤더명)"""
+    name = _interned.get(header)
+    if name is None:
+        name = _canonical.get(norm(header)) or sys.intern(str(header).strip())
+        _interned[header] = name
+    return name
+
+
+def block_entities(block, consolidated: Optional[int] = None) -> Tuple[Tuple[str, ...], List[int]]:
+    """
+    분기 블록의 (정규 법인명들, 컬럼들) - 헤더 순서
+    consolidated: 연결 컬럼 (블록마다 BS는 balance, IS는 ytd/qtd). 주면 CONSOLIDATED 로 맨 뒤에 추가
+    """
+    labels = [canonical_entity(name) for name, _ in block.entities]
+    cols = [col for _, col in block.entities]
+    if consolidated is not None:
+        labels.append(CONSOLIDATED)
+        cols.append(consolidated)
+    return tuple(labels), cols
+
+
+@dataclass(frozen=True)
+class BucketRules:
+    """법인 → 대시보드 버킷 규칙 (buckets 는 출력 순서)"""
+    buckets: Tuple[Tuple[str, Tuple[str, ...]], ...]   # (버킷명, 정규 법인명들)
+    residual: Optional[str] = None       # 연결 − 다른 버킷 합계를 담을 버킷명 (예: '기타')
+    consolidated: Optional[str] = None   # 연결 값을 그대로 담을 버킷명 (예: '연결')
+    passthrough: bool = False            # 규칙에 없는 법인도 정규명 그대로 버킷으로 (규칙 버킷 뒤, 헤더 순서)
+
+    @classmethod
+    def parse(cls, rules: Sequence[str], **options) -> 'BucketRules':
+        """'버킷 = 법인 + 법인' 문자열 목록 → BucketRules (법인은 헤더 표기/별칭 모두 가능)"""
+        buckets = []
+        for rule in rules:
+            name, sep, members = rule.partition('=')
+            if not sep or not name.strip():
+                raise ValueError(f"버킷 규칙 형식 오류 ('버킷 = 법인 + 법인'): {rule!r}")
+            buckets.append((name.strip(), tuple(canonical_entity(m) for m in members.split('+') if m.strip())))
+        return cls(tuple(buckets), **options)
+
+    def with_options(self, **options) -> 'BucketRules':
+        """같은 버킷에 residual/consolidated/passthrough 만 바꾼 규칙"""
+        return replace(self, **options)
+
+    def names(self, entities: Sequence[str] = ()) -> List[str]:
+        """버킷명 (출력 순서). passthrough 면 entities 중 규칙에 없는 법인 포함"""
+        return list(_compile(self, tuple(entities))[0])
+
+    def matrix(self, entities: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        법인 축 라벨(정규명, CONSOLIDATED 포함 가능)에 맞춘 (버킷명, 버킷 × 법인 int64 행렬)
+        축에 없는 규칙 법인(해당 분기에 없던 자회사)은 0으로 취급
+        """
+        names, matrix = _compile(self, tuple(entities))
+        return list(names), matrix
+
+    def reduce(self, values, entities: Sequence[str], axis: int = 0) -> Tuple[List[str], np.ndarray]:
+        """values 의 법인 축(axis)을 버킷 축으로 합산 (행렬 곱 한 번). 반환: (버킷명, 같은 위치에 버킷 축을 둔 배열)"""
+        names, matrix = self.matrix(entities)
+        values = np.moveaxis(np.asarray(values), axis, 0)
+        return names, np.moveaxis(rollup(matrix, values), 0, axis)
+
+
+@lru_cache(maxsize=256)
+def _compile(rules: BucketRules, entities: Tuple[str, ...]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    position = {}
+    for e, name in enumerate(entities):
+        position.setdefault(name, e)
+
+    names, rows = [], []
+    assigned = set()
+    for bucket, members in rules.buckets:
+        row = np.zeros(len(entities), dtype=np.int64)
+        for member in members:
+            assigned.add(member)
+            e = position.get(member)
+            if e is not None:
+                row[e] += 1
+        names.append(bucket)
+        rows.append(row)
+
+    if rules.passthrough:
+        for e, name in enumerate(entities):
+            if name in assigned or name in VIRTUAL_ENTITIES or position[name] != e:
+                continue
+            row = np.zeros(len(entities), dtype=np.int64)
+            row[e] = 1
+            names.append(name)
+            rows.append(row)
+
+    cons = position.get(CONSOLIDATED)
+    if rules.residual is not None:
+        row = -np.sum(rows, axis=0, dtype=np.int64) if rows else np.zeros(len(entities), dtype=np.int64)
+        if cons is not None:
+            row[cons] += 1
+        names.append(rules.residual)
+        rows.append(row)
+    if rules.consolidated is not None:
+        row = np.zeros(len(entities), dtype=np.int64)
+        if cons is not None:
+            row[cons] = 1
+        names.append(rules.consolidated)
+        rows.append(row)
+
+    matrix = np.array(rows, dtype=np.int64).reshape(len(rows), len(entities))
+    matrix.setflags(write=False)
+    return tuple(names), matrix
+
+
+# 대시보드 공통 법인 구분: 주요 4개 법인 + 기타(연결조정 = 연결 − 4개 법인). 새 자회사는 기타에 포함
+DASHBOARD_RULES = BucketRules.parse([
+    'OC(국내) = F&F',
+    '중국 = F&F Shanghai',
+    '홍콩 = FnF HONGKONG',
+    'ST미국 = 세르지오',
+], residual='기타')
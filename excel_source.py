@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+정산표(Excel) 적재 + 컬럼형 스냅샷 캐시
+- 통합 문서를 한 번만 열어(openpyxl read-only 스트리밍) 필요한 분기 시트를 차례로 읽습니다.
+- 각 시트의 윗부분 HEADER_SCAN_ROWS 행만 훑어 대상 컬럼(예: '연결IS')을 찾고, 계정명 컬럼과 대상 컬럼만 꺼냅니다.
+- 결과(시트별 계정명 + 원 단위 int64 금액)는 파일 내용의 SHA-256 지문을 키로 .cache/excel/ 에 저장합니다.
+  파일이 그대로면 다음 실행부터 엑셀을 열지 않고 저장된 배열만 읽습니다 (openpyxl 도 import 하지 않음).
+- 다른 프로세스에서 읽어 넘겨받은 시트(parallel_ingest)는 preload 로 등록해 두면 파일을 다시 읽지 않습니다.
+
+사용 예:
+    sheets = load_sheets('2025 정산표(IS).xlsx', ['1Q IS', '2Q IS', '3Q IS', '4Q IS'], '연결IS')
+    sheets['4Q IS'].labels        # 계정명 (앞뒤 공백 제거)
+    sheets['4Q IS'].values        # '연결IS' 컬럼 금액 (원, int64)
+"""
+
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import run_metrics
+from amounts import parse_won_array
+from label_index import norm
+from profiling import traced
+
+# 로컬 캐시 폴더 (빌드 산출물 아님, git 제외)
+CACHE_DIR = Path(__file__).parent / ".cache"
+EXCEL_CACHE_DIR = CACHE_DIR / "excel"
+
+# 저장 형식/추출 규칙이 바뀌면 올려서 이전 캐시를 무시
+CACHE_VERSION = 1
+
+# 대상 컬럼 헤더를 찾을 때 훑는 윗부분 행 수
+HEADER_SCAN_ROWS = 8
+
+
+@dataclass(frozen=True)
+class SheetColumn:
+    """시트 하나의 계정명 컬럼 + 대상 컬럼 (행 위치는 시트와 같음)"""
+    name: str
+    col: int                    # 대상 컬럼 (0-based, 헤더를 못 찾으면 마지막 컬럼)
+    labels: Tuple[str, ...]     # 첫 컬럼 (앞뒤 공백 제거, 빈 셀은 '')
+    values: np.ndarray          # 대상 컬럼 금액 (원, int64, 숫자가 아니면 0)
+
+
+def find_header_col(head_rows: Sequence[Sequence], marker: str, width: int) -> int:
+    """윗부분 행들에서 marker(공백 무시)가 들어 있는 첫 컬럼. 없으면 마지막 컬럼"""
+    key = norm(marker)
+    for j in range(width):
+        for row in head_rows:
+            if j < len(row) and row[j] is not None and key in norm(row[j]):
+                return j
+    return max(width - 1, 0)
+
+
+def _read_sheet(ws, name: str, marker: str) -> SheetColumn:
+    """read-only 시트를 스트리밍: 윗부분에서 대상 컬럼을 찾고 (계정명, 대상 컬럼)만 수집"""
+    rows = ws.iter_rows(values_only=True)
+    head: List[tuple] = []
+    for row in rows:
+        head.append(row)
+        if len(head) >= HEADER_SCAN_ROWS:
+            break
+    width = max((len(row) for row in head), default=0)
+    col = find_header_col(head, marker, width)
+
+    labels: List[str] = []
+    cells: List = []
+    for row in chain(head, rows):
+        label = row[0] if row else None
+        labels.append('' if label is None else str(label).strip())
+        cells.append(row[col] if col < len(row) else None)
+    run_metrics.count(cells_parsed=len(cells))
+    return SheetColumn(name, col, tuple(labels), parse_won_array(cells))
+
+
+def _snapshot_path(path: Path, digest: str, marker: str) -> Path:
+    tag = hashlib.sha256(marker.encode('utf-8')).hexdigest()[:8]
+    return EXCEL_CACHE_DIR / f"{path.stem}-v{CACHE_VERSION}-{tag}-{digest[:16]}.npz"
+
+
+def _load_snapshot(snapshot: Path, digest: str, sheet_names: Sequence[str]) -> Optional[Dict[str, SheetColumn]]:
+    try:
+        with np.load(snapshot) as npz:
+            if str(npz['digest']) != digest:
+                return None
+            stored = npz['sheets'].tolist()
+            if any(name not in stored for name in sheet_names):
+                return None
+            out = {}
+            for name in sheet_names:
+                i = stored.index(name)
+                out[name] = SheetColumn(name, int(npz[f'col_{i}']), tuple(npz[f'labels_{i}'].tolist()), npz[f'values_{i}'])
+            return out
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_snapshot(snapshot: Path, digest: str, sheets: Dict[str, SheetColumn]):
+    """임시 파일에 쓰고 교체 (캐시는 선택 사항이므로 실패해도 무시). 같은 파일의 이전 스냅샷은 지움"""
+    arrays = {'digest': np.array(digest), 'sheets': np.array(list(sheets), dtype=str)}
+    for i, sheet in enumerate(sheets.values()):
+        arrays[f'col_{i}'] = np.array(sheet.col)
+        arrays[f'labels_{i}'] = np.array(sheet.labels, dtype=str)
+        arrays[f'values_{i}'] = sheet.values
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        stem = snapshot.name.rsplit('-', 1)[0]
+        for old in snapshot.parent.glob(f"{stem}-*.npz"):
+            old.unlink()
+        tmp_path = snapshot.with_name(snapshot.stem + '.tmp.npz')
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, snapshot)
+    except OSError:
+        pass
+
+
+# 다른 프로세스에서 읽어 넘겨받은 시트 {(경로, marker): (mtime_ns, 크기, {시트명: SheetColumn})}
+_preloaded: Dict[Tuple[str, str], Tuple[int, int, Dict[str, SheetColumn]]] = {}
+
+
+def _stat_key(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def preload(filepath, marker: str, sheets: Dict[str, SheetColumn]):
+    """이미 읽은 시트 등록 (parallel_ingest/build_pipeline 용). 이후 같은 파일의 load_sheets 는 파일을 읽지 않음"""
+    path = Path(filepath).resolve()
+    _preloaded[(str(path), marker)] = _stat_key(path) + (dict(sheets),)
+
+
+def preloaded(filepath, marker: str) -> Optional[Dict[str, SheetColumn]]:
+    """등록된 시트 (파일이 등록 뒤 바뀌었거나 없으면 None)"""
+    path = Path(filepath).resolve()
+    entry = _preloaded.get((str(path), marker))
+    try:
+        if entry is not None and entry[:2] == _stat_key(path):
+            return entry[2]
+    except OSError:
+        pass
+    return None
+
+
+@traced('parse')
+def load_sheets(filepath, sheet_names: Sequence[str], marker: str) -> Dict[str, SheetColumn]:
+    """
+    통합 문서의 시트들에서 (계정명, marker 컬럼)을 읽어 {시트명: SheetColumn} 반환
+    등록된 시트 → 파일 지문이 같으면 스냅샷 캐시 → 문서를 한 번 열어 모든 시트를 스트리밍 (없는 시트는 KeyError)
+    """
+    registered = preloaded(filepath, marker)
+    if registered is not None and all(name in registered for name in sheet_names):
+        return {name: registered[name] for name in sheet_names}
+
+    path = Path(filepath)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    run_metrics.count(bytes_read=len(data))
+    snapshot = _snapshot_path(path, digest, marker)
+
+    cached = _load_snapshot(snapshot, digest, sheet_names)
+    if cached is not None:
+        return cached
+
+    import openpyxl   # 캐시가 없을 때만 필요
+
+    workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        missing = [name for name in sheet_names if name not in workbook.sheetnames]
+        if missing:
+            raise KeyError(f"{path.name}: 시트 없음 {missing}")
+        sheets = {name: _read_sheet(workbook[name], name, marker) for name in sheet_names}
+    finally:
+        workbook.close()
+
+    _save_snapshot(snapshot, digest, sheets)
+    return sheets
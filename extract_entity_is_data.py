@@ -4,10 +4,19 @@
 
 import os
 import json
-import math
-from typing import Dict, Any, List
+from typing import Dict, List
 
-import pandas as pd
+import numpy as np
+
+import run_metrics
+from amounts import parse_won_array, won_to_million
+from column_layout import detect_layout
+from csv_source import read_rows
+from entity_dimension import BucketRules, block_entities
+from label_index import norm
+from period_engine import QUARTERS, PeriodAxis, ytd_to_qtd
+from profiling import run_main, span
+from rollup_engine import rollup
 
 
 # ============================================
@@ -28,40 +37,24 @@ MAPPING_CSV = os.path.join(DATA_DIR, "손익계산서_맵핑표.csv")
 OUTPUT_JSON = r"C:\temp\fnf25\entity_is_data.json"
 
 
-# ============================================
-# 유틸
-# ============================================
-
-def norm(s: Any) -> str:
-    return str(s).replace(" ", "").replace("\u3000", "")
-
-
-def to_million(v: float) -> int:
-    """원 단위를 백만원 단위 정수로 변환"""
-    if v is None or (isinstance(v, float) and math.isnan(v)):
-        return 0
-    try:
-        return int(round(float(str(v).replace(",", "").replace("(", "-").replace(")", "")) / 1_000_000))
-    except Exception:
-        return 0
-
-
 # ============================================
 # 맵핑 로드 (판관비 세부계정용)
 # ============================================
 
 def load_mapping(mapping_path: str) -> Dict[str, str]:
-    df = pd.read_csv(mapping_path, encoding="utf-8")
-    col_src = df.columns[0]
-    col_grp = df.columns[1]
+    """
+    맵핑표 첫 두 컬럼(계정명, 그룹) → {정규화 계정명: 그룹}
+    (첫 행은 헤더. csv_source 로 읽으므로 pandas 를 적재하지 않음)
+    """
+    rows, _ = read_rows(mapping_path)
 
     mapping_raw: Dict[str, str] = {}
-    for _, row in df.iterrows():
-        src = str(row[col_src]).strip()
-        grp = str(row[col_grp]).strip()
-        if not src or src == "nan" or src == "과  목":
+    for row in rows[1:]:
+        src = row[0].strip() if row else ""
+        grp = row[1].strip() if len(row) > 1 else ""
+        if not src or src == "과  목":
             continue
-        if not grp or grp == "nan":
+        if not grp:
             continue
 
         src_norm = src.replace(" ", "")
@@ -97,6 +90,16 @@ TOP_LEVEL_LABELS = {
 }
 
 
+# 법인 버킷 규칙 (출력 순서). IFRS(F&F) 컬럼은 사용 안 함
+ENTITY_RULES = BucketRules.parse([
+    "OC(국내) = 별도재무제표",
+    "China = IFRS(Shanghai)",
+    "홍콩 = IFRS(HK)",
+    "Sergio = STIP + STO",
+    "기타 = 베트남 + 빅텐츠 + 엔터",
+])
+BUCKETS = ENTITY_RULES.names()
+
 TARGET_ACCOUNTS = [
     "매출액",
     "매출원가",
@@ -115,76 +118,39 @@ TARGET_ACCOUNTS = [
 # CSV 헤더 분석 (분기 블록 + 법인 컬럼 인덱스)
 # ============================================
 
-def find_quarter_blocks_and_entity_cols(df: pd.DataFrame, year: int):
+def find_quarter_blocks_and_entity_cols(header_row: List[str], year: int):
     """
-    df: header=None 로 읽은 CSV
+    header_row: CSV 2번째 행 (분기 블록 헤더)
     year: 2024 / 2025
 
     반환:
       blocks: [ { "cum_idx": ..., "q_idx": ...,
-                  "col_OC": ..., "col_shanghai": ..., "col_hk": ...,
-                  "col_vn": ..., "col_big": ..., "col_ent": ..., "col_stip": ..., "col_sto": ... } ]
+                  "entities": (정규 법인명, ...), "cols": [법인 컬럼, ...] } ]
       (1Q,2Q,3Q,4Q 순)
     """
-    header_row = df.iloc[1, :]  # 2번째 행
     cum_label = f"{year}년 누적"
-    q_label = f"{year}년 당분기"
 
-    cum_indices: List[int] = []
-    for j, val in enumerate(header_row):
-        if str(val).strip() == cum_label:
-            cum_indices.append(j)
-
-    if not cum_indices:
+    # "과  목" 으로 시작하는 분기 블록을 헤더에서 한 번에 감지
+    layout = detect_layout(header_row)
+    quarter_blocks = [blk for blk in layout.blocks if blk.year == year and blk.ytd is not None]
+    if not quarter_blocks:
         raise ValueError(f"'{cum_label}' 컬럼을 찾지 못했습니다.")
 
-    cum_indices.sort()
-
     blocks = []
 
-    for idx in cum_indices:
-        # 당분기 인덱스 찾기
-        q_idx = None
-        for offset in range(1, 5):
-            j2 = idx + offset
-            if j2 < len(header_row) and str(header_row.iloc[j2]).strip() == q_label:
-                q_idx = j2
-                break
-        if q_idx is None:
-            q_idx = idx + 2  # fallback
-
-        # 이 블록의 시작을 추정: "과  목" 이 나오는 위치
-        block_start = None
-        for j in range(idx, -1, -1):
-            if str(header_row.iloc[j]).strip() == "과목" or str(header_row.iloc[j]).strip() == "과  목":
-                block_start = j
-                break
-        if block_start is None:
-            block_start = 0
-
-        # ★ 수정: 열 구조는 다음과 같음
-        # 과  목,별도재무제표,IFRS(F&F),IFRS(Shanghai),IFRS(HK),IFRS(베트남),IFRS(빅텐츠),IFRS(엔터), STIP , STO , Dr , Cr ,IFRS(단순합계),Dr,Cr,202X년 누적,...
-        col_OC = block_start + 1         # 별도재무제표 (F&F 국내)
-        col_FF_ifrs = block_start + 2    # F&F IFRS (사용 안 함)
-        col_sh = block_start + 3         # F&F Shanghai IFRS
-        col_hk = block_start + 4         # FnF HONGKONG IFRS
-        col_vn = block_start + 5         # F&F 베트남 IFRS
-        col_big = block_start + 6        # 빅텐츠 IFRS
-        col_ent = block_start + 7        # 엔터테인머트 IFRS
-        col_stip = block_start + 8       # STIP
-        col_sto = block_start + 9        # STO
+    for blk in quarter_blocks:
+        # 당분기 컬럼이 없으면 누적 컬럼 기준 fallback
+        q_idx = blk.qtd if blk.qtd is not None else blk.ytd + 2
+
+        # 열 구조: 과  목,별도재무제표,IFRS(F&F),IFRS(Shanghai),IFRS(HK),IFRS(베트남),IFRS(빅텐츠),IFRS(엔터), STIP , STO , Dr , Cr ,IFRS(단순합계),Dr,Cr,202X년 누적,...
+        # 법인 컬럼은 헤더에서 읽고, 버킷 합산은 ENTITY_RULES 로 처리
+        entities, cols = block_entities(blk)
 
         blocks.append({
-            "cum_idx": idx,
+            "cum_idx": blk.ytd,
             "q_idx": q_idx,
-            "col_OC": col_OC,              # ★ 수정: 별도재무제표
-            "col_shanghai": col_sh,
-            "col_hk": col_hk,
-            "col_vn": col_vn,
-            "col_big": col_big,
-            "col_ent": col_ent,
-            "col_stip": col_stip,
-            "col_sto": col_sto,
+            "entities": entities,
+            "cols": cols,
         })
 
     return blocks
@@ -193,151 +159,100 @@ def find_quarter_blocks_and_entity_cols(df: pd.DataFrame, year: int):
 # 한 연도 CSV → 계정별/법인별 누적 값 추출
 # ============================================
 
-def extract_year_entity_cumulative(year: int, mapping_norm: Dict[str, str]) -> Dict[str, Dict[int, Dict[str, Dict[str, float]]]]:
+def account_rows(labels: List[str], mapping_norm: Dict[str, str]) -> np.ndarray:
+    """
+    계정 × 행 행렬 (원소는 해당 행이 계정에 더해지는 횟수). 라벨 컬럼을 한 번만 정규화해 계정 id 로 매핑
+    - 상위 계정(매출액/매출원가/매출총이익/영업이익/당기순이익): TOP_LEVEL_LABELS 와 같은 라벨의 마지막 행
+    - 판관비 세부 계정(인건비/광고/수수료/감가상각/기타판관비): 맵핑표 그룹이 GROUP_TO_ACCOUNT 에 있는 모든 행
+    """
+    account_id = {acc: a for a, acc in enumerate(TARGET_ACCOUNTS)}
+    matrix = np.zeros((len(TARGET_ACCOUNTS), len(labels)), dtype=np.int64)
+
+    top_level = {norm(src): acc for src, acc in TOP_LEVEL_LABELS.items()}
+    last_row: Dict[str, int] = {}
+    for i, label in enumerate(labels):
+        if not label:
+            continue
+        key = norm(label)
+        if key in top_level:
+            last_row[key] = i
+        acc_name = GROUP_TO_ACCOUNT.get(mapping_norm.get(key))
+        if acc_name:
+            matrix[account_id[acc_name], i] += 1
+
+    for key, i in last_row.items():
+        matrix[account_id[top_level[key]], i] += 1
+    return matrix
+
+
+def extract_year_entity_cumulative(year: int, mapping_norm: Dict[str, str]) -> np.ndarray:
     """
-    반환 구조:
-      out[account][quarter][entity_bucket] = 누적 금액(원 단위, float)
-      - account ∈ TARGET_ACCOUNTS
-      - quarter ∈ {1,2,3,4}
-      - entity_bucket ∈ {"OC(국내)","China","홍콩","Sergio","기타"}
+    반환: cum[account, quarter, bucket] = 누적 금액(원 단위, int64)
+      - account: TARGET_ACCOUNTS 순서
+      - quarter: 1Q~4Q (블록 순서)
+      - bucket: BUCKETS 순서
+    (대상 행 × 분기 × 법인 3-D 배열을 한 번에 파싱해 법인 → 버킷, 행 → 계정 순서로 행렬 곱 두 번에 합산)
     """
     csv_name = IS_CSV_FILES[year]
     csv_path = os.path.join(DATA_DIR, csv_name)
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"{csv_path} 파일을 찾을 수 없습니다.")
 
-    df = pd.read_csv(csv_path, header=None, encoding="utf-8")
-    blocks = find_quarter_blocks_and_entity_cols(df, year)
-
-    # 계정명 → row index
-    label_to_row: Dict[str, int] = {}
-    for i in range(2, df.shape[0]):  # 3행부터 계정행
-        label = str(df.iat[i, 0]).strip()
-        if not label or label == "nan":
-            continue
-        label_to_row[norm(label)] = i
-
-    # 결과 구조 초기화
-    out: Dict[str, Dict[int, Dict[str, Dict[str, float]]]] = {
-        acc: {q: {"OC(국내)": 0.0, "China": 0.0, "홍콩": 0.0, "Sergio": 0.0, "기타": 0.0} for q in range(1, 5)}
-        for acc in TARGET_ACCOUNTS
-    }
-
-    # 1) 상위 계정(매출액/매출원가/매출총이익/영업이익/당기순이익): TOP_LEVEL_LABELS 직접 사용
-    for src_label, acc_name in TOP_LEVEL_LABELS.items():
-        row_idx = label_to_row.get(norm(src_label))
-        if row_idx is None:
-            continue
-
-        for q_idx, blk in enumerate(blocks, start=1):
-            def val(col):
-                v = df.iat[row_idx, col]
-                if isinstance(v, str):
-                    v = v.replace(",", "").replace("(", "-").replace(")", "")
-                try:
-                    return float(v)
-                except Exception:
-                    return 0.0
-
-            v_OC = val(blk["col_OC"])        # ★ 수정: 별도재무제표
-            v_sh = val(blk["col_shanghai"])
-            v_hk = val(blk["col_hk"])
-            v_vn = val(blk["col_vn"])
-            v_big = val(blk["col_big"])
-            v_ent = val(blk["col_ent"])
-            v_stip = val(blk["col_stip"])
-            v_sto = val(blk["col_sto"])
-            v_sergio = v_stip + v_sto
-            v_etc = v_vn + v_big + v_ent
-
-            bucket = out[acc_name][q_idx]
-            bucket["OC(국내)"] += v_OC      # ★ 수정: col_OC 사용
-            bucket["China"] += v_sh
-            bucket["홍콩"] += v_hk
-            bucket["Sergio"] += v_sergio
-            bucket["기타"] += v_etc
-
-    # 2) 판관비 세부 계정(인건비/광고/수수료/감가상각/기타판관비): 맵핑 사용
-    for i in range(2, df.shape[0]):
-        raw_label = str(df.iat[i, 0]).strip()
-        if not raw_label or raw_label == "nan":
-            continue
-        key = mapping_norm.get(norm(raw_label))
-        if not key:
-            continue
-
-        group = key
-        acc_name = GROUP_TO_ACCOUNT.get(group)
-        if not acc_name:
-            continue  # 우리가 원하는 판관비 계정이 아님
-
-        for q_idx, blk in enumerate(blocks, start=1):
-            def val(col):
-                v = df.iat[i, col]  # ★ 수정: row_idx → i
-                if isinstance(v, str):
-                    v = v.replace(",", "").replace("(", "-").replace(")", "")
-                try:
-                    return float(v)
-                except Exception:
-                    return 0.0
-
-            v_OC = val(blk["col_OC"])        # ★ 수정: 별도재무제표
-            v_sh = val(blk["col_shanghai"])
-            v_hk = val(blk["col_hk"])
-            v_vn = val(blk["col_vn"])
-            v_big = val(blk["col_big"])
-            v_ent = val(blk["col_ent"])
-            v_stip = val(blk["col_stip"])
-            v_sto = val(blk["col_sto"])
-            v_sergio = v_stip + v_sto
-            v_etc = v_vn + v_big + v_ent
-
-            bucket = out[acc_name][q_idx]
-            bucket["OC(국내)"] += v_OC      # ★ 수정: col_OC 사용
-            bucket["China"] += v_sh
-            bucket["홍콩"] += v_hk
-            bucket["Sergio"] += v_sergio
-            bucket["기타"] += v_etc
-
-    return out
+    rows, _ = read_rows(csv_path)
+    blocks = find_quarter_blocks_and_entity_cols(rows[1], year)  # 2번째 행이 헤더
+    if len(blocks) > len(QUARTERS) or len({len(blk["cols"]) for blk in blocks}) != 1:
+        raise ValueError(f"{csv_name}: 분기 블록 구성이 예상과 다릅니다 (블록 {len(blocks)}개)")
+
+    # 계정명 → 계정 id (3행부터 계정행)
+    data = rows[2:]
+    labels = [row[0].strip() if row else '' for row in data]
+    accounts = account_rows(labels, mapping_norm)
+    used = np.flatnonzero(accounts.any(axis=0))
+    run_metrics.count(rows_scanned=len(data), rows_matched=len(used))
+    cum = np.zeros((len(TARGET_ACCOUNTS), len(QUARTERS), len(BUCKETS)), dtype=np.int64)
+    if used.size == 0:
+        return cum
+
+    # 대상 행 × 분기 × 법인 금액 (셀 문자열을 한 번에 원 단위로 변환)
+    cols = np.array([blk["cols"] for blk in blocks], dtype=np.intp)   # (분기, 법인)
+    flat = cols.ravel().tolist()
+    cells = []
+    for r in used.tolist():
+        row = data[r]
+        width = len(row)
+        cells.extend([row[c] if c < width else '' for c in flat])
+    values = parse_won_array(cells).reshape(len(used), len(blocks), cols.shape[1])
+    run_metrics.count(cells_parsed=len(cells))
+
+    # 법인 → 버킷 (분기마다 헤더 순서가 달라도 되도록 분기별 행렬), 행 → 계정
+    bucket_matrix = np.stack([ENTITY_RULES.matrix(blk["entities"])[1] for blk in blocks])   # (분기, 버킷, 법인)
+    by_bucket = np.einsum('rqe,qbe->rqb', values, bucket_matrix)
+    cum[:, :len(blocks)] = rollup(accounts[:, used], by_bucket)
+    return cum
 
 
 # ============================================
 # 누적 → 분기 변환 + JS용 구조로 정리
 # ============================================
 
-def build_period_entity_data(year: int, cum_by_quarter: Dict[str, Dict[int, Dict[str, Dict[str, float]]]]):
+def build_period_entity_data(year: int, cum: np.ndarray):
     """
-    cum_by_quarter[account][quarter][bucket] = 누적(원)
+    cum[account, quarter, bucket] = 누적(원), extract_year_entity_cumulative 결과
     반환:
       result[account][periodKey][bucket] = 백만원 단위 정수
+    (계정 × 버킷 × 분기 누적 배열의 분기 축 차분 한 번으로 모든 계정/법인의 분기값 계산)
     """
-    result: Dict[str, Dict[str, Dict[str, int]]] = {acc: {} for acc in TARGET_ACCOUNTS}
-
-    for acc in TARGET_ACCOUNTS:
-        prev_cum = {b: 0.0 for b in ["OC(국내)", "China", "홍콩", "Sergio", "기타"]}
-        for q in (1, 2, 3, 4):
-            curr_cum = cum_by_quarter[acc][q]
+    periods = PeriodAxis((year,))
 
-            # 분기 값 = 이번누적 - 이전누적
-            quarter_vals: Dict[str, int] = {}
-            for b in prev_cum.keys():
-                diff = curr_cum[b] - prev_cum[b]
-                quarter_vals[b] = to_million(diff)
+    # 누적(원) [계정, 버킷, 분기], 분기 값 = 이번누적 - 이전누적
+    ytd = cum.transpose(0, 2, 1)
+    qtd = ytd_to_qtd(ytd)
 
-            # 누적 값
-            cum_vals: Dict[str, int] = {b: to_million(curr_cum[b]) for b in curr_cum.keys()}
-
-            q_key = f"{year}_{q}Q"
-            if q == 4:
-                cum_key = f"{year}_Year"
-            else:
-                cum_key = f"{year}_{q}Q_Year"
-
-            result[acc][q_key] = quarter_vals
-            result[acc][cum_key] = cum_vals
-
-            prev_cum = curr_cum
+    result: Dict[str, Dict[str, Dict[str, int]]] = {acc: {} for acc in TARGET_ACCOUNTS}
+    for a, acc in enumerate(TARGET_ACCOUNTS):
+        for p in range(len(periods)):
+            result[acc][periods.quarter_key(p)] = dict(zip(BUCKETS, won_to_million(qtd[a, :, p]).tolist()))
+            result[acc][periods.ytd_key(p)] = dict(zip(BUCKETS, won_to_million(ytd[a, :, p]).tolist()))
 
     return result
 
@@ -353,7 +268,8 @@ def main():
     final: Dict[str, Dict[str, Dict[str, int]]] = {acc: {} for acc in TARGET_ACCOUNTS}
 
     for year in (2024, 2025):
-        cum = extract_year_entity_cumulative(year, mapping_norm)
+        with run_metrics.stage('extract', file=IS_CSV_FILES[year]):
+            cum = extract_year_entity_cumulative(year, mapping_norm)
         period_data = build_period_entity_data(year, cum)
         for acc in TARGET_ACCOUNTS:
             final[acc].update(period_data[acc])
@@ -363,13 +279,15 @@ def main():
     if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
 
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
+    with run_metrics.stage("serialize", file=os.path.basename(OUTPUT_JSON)), \
+            span("serialize", file=os.path.basename(OUTPUT_JSON)), open(OUTPUT_JSON, "w", encoding="utf-8") as f:
         json.dump(final, f, ensure_ascii=False, indent=2)
 
-    print("✅ entity별 손익 JSON 생성 완료")
-    print(f" - 파일: {OUTPUT_JSON}")
-    print(" - 구조: entity_is_data[계정][기간키][OC(국내)/China/홍콩/Sergio/기타] = 금액(백만원)")
+    if run_metrics.verbose():
+        print("✅ entity별 손익 JSON 생성 완료")
+        print(f" - 파일: {OUTPUT_JSON}")
+        print(" - 구조: entity_is_data[계정][기간키][OC(국내)/China/홍콩/Sergio/기타] = 금액(백만원)")
 
 
 if __name__ == "__main__":
-    main()
+    run_main("extract_entity_is_data", main)
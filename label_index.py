@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+계정 라벨 해석 인덱스
+- "CSV 계정명 → 대시보드 키" 맵핑을 한 번 컴파일해 행마다 O(라벨 길이)로 해석합니다.
+- 해석 순서: 정확 일치 → 정규화 일치(공백/전각 공백 제거) → 접두어 일치(선택, 트라이에서 가장 긴 키)
+- 맵핑 순서와 무관하게 결과가 같고, 후보가 여럿인 라벨은 conflicts 에 기록해 report()로 출력합니다.
+- RowIndex 는 파일의 "정규화 계정명 → 행 번호" 인덱스로, 고정 행 번호 대신 계정명으로 행을 찾습니다.
+
+사용 예:
+    index = LabelIndex({'Ⅰ.매출액': '매출액', '매출채권': '매출채권'})
+    index.resolve(' Ⅰ. 매출액 ')   # '매출액'
+    index.resolve('장기매출채권')   # None (부분 문자열은 일치로 보지 않음)
+    rows = RowIndex.build(labels)
+    rows['Ⅰ. 매출액']              # 1 (행 삽입에 영향받지 않음)
+"""
+
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# 트라이 노드에서 키 종료 표시
+_END = ''
+
+
+def norm(s: Any) -> str:
+    """공백 제거 + 문자열 변환 (전각 공백 포함)"""
+    return str(s).replace(" ", "").replace("　", "")
+
+
+class LabelMatch(NamedTuple):
+    key: str      # 일치한 맵핑 키
+    target: str   # 대시보드 키
+    kind: str     # 'exact' | 'normalized' | 'prefix'
+
+
+class LabelIndex:
+    """맵핑 키 → 대시보드 키 해석기 (정확/정규화 해시 + 접두어 트라이)"""
+
+    def __init__(self, mapping: Dict[str, str], prefix: bool = False):
+        self.prefix = prefix
+        self._exact: Dict[str, str] = {}
+        self._normalized: Dict[str, Tuple[str, str]] = {}
+        self._trie: Dict[str, dict] = {}
+        self._cache: Dict[str, Optional[LabelMatch]] = {}
+        self.conflicts: List[Tuple[str, Tuple[str, ...]]] = []
+
+        for key, target in mapping.items():
+            key = key.strip()
+            self._exact[key] = target
+            n = norm(key)
+            previous = self._normalized.get(n)
+            if previous is not None and previous[1] != target:
+                # 정규화하면 같은 키가 서로 다른 대시보드 키를 가리킴: 먼저 등록된 키 유지
+                self.conflicts.append((key, (previous[0], key)))
+                continue
+            self._normalized.setdefault(n, (key, target))
+            if prefix:
+                node = self._trie
+                for ch in n:
+                    node = node.setdefault(ch, {})
+                node[_END] = (key, target)
+
+    def match(self, label: Any) -> Optional[LabelMatch]:
+        """라벨 해석 결과 (일치하는 키가 없으면 None)"""
+        label = '' if label is None else str(label).strip()
+        if label in self._cache:
+            return self._cache[label]
+
+        found = None
+        target = self._exact.get(label)
+        if target is not None:
+            found = LabelMatch(label, target, 'exact')
+        elif label:
+            n = norm(label)
+            hit = self._normalized.get(n)
+            if hit is not None:
+                found = LabelMatch(hit[0], hit[1], 'normalized')
+            elif self.prefix:
+                found = self._match_prefix(label, n)
+
+        self._cache[label] = found
+        return found
+
+    def resolve(self, label: Any) -> Optional[str]:
+        """라벨 → 대시보드 키 (없으면 None)"""
+        found = self.match(label)
+        return found.target if found is not None else None
+
+    def _match_prefix(self, label: str, n: str) -> Optional[LabelMatch]:
+        """정규화 라벨의 접두어인 키 중 가장 긴 키 (대상이 다른 후보가 있으면 conflicts 기록)"""
+        hits = []
+        node = self._trie
+        for ch in n:
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node:
+                hits.append(node[_END])
+        if not hits:
+            return None
+
+        key, target = hits[-1]
+        if len({t for _, t in hits}) > 1:
+            self.conflicts.append((label, tuple(k for k, _ in hits)))
+        return LabelMatch(key, target, 'prefix')
+
+    def report(self, title: str = "라벨 해석"):
+        """후보가 여럿이었던 라벨 출력 (경고이므로 stderr)"""
+        if not self.conflicts:
+            return
+        print(f"  [{title}] 모호한 라벨 {len(self.conflicts)}건:", file=sys.stderr)
+        for label, candidates in self.conflicts:
+            print(f"    {label} -> {', '.join(candidates)}", file=sys.stderr)
+
+
+class RowIndex:
+    """
+    정규화 계정명 → 행 번호 (0-based) 해시 인덱스
+    - 파일당 한 번 만들어 모든 분기 블록이 공유합니다 (모든 블록의 계정 순서는 같음).
+    - 같은 라벨이 반복되면(예: 지배지분) 첫 행을 사용합니다.
+    """
+
+    def __init__(self, rows: Dict[str, int]):
+        self._rows = rows
+
+    @classmethod
+    def build(cls, labels, start: int = 0) -> 'RowIndex':
+        """labels[start:] 로 인덱스 생성 (헤더 행 제외 등)"""
+        rows: Dict[str, int] = {}
+        for i in range(start, len(labels)):
+            n = norm(labels[i])
+            if n and n not in rows:
+                rows[n] = i
+        return cls(rows)
+
+    def get(self, label: Any) -> Optional[int]:
+        """라벨의 행 번호 (없으면 None)"""
+        return self._rows.get(norm(label))
+
+    def __getitem__(self, label: Any) -> int:
+        row = self.get(label)
+        if row is None:
+            raise KeyError(f"계정 행을 찾을 수 없습니다: {label}")
+        return row
+
+    def __contains__(self, label: Any) -> bool:
+        return norm(label) in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def items(self):
+        return self._rows.items()
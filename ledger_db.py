@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+원장 SQLite 저장소 (선택, 표준 라이브러리 sqlite3)
+- 파싱한 분기 블록 CSV를 로컬 SQLite DB(.cache/ledger.sqlite)에 정규화해 쌓아 둡니다.
+  "중국 법인 판관비 8분기 추이" 같은 질문을 새 스크립트 없이 명령줄이나 SQL로 조회합니다.
+- 스키마: 차원 테이블 dataset / account_group / account / entity / period / measure + 사실 테이블 fact(value_won, 원 단위)
+  - fact 기본 키 (period, account, entity, measure), WITHOUT ROWID → 분기 블록 삭제/교체가 기본 키 범위 하나
+  - 커버링 인덱스 (account, period, ...) / (entity, period, ...) → 계정 추이, 법인 조각 조회가 인덱스만 읽고 끝남
+  - ledger 뷰: (dataset, account, account_group, entity, period, measure, value_won) 이름으로 조인한 평면 표
+- 적재 단위는 분기 블록(데이터셋, 기간). block 테이블에 블록 지문(build_cache.block_digest)을 두고,
+  지문이 같은 블록은 건너뛰며 바뀐 블록만 그 기간의 행을 지우고 다시 넣습니다(블록 단위 upsert).
+  전체 적재는 트랜잭션 하나(executemany 일괄 삽입)입니다.
+- 원본에서 사라진 분기는 DB에 그대로 남습니다(이력 보존). 처음부터 다시 쌓으려면 --rebuild
+- 계정 그룹(account.group_id)은 맵핑표(rollup_engine.load_mapping)의 그룹. 맵핑표에 없는 계정은 NULL
+- 조회 결과는 query_service /slice 와 같은 형식입니다 (같은 SliceQuery, shape_slice 사용).
+
+사용법:
+    python ledger_db.py load                       # DATASETS 전체 적재 (바뀐 분기 블록만)
+    python ledger_db.py load --rebuild
+    python ledger_db.py query --dataset is_entity --account Ⅳ.판매비와관리비 --entity 중국 --rules dashboard \\
+        --measure qtd --from 2024_1Q --to 2025_4Q --unit million
+    python ledger_db.py query --dataset bs --group 현금성자산 --entity 연결 --from 2025_4Q --to 2025_4Q --json
+
+    sqlite3 .cache/ledger.sqlite "SELECT period, value_won FROM ledger WHERE dataset = 'is' AND account = 'Ⅰ.매출액' AND entity = '연결' AND measure = 'qtd'"
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+import profiling
+import run_metrics
+from label_index import norm
+from ledger_store import MEASURES, LedgerBuilder
+from parallel_ingest import ingest
+from query_service import DATASETS, ENTITY_RULES, UNITS, QueryError, SliceQuery, period_range, pick_labels, shape_slice
+from rollup_engine import load_mapping
+
+BASE_DIR = Path(__file__).parent
+
+# 로컬 DB (빌드 산출물 아님, git 제외)
+DB_FILE = BASE_DIR / ".cache" / "ledger.sqlite"
+
+# 스키마가 바뀌면 올려서 이전 DB를 다시 만듦 (PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+# 데이터셋 → 계정 그룹 맵핑표
+GROUP_MAPPINGS = {
+    'bs': '재무상태표_맵핑표.csv',
+    'is': '손익계산서_맵핑표.csv',
+    'is_entity': '손익계산서_맵핑표.csv',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dataset (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS account_group (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS account (
+    id INTEGER PRIMARY KEY,
+    dataset_id INTEGER NOT NULL REFERENCES dataset (id),
+    label TEXT NOT NULL,
+    group_id INTEGER REFERENCES account_group (id),
+    UNIQUE (dataset_id, label)
+);
+CREATE TABLE IF NOT EXISTS entity (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS period (id INTEGER PRIMARY KEY, label TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS measure (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+
+-- 적재한 분기 블록 (entities/measures: 블록에 컬럼이 있는 법인/측정값, 원장 순서로 쉼표 구분)
+CREATE TABLE IF NOT EXISTS block (
+    dataset_id INTEGER NOT NULL REFERENCES dataset (id),
+    period_id INTEGER NOT NULL REFERENCES period (id),
+    file TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    entities TEXT NOT NULL,
+    measures TEXT NOT NULL,
+    cells INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL,
+    PRIMARY KEY (dataset_id, period_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS fact (
+    period_id INTEGER NOT NULL,
+    account_id INTEGER NOT NULL,
+    entity_id INTEGER NOT NULL,
+    measure_id INTEGER NOT NULL,
+    value_won INTEGER NOT NULL,
+    PRIMARY KEY (period_id, account_id, entity_id, measure_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fact_account_period ON fact (account_id, period_id, measure_id, entity_id, value_won);
+CREATE INDEX IF NOT EXISTS fact_entity_period ON fact (entity_id, period_id, measure_id, account_id, value_won);
+
+CREATE VIEW IF NOT EXISTS ledger AS
+SELECT d.name AS dataset, a.label AS account, g.name AS account_group, e.name AS entity,
+       p.label AS period, m.name AS measure, f.value_won
+FROM fact f
+JOIN account a ON a.id = f.account_id
+JOIN dataset d ON d.id = a.dataset_id
+LEFT JOIN account_group g ON g.id = a.group_id
+JOIN entity e ON e.id = f.entity_id
+JOIN period p ON p.id = f.period_id
+JOIN measure m ON m.id = f.measure_id;
+"""
+
+DROP_SCHEMA = """
+DROP VIEW IF EXISTS ledger;
+DROP TABLE IF EXISTS fact;
+DROP TABLE IF EXISTS block;
+DROP TABLE IF EXISTS account;
+DROP TABLE IF EXISTS account_group;
+DROP TABLE IF EXISTS entity;
+DROP TABLE IF EXISTS period;
+DROP TABLE IF EXISTS measure;
+DROP TABLE IF EXISTS dataset;
+"""
+
+UPSERT_FACT = """
+INSERT INTO fact (period_id, account_id, entity_id, measure_id, value_won) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (period_id, account_id, entity_id, measure_id) DO UPDATE SET value_won = excluded.value_won
+"""
+
+UPSERT_BLOCK = """
+INSERT INTO block (dataset_id, period_id, file, digest, entities, measures, cells, loaded_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (dataset_id, period_id) DO UPDATE SET
+    file = excluded.file, digest = excluded.digest, entities = excluded.entities, measures = excluded.measures,
+    cells = excluded.cells, loaded_at = excluded.loaded_at
+"""
+
+DELETE_BLOCK_FACTS = """
+DELETE FROM fact WHERE period_id = ? AND account_id IN (SELECT id FROM account WHERE dataset_id = ?)
+"""
+
+
+def connect(path=DB_FILE, rebuild: bool = False) -> sqlite3.Connection:
+    """DB 연결 (없으면 스키마 생성, 스키마 버전이 다르거나 rebuild 면 비우고 다시 만듦)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), isolation_level=None)   # 트랜잭션은 _transaction 에서 직접
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if rebuild or version != SCHEMA_VERSION:
+        conn.executescript(DROP_SCHEMA + SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+    return conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _codes(conn: sqlite3.Connection, table: str, column: str, names: Iterable[str], **scope) -> Dict[str, int]:
+    """차원 라벨 → id (없는 라벨은 추가). scope: 고정 컬럼 (예: dataset_id=1)"""
+    columns = list(scope) + [column]
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                     [(*scope.values(), name) for name in names])
+    where = " AND ".join(f"{c} = ?" for c in scope) or "1"
+    return dict(conn.execute(f"SELECT {column}, id FROM {table} WHERE {where}", tuple(scope.values())))
+
+
+# ============================================
+# 적재
+# ============================================
+
+@dataclass
+class LoadResult:
+    blocks: int = 0                                       # 원본의 분기 블록 수
+    written: List[str] = field(default_factory=list)      # 다시 쓴 블록 ('데이터셋 기간')
+    cells: int = 0                                        # 쓴 fact 행 수
+    seconds: float = 0.0
+
+
+def _write_blocks(conn: sqlite3.Connection, dataset_id: int, source, changed: Dict[str, str],
+                  period_ids: Dict[str, int], measure_ids: Dict[str, int]) -> int:
+    """
+    원본 한 파일의 바뀐 분기 블록 {기간: 지문}을 fact 에 씀 → 쓴 행 수
+    블록의 계정(원본에 있던 행) × 블록의 (법인, 측정값) 컬럼(Ledger.columns)을 모두 남김 (0 포함)
+    """
+    builder = LedgerBuilder()
+    builder.add_source(source)
+    ledger = builder.build()
+    account_ids = _codes(conn, 'account', 'label', ledger.accounts.labels, dataset_id=dataset_id)
+    entity_ids = _codes(conn, 'entity', 'name', ledger.entities.labels)
+    a_ids = np.array([account_ids[label] for label in ledger.accounts.labels], dtype=np.int64)
+    e_ids = np.array([entity_ids[name] for name in ledger.entities.labels], dtype=np.int64)
+    m_ids = np.array([measure_ids[name] for name in ledger.measures.labels], dtype=np.int64)
+
+    loaded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    written = 0
+    for key, digest in changed.items():
+        p = ledger.periods.code(key)
+        period_id = period_ids[key]
+        values = ledger.values[:, :, p, :]                 # (계정, 법인, 측정값)
+        columns = ledger.columns[:, p, :]
+        a, e, m = np.nonzero(ledger.present[:, p, None, None] & columns[None, :, :])
+        conn.execute(DELETE_BLOCK_FACTS, (period_id, dataset_id))
+        conn.executemany(UPSERT_FACT, zip(repeat(period_id), a_ids[a].tolist(), e_ids[e].tolist(),
+                                          m_ids[m].tolist(), values[a, e, m].tolist()))
+        entities = ','.join(ledger.entities.labels[i] for i in np.flatnonzero(columns.any(axis=1)))
+        measures = ','.join(ledger.measures.labels[i] for i in np.flatnonzero(columns.any(axis=0)))
+        conn.execute(UPSERT_BLOCK, (dataset_id, period_id, source.path.name, digest, entities, measures, len(a),
+                                    loaded_at))
+        written += len(a)
+    return written
+
+
+def _update_groups(conn: sqlite3.Connection, dataset_id: int, mapping_path: Path):
+    """계정 그룹을 맵핑표에 맞춤 (정확 일치 → 공백 무시 일치, 바뀐 계정만 UPDATE)"""
+    groups = load_mapping(mapping_path).as_dict()
+    normalized = {norm(label): group for label, group in groups.items()}
+    group_ids = _codes(conn, 'account_group', 'name', dict.fromkeys(groups.values()))
+    updates = []
+    for account_id, label in conn.execute("SELECT id, label FROM account WHERE dataset_id = ?", (dataset_id,)):
+        group_id = group_ids.get(groups.get(label) or normalized.get(norm(label)))
+        updates.append((group_id, account_id, group_id))
+    conn.executemany("UPDATE account SET group_id = ? WHERE id = ? AND group_id IS NOT ?", updates)
+
+
+def load(conn: sqlite3.Connection, datasets: Dict[str, Sequence[str]] = DATASETS, base_dir: Path = BASE_DIR,
+         mappings: Dict[str, str] = GROUP_MAPPINGS, jobs: Optional[int] = None) -> LoadResult:
+    """
+    데이터셋 원본 CSV를 적재 (지문이 바뀐 분기 블록만, 트랜잭션 하나)
+    같은 데이터셋에서 같은 기간 블록이 여러 파일에 있으면 뒤 파일이 이김 (LedgerBuilder 와 같음)
+    """
+    t0 = time.perf_counter()
+    base_dir = Path(base_dir)
+    files = {name: [(base_dir / filename).resolve() for filename in filenames] for name, filenames in datasets.items()}
+    with run_metrics.stage('ingest'):
+        sources = ingest([path for paths in files.values() for path in paths if path.exists()], jobs=jobs).sources
+
+    result = LoadResult()
+    with run_metrics.stage('write'), _transaction(conn):
+        measure_ids = _codes(conn, 'measure', 'name', MEASURES)
+        for name, paths in files.items():
+            dataset_id = _codes(conn, 'dataset', 'name', [name])[name]
+            stored = dict(conn.execute("SELECT period_id, digest FROM block WHERE dataset_id = ?", (dataset_id,)))
+            for path in paths:
+                source = sources.get(path)
+                if source is None:
+                    continue
+                blocks = [(block.period_key, digest) for block, digest in zip(source.layout.blocks, source.block_digests)]
+                period_ids = _codes(conn, 'period', 'label', [key for key, _ in blocks])
+                changed = {key: digest for key, digest in blocks if stored.get(period_ids[key]) != digest}
+                result.blocks += len(blocks)
+                if changed:
+                    result.cells += _write_blocks(conn, dataset_id, source, changed, period_ids, measure_ids)
+                    result.written += [f"{name} {key}" for key in changed]
+                    stored.update((period_ids[key], digest) for key, digest in changed.items())
+            mapping = mappings.get(name)
+            if mapping is not None and (base_dir / mapping).exists():
+                _update_groups(conn, dataset_id, base_dir / mapping)
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+# ============================================
+# 조회
+# ============================================
+
+def _dataset_id(conn: sqlite3.Connection, name: str) -> int:
+    row = conn.execute("SELECT id FROM dataset WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        raise QueryError(f"{name}: 적재된 데이터가 없습니다 (python ledger_db.py load)")
+    return row[0]
+
+
+def _union(lists: Iterable[str]) -> List[str]:
+    """쉼표 구분 목록들의 합집합 (첫 등장 순서)"""
+    return list(dict.fromkeys(name for names in lists for name in names.split(',') if name))
+
+
+def _marks(values: Sequence) -> str:
+    return ', '.join('?' * len(values))
+
+
+def group_accounts(conn: sqlite3.Connection, dataset: str, groups: Sequence[str]) -> List[str]:
+    """맵핑표 그룹에 속한 계정 라벨 (적재 순서). 없는 그룹은 QueryError"""
+    dataset_id = _dataset_id(conn, dataset)
+    out = []
+    for group in groups:
+        labels = [label for label, in conn.execute(
+            "SELECT a.label FROM account a JOIN account_group g ON g.id = a.group_id"
+            " WHERE a.dataset_id = ? AND g.name = ? ORDER BY a.id", (dataset_id, group))]
+        if not labels:
+            raise QueryError(f"그룹 없음: {group}")
+        out += labels
+    return out
+
+
+def slice_db(conn: sqlite3.Connection, query: SliceQuery) -> dict:
+    """
+    DB에서 질의 조각 조회 (query_service.slice_ledger 와 같은 응답)
+    계정/기간/측정값(법인 선택이 있으면 법인도)을 id 로 바꿔 fact 인덱스만으로 읽음
+    """
+    dataset_id = _dataset_id(conn, query.dataset)
+    blocks = conn.execute("SELECT p.id, p.label, b.entities, b.measures FROM block b JOIN period p ON p.id = b.period_id"
+                          " WHERE b.dataset_id = ? ORDER BY p.label", (dataset_id,)).fetchall()
+    measures = _union(names for _, _, _, names in blocks)
+    measure = query.measure or (measures[0] if measures else None)
+    if measure not in measures:
+        raise QueryError(f"측정값 없음: {measure} (가능: {', '.join(measures)})")
+    measure_id = conn.execute("SELECT id FROM measure WHERE name = ?", (measure,)).fetchone()[0]
+
+    period_labels = [label for _, label, _, _ in blocks]
+    p_idx = period_range(period_labels, query.start, query.end)
+    period_ids = [blocks[p][0] for p in p_idx]
+
+    accounts = conn.execute("SELECT id, label FROM account WHERE dataset_id = ? ORDER BY id", (dataset_id,)).fetchall()
+    a_idx = pick_labels([label for _, label in accounts], query.accounts, '계정')
+    account_ids = [accounts[a][0] for a in a_idx]
+
+    sql = f"SELECT account_id, entity_id, period_id, value_won FROM fact WHERE period_id IN ({_marks(period_ids)})"
+    params = list(period_ids)
+    if query.accounts:
+        sql += f" AND account_id IN ({_marks(account_ids)})"
+        params += account_ids
+    else:
+        sql += " AND account_id IN (SELECT id FROM account WHERE dataset_id = ?)"
+        params.append(dataset_id)
+    sql += " AND measure_id = ?"
+    params.append(measure_id)
+
+    # 법인 축: 데이터셋 블록에 나온 법인 (원장과 같은 순서)
+    entity_ids = dict(conn.execute("SELECT name, id FROM entity"))
+    entities = [(entity_ids[name], name) for name in _union(names for _, _, names, _ in blocks)]
+    if query.entities and query.rules is None:   # 버킷 합산은 모든 법인이 필요하므로 법인 조건은 규칙이 없을 때만
+        entities = [entities[e] for e in dict.fromkeys(pick_labels([name for _, name in entities], query.entities, '법인'))]
+        sql += f" AND entity_id IN ({_marks(entities)})"
+        params += [entity_id for entity_id, _ in entities]
+    rows = conn.execute(sql, params).fetchall()
+
+    # (고유 계정, 법인, 기간) 배열을 채운 뒤 요청 순서(중복 포함)로 펼침
+    unique_accounts = list(dict.fromkeys(account_ids))
+    a_pos = {account_id: i for i, account_id in enumerate(unique_accounts)}
+    e_pos = {entity_id: i for i, (entity_id, _) in enumerate(entities)}
+    p_pos = {period_id: i for i, period_id in enumerate(period_ids)}
+    values = np.zeros((len(unique_accounts), len(entities), len(period_ids)), dtype=np.int64)
+    for account_id, entity_id, period_id, value in rows:
+        values[a_pos[account_id], e_pos[entity_id], p_pos[period_id]] = value
+    values = values[[a_pos[account_id] for account_id in account_ids]]
+
+    return shape_slice(query, measure, [accounts[a][1] for a in a_idx], [name for _, name in entities],
+                       [period_labels[p] for p in p_idx], values)
+
+
+def print_slice(result: dict):
+    """조각을 (계정, 법인) 행 × 기간 열 표로 출력"""
+    periods = result['periods']
+    width = max([len(label) + len(entity) + 3 for label in result['accounts'] for entity in result['entities']] + [10])
+    print(f"  {result['dataset']} / {result['measure']} / {result['unit']}")
+    print(f"  {'':<{width}}" + "".join(f"{period:>18}" for period in periods))
+    for label, by_entity in zip(result['accounts'], result['values']):
+        for entity, series in zip(result['entities'], by_entity):
+            print(f"  {label + ' / ' + entity:<{width}}" + "".join(f"{value:>18,}" for value in series))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원장 SQLite 저장소 (적재/조회)")
+    parser.add_argument("--db", type=Path, default=DB_FILE, help="SQLite 파일")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = commands.add_parser("load", help="원본 CSV 적재 (바뀐 분기 블록만)")
+    load_parser.add_argument("--rebuild", action="store_true", help="DB를 비우고 처음부터 적재")
+    load_parser.add_argument("--jobs", type=int, default=None, help="원본 적재 프로세스 수 (parallel_ingest)")
+    profiling.add_arguments(load_parser)
+    run_metrics.add_arguments(load_parser)
+
+    query_parser = commands.add_parser("query", help="계정 × 법인 × 기간 조각 조회")
+    query_parser.add_argument("--dataset", required=True, choices=list(DATASETS))
+    query_parser.add_argument("--account", action="append", default=[], help="계정 (쉼표 구분, 여러 번 가능)")
+    query_parser.add_argument("--group", action="append", default=[], help="맵핑표 그룹의 계정 전체")
+    query_parser.add_argument("--entity", action="append", default=[], help="법인 (--rules 를 주면 버킷명)")
+    query_parser.add_argument("--from", dest="start", default=None, help="시작 기간 (예: 2024_1Q)")
+    query_parser.add_argument("--to", dest="end", default=None, help="끝 기간 (포함)")
+    query_parser.add_argument("--measure", default=None, help="측정값 (기본: 데이터셋의 첫 측정값)")
+    query_parser.add_argument("--unit", choices=UNITS, default='won')
+    query_parser.add_argument("--rules", choices=list(ENTITY_RULES), default=None, help="법인 버킷 규칙")
+    query_parser.add_argument("--json", action="store_true", help="query_service /slice 와 같은 JSON 출력")
+    args = parser.parse_args()
+
+    if args.command == "load":
+        with profiling.session('ledger_db', **profiling.options(args)), \
+                run_metrics.session('ledger_db', **run_metrics.options(args)):
+            conn = connect(args.db, rebuild=args.rebuild)
+            try:
+                result = load(conn, jobs=args.jobs)
+            finally:
+                conn.close()
+        print(f"  적재: 분기 블록 {result.blocks}개 중 {len(result.written)}개 다시 씀 "
+              f"(fact {result.cells:,}행), {result.seconds * 1000:.1f}ms → {args.db}")
+        for block in result.written:
+            print(f"    {block}")
+        return
+
+    conn = connect(args.db)
+    try:
+        t0 = time.perf_counter()
+        params = {'dataset': [args.dataset], 'account': args.account, 'entity': args.entity,
+                  'from': [args.start or ''], 'to': [args.end or ''], 'measure': [args.measure or ''],
+                  'unit': [args.unit], 'rules': [args.rules or '']}
+        if args.group:
+            params['account'] = params['account'] + group_accounts(conn, args.dataset, args.group)
+        result = slice_db(conn, SliceQuery.parse(params))
+        elapsed = time.perf_counter() - t0
+    except QueryError as e:
+        parser.error(str(e))
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    else:
+        print_slice(result)
+        print(f"  (조회 {elapsed * 1000:.2f}ms)")
+
+
+if __name__ == "__main__":
+    main()
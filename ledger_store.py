@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+분기 CSV 원장 저장소 (컬럼형 NumPy 큐브)
+- BS/IS/분기IS_법인별 CSV를 한 번 읽어 int64 배열 values[계정, 법인, 기간, 측정값]에 원 단위로 적재합니다.
+- 계정/법인/기간 라벨은 사전 인코딩(LabelDictionary)되어 정수 코드로 인덱싱합니다.
+- 성격별 집계, 누적(YTD) 계산, '기타 = 연결 − 법인합계' 잔차는 배열 축 연산으로 처리합니다.
+- 법인 축은 블록 헤더에서 읽은 법인을 정규 법인명(entity_dimension.canonical_entity)으로 적재합니다.
+
+사용 예:
+    builder = LedgerBuilder()
+    builder.add_rows(rows_2024)
+    builder.add_rows(rows_2025)
+    builder.add_source(load_source('2025_IS.csv'))   # build_cache 의 블록 캐시 사용
+    ledger = builder.build()
+    totals = ledger.rollup(mapping.matrix(ledger.accounts.labels, ASSET_CATEGORIES))
+    names, by_bucket = ledger.entity_rollup(DASHBOARD_RULES)      # 법인 축 → 대시보드 법인 버킷
+"""
+
+from array import array
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from amounts import parse_won_array
+from column_layout import detect_layout
+from entity_dimension import CONSOLIDATED, SIMPLE_SUM, canonical_entity
+from rollup_engine import rollup
+
+# 측정값 후보 (column_layout.QuarterBlock 필드명과 동일). 원장에는 실제로 나온 측정값만 축으로 둡니다.
+MEASURES = ('balance', 'prior_balance', 'ytd', 'prev_ytd', 'qtd', 'prior_ytd', 'prior_prev_ytd', 'prior_qtd')
+
+# 금액 파싱 단위 (셀 수). 행을 스트리밍하면서 이만큼 모아 parse_won_array 로 한 번에 변환
+PARSE_CHUNK = 8 * 1024
+
+
+class LabelDictionary:
+    """문자열 라벨 ↔ 정수 코드 사전 (등록 순서 유지)"""
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self.labels: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for label in labels:
+            self.encode(label)
+
+    def encode(self, label: str) -> int:
+        """라벨 코드 반환 (없으면 새로 등록)"""
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+        return code
+
+    def code(self, label: str) -> Optional[int]:
+        return self._codes.get(label)
+
+    def codes(self, labels: Iterable[str]) -> np.ndarray:
+        """여러 라벨의 코드 배열 (없는 라벨은 KeyError)"""
+        return np.array([self._codes[label] for label in labels], dtype=np.intp)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __contains__(self, label):
+        return label in self._codes
+
+
+class Ledger:
+    """
+    values[a, e, p, m]: 계정 a, 법인 e, 기간 p, 측정값 m 의 원 단위 금액 (int64)
+    present[a, p]: 계정 a 가 기간 p 의 원본 CSV에 존재했는지 여부
+    columns[e, p, m]: 기간 p 블록에 법인 e, 측정값 m 컬럼이 있었는지 여부 (값이 모두 0인 컬럼 포함)
+    """
+
+    def __init__(self, accounts: LabelDictionary, entities: LabelDictionary, periods: LabelDictionary,
+                 measures: LabelDictionary, values: np.ndarray, present: np.ndarray,
+                 columns: np.ndarray):
+        self.accounts = accounts
+        self.entities = entities
+        self.periods = periods
+        self.measures = measures
+        self.values = values
+        self.present = present
+        self.columns = columns
+
+    def measure(self, name: str) -> np.ndarray:
+        """측정값 하나의 (계정, 법인, 기간) 뷰"""
+        return self.values[..., self.measures.code(name)]
+
+    def rollup(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        그룹 × 계정 행렬(rollup_engine.CompiledMapping.matrix)로 계정 축을 합산
+        반환: totals[g, e, p, m]
+        """
+        return rollup(matrix, self.values)
+
+    def entity_rollup(self, rules, values: Optional[np.ndarray] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        법인 축을 entity_dimension.BucketRules 버킷으로 합산 (행렬 곱 한 번)
+        values: 법인 축이 1번인 배열 (예: rollup 결과). 생략하면 원장 전체
+        반환: (버킷명, totals[a, 버킷, p, m])
+        """
+        return rules.reduce(self.values if values is None else values, self.entities.labels, axis=1)
+
+    def residual(self, entities: Sequence[str], measure: str) -> np.ndarray:
+        """기타(연결조정) = 연결 − 선택 법인 합계, (계정, 기간) 배열"""
+        view = self.measure(measure)
+        cons = view[:, self.entities.code(CONSOLIDATED), :]
+        return cons - view[:, self.entities.codes(entities), :].sum(axis=1)
+
+    def cumulative(self, measure: str) -> np.ndarray:
+        """기간 축을 연도별로 누적 합산한 (계정, 법인, 기간) 배열 (분기값 → YTD)"""
+        view = self.measure(measure)
+        out = np.zeros_like(view)
+        for idx in year_slices(self.periods.labels):
+            out[:, :, idx] = np.cumsum(view[:, :, idx], axis=2)
+        return out
+
+
+def year_slices(period_labels: Sequence[str]) -> List[np.ndarray]:
+    """'YYYY_NQ' 기간 라벨을 연도별로 묶어 분기 순으로 정렬한 인덱스 배열 목록"""
+    by_year: Dict[str, List[Tuple[str, int]]] = {}
+    for p, label in enumerate(period_labels):
+        year, _, quarter = label.partition('_')
+        by_year.setdefault(year, []).append((quarter, p))
+    return [np.array([p for _, p in sorted(items)], dtype=np.intp) for _, items in sorted(by_year.items())]
+
+
+class LedgerBuilder:
+    """여러 분기 블록 CSV를 하나의 Ledger로 적재"""
+
+    def __init__(self):
+        self.accounts = LabelDictionary()
+        self.entities = LabelDictionary()
+        self.periods = LabelDictionary()
+        self.measures = LabelDictionary()
+        self._chunks = []   # (계정 코드[r], 법인 코드[c], 기간 코드[c], 측정값 코드[c], 금액[r, c])
+
+    def _columns(self, layout, entity_measure: Optional[str]):
+        """레이아웃의 적재 대상 컬럼과 (법인, 기간, 측정값) 코드"""
+        cols, e_codes, p_codes, m_codes = [], [], [], []
+        for block in layout.blocks:
+            p = self.periods.encode(block.period_key)
+            if entity_measure is not None:
+                ent_m = entity_measure
+            elif block.balance is not None:
+                ent_m = 'balance'
+            elif block.prior_ytd is not None:
+                ent_m = 'ytd'
+            else:
+                ent_m = 'qtd'
+
+            for name, col in block.entities:
+                cols.append(col)
+                e_codes.append(self.entities.encode(canonical_entity(name)))
+                p_codes.append(p)
+                m_codes.append(self.measures.encode(ent_m))
+            if block.simple_sum is not None:
+                cols.append(block.simple_sum)
+                e_codes.append(self.entities.encode(SIMPLE_SUM))
+                p_codes.append(p)
+                m_codes.append(self.measures.encode(ent_m))
+            for name in MEASURES:
+                col = getattr(block, name)
+                if col is not None:
+                    cols.append(col)
+                    e_codes.append(self.entities.encode(CONSOLIDATED))
+                    p_codes.append(p)
+                    m_codes.append(self.measures.encode(name))
+        return cols, e_codes, p_codes, m_codes
+
+    def _account_code(self, label: str, seen: Dict[str, int]) -> int:
+        """계정 코드: 같은 파일에서 반복되는 라벨(예: 지배지분)은 '라벨#2' 형식으로 구분"""
+        n = seen.get(label, 0) + 1
+        seen[label] = n
+        return self.accounts.encode(label if n == 1 else f"{label}#{n}")
+
+    def _append(self, a_codes, cols, e_codes, p_codes, m_codes, cells: np.ndarray):
+        self._chunks.append((
+            np.array(a_codes, dtype=np.intp),
+            np.array(e_codes, dtype=np.intp),
+            np.array(p_codes, dtype=np.intp),
+            np.array(m_codes, dtype=np.intp),
+            cells.reshape(len(a_codes), len(cols)),
+        ))
+
+    def add_rows(self, rows: Iterable[Sequence[str]], entity_measure: Optional[str] = None):
+        """
+        헤더 포함 CSV 행 적재 (csv.reader 등 이터레이터를 그대로 받아 한 줄씩 처리)
+        entity_measure: 법인 컬럼 값의 측정값. 생략하면 레이아웃으로 판단
+          - BS(연결값 날짜 컬럼 있음): 'balance'
+          - IS(전년 누적 컬럼 있음, 법인 컬럼이 누적): 'ytd'
+          - 분기IS_법인별(법인 컬럼이 당분기): 'qtd'
+        """
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            return
+        layout = detect_layout(header)
+        if not layout.blocks:
+            return
+        cols, e_codes, p_codes, m_codes = self._columns(layout, entity_measure)
+
+        account_col = layout.account_col
+        # 컬럼이 다 있는 행은 itemgetter 한 번으로 골라냄 (짧은 행만 칸마다 확인)
+        pick = itemgetter(*cols) if len(cols) > 1 else (lambda row: tuple(row[c] for c in cols))
+        full_width = max(cols, default=-1) + 1
+        seen: Dict[str, int] = {}
+        a_codes = []
+        cells = array('q')
+        raw: List[str] = []
+        for row in rows:
+            width = len(row)
+            if width <= account_col:
+                continue
+            label = row[account_col].strip()
+            if not label:
+                continue
+            if width >= full_width:
+                raw.extend(pick(row))
+            else:
+                raw.extend([row[c] if c < width else '' for c in cols])
+            if len(raw) >= PARSE_CHUNK:
+                cells.frombytes(parse_won_array(raw).tobytes())
+                raw = []
+            a_codes.append(self._account_code(label, seen))
+
+        if raw:
+            cells.frombytes(parse_won_array(raw).tobytes())
+
+        self._append(a_codes, cols, e_codes, p_codes, m_codes, np.frombuffer(cells, dtype=np.int64))
+
+    def add_source(self, source, entity_measure: Optional[str] = None):
+        """
+        build_cache.ParsedSource 적재 (이미 파싱된 int64 행렬에서 컬럼만 골라 씀)
+        entity_measure: add_rows 와 같음
+        """
+        layout = source.layout
+        if not layout.blocks:
+            return
+        cols, e_codes, p_codes, m_codes = self._columns(layout, entity_measure)
+
+        seen: Dict[str, int] = {}
+        a_codes, row_idx = [], []
+        for r in range(1, len(source.labels)):
+            label = source.labels[r].strip()
+            if not label:
+                continue
+            row_idx.append(r)
+            a_codes.append(self._account_code(label, seen))
+
+        cells = source.values[np.array(row_idx, dtype=np.intp)[:, None], np.array(cols, dtype=np.intp)[None, :]]
+        self._append(a_codes, cols, e_codes, p_codes, m_codes, cells)
+
+    def build(self) -> Ledger:
+        shape = (len(self.accounts), len(self.entities), len(self.periods), len(self.measures))
+        values = np.zeros(shape, dtype=np.int64)
+        present = np.zeros((shape[0], shape[2]), dtype=bool)
+        columns = np.zeros(shape[1:], dtype=bool)
+        for a, e, p, m, cells in self._chunks:
+            values[a[:, None], e[None, :], p[None, :], m[None, :]] = cells
+            present[a[:, None], p[None, :]] = True
+            columns[e, p, m] = True
+        return Ledger(self.accounts, self.entities, self.periods, self.measures, values, present, columns)
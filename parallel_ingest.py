@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+원본 파일 병렬 적재 (프로세스 풀)
+- 원본 CSV(build_cache.load_source)와 정산표 통합 문서(excel_source.load_sheets)를 파일 하나당 작업 하나로 나눠
+  프로세스 풀에서 동시에 디코딩/파싱합니다. 벽시계 시간은 파일 수의 합이 아니라 가장 느린 파일 하나에 맞춰집니다.
+- 작업 프로세스는 중첩 dict 가 아니라 int64 행렬 + 라벨 튜플(ParsedSource, SheetColumn)만 돌려주고,
+  메인 프로세스가 이를 등록(preload)해 이후 load_source/load_sheets 호출은 파일을 다시 읽지 않습니다.
+- 큰 파일부터 제출해 마지막에 큰 파일 하나만 남는 일을 줄이고, 이미 등록된 파일은 풀로 보내지 않습니다.
+- 여러 연도/회사의 CSV를 하나의 원장(ledger_store.Ledger)으로 합칠 때는 load_ledger 를 씁니다.
+
+사용 예:
+    result = ingest(['2024_BS.csv', '2025_BS.csv'], workbooks=[('2025 정산표(IS).xlsx', sheets, '연결IS')])
+    result.sources[path].values                     # 원 단위 int64 행렬
+    ledger = load_ledger(['2024_BS.csv', '2025_BS.csv'])
+
+    python parallel_ingest.py --jobs 4              # build_cache.SOURCE_FILES 병렬 적재 후 파일별 소요 시간 출력
+    python parallel_ingest.py --trace               # 작업 프로세스별 decode/layout/parse 구간 타임라인
+    (적재 지표는 .cache/metrics.jsonl 의 stage='ingest' 줄: 읽은 바이트/행/다시 파싱한 셀)
+"""
+
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import build_cache
+import excel_source
+import profiling
+import run_metrics
+from ledger_store import Ledger, LedgerBuilder
+
+# (통합 문서 경로, 시트명 목록, 대상 컬럼 헤더) - excel_source.load_sheets 인자와 같음
+WorkbookSpec = Tuple[Path, Tuple[str, ...], str]
+
+
+@dataclass
+class IngestTime:
+    name: str
+    seconds: float
+    note: str = ''
+
+
+@dataclass
+class Ingested:
+    """병렬 적재 결과 (입력 순서 유지)"""
+    sources: Dict[Path, build_cache.ParsedSource] = field(default_factory=dict)
+    sheets: Dict[Path, Dict[str, excel_source.SheetColumn]] = field(default_factory=dict)
+    times: List[IngestTime] = field(default_factory=list)
+    errors: Dict[Path, str] = field(default_factory=dict)   # strict=False 일 때 적재에 실패한 파일
+
+
+# 작업 결과: (적재한 값, 소요 초, 실행 지표 수치)
+def _load_csv(path: Path) -> Tuple[build_cache.ParsedSource, float, Dict[str, int]]:
+    t0 = time.perf_counter()
+    with run_metrics.counter() as counts:
+        source = build_cache.load_source(path)
+        run_metrics.count(rows_scanned=max(len(source) - 1, 0))   # 헤더 제외
+    return source, time.perf_counter() - t0, counts
+
+
+def _load_workbook(path: Path, sheet_names: Tuple[str, ...], marker: str) -> Tuple[Dict[str, excel_source.SheetColumn], float, Dict[str, int]]:
+    t0 = time.perf_counter()
+    with run_metrics.counter() as counts:
+        sheets = excel_source.load_sheets(path, sheet_names, marker)
+        run_metrics.count(rows_scanned=sum(len(sheet.labels) for sheet in sheets.values()))
+    return sheets, time.perf_counter() - t0, counts
+
+
+def _csv_note(source: build_cache.ParsedSource, cached: bool) -> str:
+    if cached:
+        return "등록됨"
+    if source.reparsed:
+        return f"블록 {len(source.reparsed)}/{len(source.block_digests)}개 파싱"
+    return "캐시"
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def ingest(csv_paths: Sequence = (), workbooks: Sequence[WorkbookSpec] = (),
+           jobs: Optional[int] = None, strict: bool = True) -> Ingested:
+    """
+    원본 CSV와 통합 문서를 병렬로 적재해 메인 프로세스에 등록
+    jobs: 프로세스 수 (기본: CPU 수). 1이거나 적재할 파일이 하나뿐이면 풀 없이 현재 프로세스에서 적재
+    strict: 파일 하나가 실패하면 그 예외를 그대로 올림. False 면 errors 에 기록하고 나머지 파일은 계속 적재
+    """
+    csv_paths = list(dict.fromkeys(Path(p).resolve() for p in csv_paths))
+    workbooks = [(Path(p).resolve(), tuple(names), marker) for p, names, marker in workbooks]
+    result = Ingested()
+
+    # 이미 등록된 파일(작업 프로세스로 넘겨받은 원본 등)은 그대로 사용
+    tasks = []
+    for path in csv_paths:
+        source = build_cache.preloaded(path)
+        if source is None:
+            tasks.append((_size(path), 'csv', (path,)))
+        else:
+            result.sources[path] = source
+            result.times.append(IngestTime(path.name, 0.0, _csv_note(source, cached=True)))
+    for path, names, marker in workbooks:
+        sheets = excel_source.preloaded(path, marker)
+        if sheets is None or any(name not in sheets for name in names):
+            tasks.append((_size(path), 'xlsx', (path, names, marker)))
+        else:
+            result.sheets[path] = sheets
+            result.times.append(IngestTime(path.name, 0.0, "등록됨"))
+
+    def fail(args, error):
+        if strict:
+            raise error
+        result.errors[args[0]] = f"{type(error).__name__}: {error}"
+
+    def collect(kind, args, value, seconds, counts):
+        run_metrics.count(**counts)   # 작업 프로세스에서 모은 수치를 현재 단계에 합산
+        if kind == 'csv':
+            build_cache.preload([value])
+            result.sources[args[0]] = value
+            result.times.append(IngestTime(args[0].name, seconds, _csv_note(value, cached=False)))
+        else:
+            path, names, marker = args
+            excel_source.preload(path, marker, value)
+            result.sheets[path] = value
+            result.times.append(IngestTime(path.name, seconds, f"시트 {len(names)}개"))
+
+    workers = {'csv': _load_csv, 'xlsx': _load_workbook}
+    tasks.sort(key=lambda task: -task[0])   # 큰 파일부터
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(tasks) <= 1:
+        for _, kind, args in tasks:
+            try:
+                loaded = workers[kind](*args)
+            except Exception as e:
+                fail(args, e)
+                continue
+            collect(kind, args, *loaded)
+    else:
+        # 풀을 쓸 때만 적재 (concurrent.futures 는 multiprocessing/logging 까지 import)
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = {profiling.submit(pool, workers[kind], *args): (kind, args) for _, kind, args in tasks}
+            for future in as_completed(futures):
+                kind, args = futures[future]
+                try:
+                    loaded = profiling.collect(future)
+                except Exception as e:
+                    fail(args, e)
+                    continue
+                collect(kind, args, *loaded)
+
+    # 다시 파싱한 원본이 있으면 더는 쓰지 않는 블록 정리 (작업 프로세스가 모두 끝난 뒤)
+    if any(source.reparsed for source in result.sources.values()):
+        build_cache.prune_blocks()
+
+    # 호출자가 준 순서로 정렬 (원장 코드 순서가 실행마다 같도록)
+    result.sources = {path: result.sources[path] for path in csv_paths if path in result.sources}
+    result.sheets = {path: result.sheets[path] for path, _, _ in workbooks if path in result.sheets}
+    return result
+
+
+def load_ledger(paths: Sequence, entity_measure: Optional[str] = None, jobs: Optional[int] = None) -> Ledger:
+    """CSV 파일들을 병렬로 적재해 입력 순서대로 하나의 원장으로 합침 (entity_measure: LedgerBuilder.add_source 와 같음)"""
+    builder = LedgerBuilder()
+    for source in ingest(paths, jobs=jobs).sources.values():
+        builder.add_source(source, entity_measure)
+    return builder.build()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 파일 병렬 적재")
+    parser.add_argument("--jobs", type=int, default=None, help="프로세스 수 (기본: CPU 수, 1이면 순서대로)")
+    profiling.add_arguments(parser)
+    run_metrics.add_arguments(parser)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    with profiling.session('parallel_ingest', **profiling.options(args)), \
+            run_metrics.session('parallel_ingest', **run_metrics.options(args)), run_metrics.stage('ingest'):
+        result = ingest([path for path in build_cache.SOURCE_FILES if path.exists()], jobs=args.jobs)
+    total = time.perf_counter() - t0
+    for t in result.times:
+        print(f"  {t.name:<28} {t.seconds * 1000:>8.1f}ms  {t.note}")
+    print(f"  {'전체 (벽시계)':<28} {total * 1000:>8.1f}ms  (파일별 합계 {sum(t.seconds for t in result.times) * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
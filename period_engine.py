@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+기간 연산 엔진 (당분기 QTD ↔ 누적 YTD ↔ LTM)
+- 기간 축이 "연도 × 분기(1~4)" 순서로 이어진 배열을 (…, 연도, 분기) 로 reshape 해 누적합/차분 한 번으로 변환합니다.
+- 계정/법인 등 앞쪽 축은 그대로 두므로, 모든 계정 × 법인을 한 번의 호출로 처리합니다 (분기 수에 선형).
+- 기간 키 이름: 'YYYY_NQ'(당분기), 'YYYY_NQ_Year'(누적, 4분기는 'YYYY_Year'), 'YYYY_NQ_LTM'(최근 4개 분기 합)
+
+사용 예:
+    periods = PeriodAxis((2024, 2025))
+    qtd = cube                                         # (계정, 법인, len(periods)=8) 당분기 값
+    ytd = qtd_to_ytd(qtd)                              # 연도별 누적
+    assert (ytd_to_qtd(ytd) == qtd).all()
+    keys, values = expand(qtd, periods)                # ['2024_1Q', '2024_1Q_Year', ...], (계정, 법인, 16)
+    keys, values = expand(qtd, periods, ltm_keys=True) # 4분기째부터 'YYYY_NQ_LTM' 추가, (계정, 법인, 21)
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from profiling import traced
+
+QUARTERS = (1, 2, 3, 4)
+N_QUARTERS = len(QUARTERS)
+
+
+@dataclass(frozen=True)
+class PeriodAxis:
+    """연속된 연도들의 분기 축 (인덱스 = 연도 순번 × 4 + 분기 - 1)"""
+    years: Tuple[int, ...]
+
+    def __len__(self):
+        return len(self.years) * N_QUARTERS
+
+    def index(self, year: int, quarter: int) -> int:
+        return self.years.index(year) * N_QUARTERS + quarter - 1
+
+    def year_quarter(self, i: int) -> Tuple[int, int]:
+        return self.years[i // N_QUARTERS], i % N_QUARTERS + 1
+
+    def quarter_key(self, i: int) -> str:
+        year, quarter = self.year_quarter(i)
+        return f"{year}_{quarter}Q"
+
+    def ytd_key(self, i: int) -> str:
+        year, quarter = self.year_quarter(i)
+        return f"{year}_Year" if quarter == N_QUARTERS else f"{year}_{quarter}Q_Year"
+
+    def ltm_key(self, i: int) -> str:
+        return f"{self.quarter_key(i)}_LTM"
+
+    @classmethod
+    def from_keys(cls, keys: Sequence[str]) -> 'PeriodAxis':
+        """'YYYY_NQ' 키 목록이 걸친 연도 전체 (중간 연도 포함)"""
+        years = sorted({int(key.partition('_')[0]) for key in keys})
+        return cls(tuple(range(years[0], years[-1] + 1)) if years else ())
+
+
+def _by_year(values: np.ndarray, axis: int) -> np.ndarray:
+    """기간 축을 맨 뒤로 옮겨 (…, 연도, 분기) 로 reshape"""
+    moved = np.moveaxis(np.asarray(values), axis, -1)
+    if moved.shape[-1] % N_QUARTERS:
+        raise ValueError(f"기간 축 길이 {moved.shape[-1]}가 {N_QUARTERS}의 배수가 아닙니다")
+    return moved.reshape(moved.shape[:-1] + (moved.shape[-1] // N_QUARTERS, N_QUARTERS))
+
+
+def _restore(by_year: np.ndarray, axis: int) -> np.ndarray:
+    flat = by_year.reshape(by_year.shape[:-2] + (-1,))
+    return np.moveaxis(flat, -1, axis)
+
+
+@traced('ytd')
+def qtd_to_ytd(qtd, axis: int = -1) -> np.ndarray:
+    """당분기 → 연도별 누적 (분기 축 누적합)"""
+    return _restore(np.cumsum(_by_year(qtd, axis), axis=-1), axis)
+
+
+@traced('ytd')
+def ytd_to_qtd(ytd, axis: int = -1) -> np.ndarray:
+    """연도별 누적 → 당분기 (1분기는 그대로, 이후는 직전 누적과의 차이)"""
+    return _restore(np.diff(_by_year(ytd, axis), axis=-1, prepend=0), axis)
+
+
+@traced('ytd')
+def ltm(qtd, axis: int = -1) -> np.ndarray:
+    """
+    최근 4개 분기 합 (연도 경계를 넘어 이어지는 전체 누적합의 차분)
+    처음 3개 분기는 4개 분기가 채워지지 않으므로 그때까지의 합 (expand 는 이 구간의 키를 내보내지 않음)
+    """
+    moved = np.moveaxis(np.asarray(qtd), axis, -1)
+    csum = np.cumsum(moved, axis=-1)
+    out = csum.copy()
+    out[..., N_QUARTERS:] -= csum[..., :-N_QUARTERS]
+    return np.moveaxis(out, -1, axis)
+
+
+def expand(qtd, periods: PeriodAxis, axis: int = -1, ltm_keys: bool = False) -> Tuple[List[str], np.ndarray]:
+    """
+    당분기 배열 → 대시보드 기간 키 전체 (분기마다 'YYYY_NQ', 누적 키 순서, ltm_keys 면 4분기째부터 LTM 키 추가)
+    반환: (키 목록, 키 축을 axis 위치에 둔 배열)
+    """
+    qtd = np.asarray(qtd)
+    if qtd.shape[axis] != len(periods):
+        raise ValueError(f"기간 축 길이 {qtd.shape[axis]} != {len(periods)}")
+    parts = [qtd, qtd_to_ytd(qtd, axis)]
+    if ltm_keys:
+        parts.append(ltm(qtd, axis))
+
+    keys, index = [], []
+    for i in range(len(periods)):
+        keys += [periods.quarter_key(i), periods.ytd_key(i)]
+        index += [(0, i), (1, i)]
+        if ltm_keys and i >= N_QUARTERS - 1:
+            keys.append(periods.ltm_key(i))
+            index.append((2, i))
+
+    stacked = np.stack([np.moveaxis(part, axis, -1) for part in parts], axis=-2)   # (…, 종류, 기간)
+    picked = stacked[..., [k for k, _ in index], [i for _, i in index]]
+    return keys, np.moveaxis(picked, -1, axis)
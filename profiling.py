@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+빌드 프로파일링 (--profile / --trace)
+- --profile: cProfile 덤프(<이름>.prof)와 tracemalloc 할당 상위 N개 보고서(<이름>.alloc.txt)
+- --trace:   Chrome trace-event JSON(<이름>.trace.json, chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)
+  단계별 구간(span): decode(디코딩), layout(레이아웃 감지), parse(행 파싱), rollup(롤업), ytd(누적/분기 변환), serialize(JSON 저장)
+- 출력 폴더는 .cache/profile/ (--profile-dir 로 변경)
+- 끄면(기본) span/traced 는 전역 변수 하나만 확인하고 바로 돌아가므로 운영 빌드에 그대로 둡니다.
+- 프로세스 풀 작업은 submit/collect 로 보내면, trace 중일 때 작업 프로세스의 구간도 돌려받아 한 타임라인에 합칩니다.
+
+사용 예:
+    @traced('rollup')
+    def rollup(matrix, values): ...
+
+    with span('serialize', file=OUTPUT_FILE.name):
+        json.dump(data, f)
+
+    future = submit(pool, load_source, path)   # pool.submit 대신
+    source = collect(future)                    # future.result() 대신
+
+    if __name__ == '__main__':
+        run_main('parse_bs_data', main)        # python parse_bs_data.py --profile --trace
+
+    python -m pstats .cache/profile/parse_bs_data.prof
+"""
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import run_metrics
+
+PROFILE_DIR = Path(__file__).parent / ".cache" / "profile"
+
+# 단계 구간 이름 (trace 의 name)
+STAGES = ('decode', 'layout', 'parse', 'rollup', 'ytd', 'serialize')
+
+# tracemalloc 보고서에 남길 할당 위치 수, 스택 깊이
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 1
+
+
+class Recorder:
+    """Chrome trace-event 'X'(complete) 이벤트 수집"""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.pid = os.getpid()
+
+    def complete(self, name: str, start_ns: int, end_ns: int, args: Optional[dict]):
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': start_ns / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': self.pid,
+            'tid': threading.get_native_id(),
+        }
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+
+# 기록 중인 Recorder (None 이면 모든 span 이 no-op)
+_recorder: Optional[Recorder] = None
+# cProfile/tracemalloc 을 켠 세션의 (프로세스, 프로파일러). 같은 프로세스의 중첩 세션은 바깥 세션에 맡김
+# (fork 한 작업 프로세스는 부모의 프로파일러를 물려받으므로 끄고 새로 시작)
+_owner_pid: Optional[int] = None
+_profiler: Optional[cProfile.Profile] = None
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name: str, args: Optional[dict]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        recorder = _recorder
+        if recorder is not None:
+            recorder.complete(self.name, self.start, time.perf_counter_ns(), self.args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def tracing() -> bool:
+    return _recorder is not None
+
+
+def span(name: str, **args):
+    """구간 기록 컨텍스트 (trace 를 켜지 않았으면 공유 no-op 객체)"""
+    if _recorder is None:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+
+def traced(name: str):
+    """함수 전체를 구간으로 기록하는 데코레이터 (꺼져 있으면 원래 함수 호출만)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return func(*args, **kwargs)
+            with _Span(name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class _Traced:
+    """작업 프로세스에서 기록한 (결과, 구간 이벤트)"""
+    __slots__ = ('result', 'events')
+
+    def __init__(self, result: Any, events: List[Dict[str, Any]]):
+        self.result = result
+        self.events = events
+
+
+def _traced_call(func: Callable, *args) -> _Traced:
+    global _recorder
+    previous, _recorder = _recorder, Recorder()
+    try:
+        return _Traced(func(*args), _recorder.events)
+    finally:
+        _recorder = previous
+
+
+def submit(pool, func: Callable, *args):
+    """pool.submit (trace 중이면 작업 프로세스에서도 구간을 기록해 함께 돌려받음)"""
+    if _recorder is None:
+        return pool.submit(func, *args)
+    return pool.submit(_traced_call, func, *args)
+
+
+def collect(future) -> Any:
+    """submit 한 작업의 결과 (작업 프로세스의 구간 이벤트는 현재 기록에 합침)"""
+    value = future.result()
+    if isinstance(value, _Traced):
+        if _recorder is not None:
+            _recorder.events.extend(value.events)
+        return value.result
+    return value
+
+
+@contextmanager
+def session(label: str, profile: bool = False, trace: bool = False, out_dir: Path = PROFILE_DIR,
+            top: int = TOP_ALLOCATIONS):
+    """
+    label 이름으로 profile/trace 파일을 남기는 실행 구간 (둘 다 끄면 아무것도 하지 않음)
+    바깥에 이미 세션이 있으면(build_pipeline --jobs 1 로 스크립트를 같은 프로세스에서 실행) 바깥 세션에 기록
+    반환: 이 세션이 쓴 파일 목록 (종료 후 채워짐)
+    """
+    global _recorder, _owner_pid, _profiler
+    files: List[Path] = []
+    if not (profile or trace):
+        yield files
+        return
+
+    out_dir = Path(out_dir)
+    own_recorder = trace and _recorder is None
+    own_profile = profile and _owner_pid != os.getpid()
+    previous = _recorder
+    if own_recorder:
+        _recorder = Recorder()
+    profiler = None
+    if own_profile:
+        if _profiler is not None:
+            _profiler.disable()
+        if tracemalloc.is_tracing():
+            tracemalloc.clear_traces()
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        profiler = cProfile.Profile()
+        _owner_pid, _profiler = os.getpid(), profiler
+        profiler.enable()
+    recorder = _recorder
+    try:
+        with span(label) if own_recorder else _NULL_SPAN:
+            yield files
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _owner_pid, _profiler = None, None
+            out_dir.mkdir(parents=True, exist_ok=True)
+            prof_path = out_dir / f"{label}.prof"
+            profiler.dump_stats(str(prof_path))
+            alloc_path = out_dir / f"{label}.alloc.txt"
+            alloc_path.write_text(allocation_report(label, snapshot, peak, top), encoding='utf-8')
+            files += [prof_path, alloc_path]
+        if own_recorder:
+            _recorder = previous
+            files.append(write_trace_file(out_dir / f"{label}.trace.json", recorder.events, label))
+        for path in files:
+            print(f"  [프로파일] {path}")
+
+
+def allocation_report(label: str, snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    stats = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+    ]).statistics('lineno')
+    total = sum(stat.size for stat in stats)
+    lines = [
+        f"{label}: tracemalloc 할당 상위 {top}개 (종료 시점 남은 메모리)",
+        f"최대 {peak / 1024:,.1f}KB, 종료 시점 {total / 1024:,.1f}KB ({len(stats)}개 위치)",
+        "",
+        f"{'크기':>12} {'개수':>10}  위치",
+    ]
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:>10,.1f}KB {stat.count:>10,}  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+def write_trace_file(path: Path, events: List[Dict[str, Any]], label: str) -> Path:
+    """Chrome trace-event JSON (프로세스 이름 메타데이터 포함)"""
+    pids = sorted({event['pid'] for event in events})
+    meta = [{'name': 'process_name', 'ph': 'M', 'pid': pid,
+             'args': {'name': label if pid == os.getpid() else f"작업 프로세스 {pid}"}} for pid in pids]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': meta + events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    return path
+
+
+# ============================================
+# 명령줄 옵션
+# ============================================
+
+def add_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("프로파일링")
+    group.add_argument("--profile", action="store_true", help="cProfile 덤프 + tracemalloc 할당 보고서")
+    group.add_argument("--trace", action="store_true", help="Chrome trace-event JSON (단계별 구간)")
+    group.add_argument("--profile-dir", type=Path, default=PROFILE_DIR, help="프로파일 출력 폴더")
+    group.add_argument("--top", type=int, default=TOP_ALLOCATIONS, help="할당 보고서 위치 수")
+
+
+def options(args: argparse.Namespace) -> Dict[str, Any]:
+    """add_arguments 로 받은 값 → session 인자"""
+    return {'profile': args.profile, 'trace': args.trace, 'out_dir': args.profile_dir, 'top': args.top}
+
+
+def run_main(label: str, main: Callable[[], Any], argv: Optional[List[str]] = None):
+    """
+    인자 없는 스크립트 main() 을 --profile/--trace 와 실행 지표 옵션(--verbose/--js/--metrics)으로 실행 (다른 인자는 무시)
+    기본은 조용히 실행하고 단계별 지표만 run_metrics.METRICS_FILE 에 기록
+    """
+    parser = argparse.ArgumentParser(description=f"{label} (프로파일링/실행 지표 옵션)")
+    add_arguments(parser)
+    run_metrics.add_arguments(parser)
+    args, _ = parser.parse_known_args(argv)
+    with session(label, **options(args)), run_metrics.session(label, **run_metrics.options(args)):
+        return main()
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+"""
+원장 조회 서비스 (로컬 HTTP, 표준 라이브러리 asyncio)
+- 원본 CSV를 데이터셋(bs / is / is_entity)별 원장(ledger_store.Ledger)으로 적재해 두고,
+  계정 × 법인 × 기간 범위 × 측정값 조각(slice)을 JSON으로 돌려줍니다. 새 화면마다 스크립트를 만들 필요가 없습니다.
+- 응답 본문은 (데이터셋, 원본 지문, 정규화한 질의) 키로 크기 제한 LRU 캐시에 둡니다.
+- ETag 는 원본 CSV 지문 + 질의로 만들어, 브라우저는 If-None-Match 로 304 재검증만 합니다.
+- 요청마다 원본 파일의 (mtime, 크기)만 확인하고, 바뀌었을 때만 다시 적재(바뀐 분기 블록만 파싱)합니다.
+  내용 지문이 그대로면(파일을 건드리기만 한 경우) 캐시를 그대로 씁니다.
+
+사용법:
+    python query_service.py                       # http://127.0.0.1:8765 (npm run dev 옆에서 실행)
+    python query_service.py --port 9000 --cache-size 512
+
+    GET /datasets                                  # 데이터셋별 축 라벨과 지문
+    GET /slice?dataset=bs&account=자산총계,부채총계&entity=연결&from=2024_4Q&to=2025_4Q&measure=balance&unit=million
+    GET /slice?dataset=is_entity&account=Ⅰ.매출액&measure=qtd&rules=dashboard   # 법인 축을 대시보드 법인 버킷으로 합산
+    GET /health
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from amounts import won_to_million
+from entity_dimension import DASHBOARD_RULES
+from label_index import norm
+from ledger_store import Ledger, LedgerBuilder
+from parallel_ingest import ingest
+
+BASE_DIR = Path(__file__).parent
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 캐시할 응답 본문 수 (데이터셋 전체 합계)
+DEFAULT_CACHE_SIZE = 256
+
+# 요청 헤더 최대 크기 (로컬 서비스이므로 작게)
+MAX_HEADER_BYTES = 16 * 1024
+
+# 데이터셋 → 원본 CSV (연도 순서대로 하나의 원장으로 합침)
+DATASETS = {
+    'bs': ('2024_BS.csv', '2025_BS.csv'),
+    'is': ('2024_IS.csv', '2025_IS.csv'),
+    'is_entity': ('2024 분기IS_법인별.csv', '2025_분기IS_법인별.csv'),
+}
+
+# rules= 로 고를 수 있는 법인 버킷 규칙
+ENTITY_RULES = {
+    'dashboard': DASHBOARD_RULES,
+}
+
+UNITS = ('won', 'million')
+
+
+class QueryError(ValueError):
+    """잘못된 질의 (400 응답)"""
+
+
+@dataclass(frozen=True)
+class SliceQuery:
+    """정규화한 조각 질의 (캐시 키/ETag 에 그대로 씀)"""
+    dataset: str
+    accounts: Tuple[str, ...] = ()    # 비어 있으면 전체
+    entities: Tuple[str, ...] = ()
+    start: Optional[str] = None       # 기간 범위 (포함, 'YYYY_NQ')
+    end: Optional[str] = None
+    measure: Optional[str] = None     # 생략하면 원장의 첫 측정값
+    unit: str = 'won'
+    rules: Optional[str] = None
+
+    @classmethod
+    def parse(cls, params: Dict[str, List[str]]) -> 'SliceQuery':
+        def one(name, default=None):
+            values = params.get(name)
+            return values[-1].strip() if values and values[-1].strip() else default
+
+        def many(name):
+            return tuple(v.strip() for value in params.get(name, ()) for v in value.split(',') if v.strip())
+
+        dataset = one('dataset')
+        if dataset not in DATASETS:
+            raise QueryError(f"dataset 은 {', '.join(DATASETS)} 중 하나여야 합니다: {dataset!r}")
+        unit = one('unit', 'won')
+        if unit not in UNITS:
+            raise QueryError(f"unit 은 {', '.join(UNITS)} 중 하나여야 합니다: {unit!r}")
+        rules = one('rules')
+        if rules is not None and rules not in ENTITY_RULES:
+            raise QueryError(f"rules 는 {', '.join(ENTITY_RULES)} 중 하나여야 합니다: {rules!r}")
+        return cls(dataset, many('account'), many('entity'), one('from'), one('to'), one('measure'), unit, rules)
+
+    def key(self) -> str:
+        return json.dumps([self.dataset, self.accounts, self.entities, self.start, self.end,
+                           self.measure, self.unit, self.rules], ensure_ascii=False)
+
+
+def pick_labels(labels: Sequence[str], wanted: Sequence[str], axis: str) -> List[int]:
+    """라벨 목록에서 요청 라벨의 위치 (정확 일치 → 공백 무시 일치). 없으면 QueryError"""
+    if not wanted:
+        return list(range(len(labels)))
+    exact = {label: i for i, label in enumerate(labels)}
+    normalized: Dict[str, int] = {}
+    for i, label in enumerate(labels):
+        normalized.setdefault(norm(label), i)
+    out = []
+    for label in wanted:
+        i = exact.get(label, normalized.get(norm(label)))
+        if i is None:
+            raise QueryError(f"{axis} 없음: {label}")
+        out.append(i)
+    return out
+
+
+def period_range(labels: Sequence[str], start: Optional[str], end: Optional[str]) -> List[int]:
+    """'YYYY_NQ' 기간 라벨 중 [start, end] 범위의 위치 (기간 순서)"""
+    ordered = sorted(range(len(labels)), key=lambda p: labels[p])
+    for bound in (start, end):
+        if bound is not None and bound not in labels:
+            raise QueryError(f"기간 없음: {bound} (가능: {', '.join(sorted(labels))})")
+    return [p for p in ordered
+            if (start is None or labels[p] >= start) and (end is None or labels[p] <= end)]
+
+
+def slice_ledger(ledger: Ledger, query: SliceQuery) -> dict:
+    """원장에서 질의 조각을 잘라 JSON 직렬화 가능한 dict 로 (values[계정][법인][기간])"""
+    measure = query.measure or ledger.measures.labels[0]
+    m = ledger.measures.code(measure)
+    if m is None:
+        raise QueryError(f"측정값 없음: {measure} (가능: {', '.join(ledger.measures.labels)})")
+
+    a_idx = pick_labels(ledger.accounts.labels, query.accounts, '계정')
+    p_idx = period_range(ledger.periods.labels, query.start, query.end)
+    values = ledger.values[..., m][np.ix_(a_idx, range(len(ledger.entities)), p_idx)]   # (계정, 법인, 기간)
+    return shape_slice(query, measure, [ledger.accounts.labels[a] for a in a_idx], ledger.entities.labels,
+                       [ledger.periods.labels[p] for p in p_idx], values)
+
+
+def shape_slice(query: SliceQuery, measure: str, accounts: Sequence[str], entities: Sequence[str],
+                periods: Sequence[str], values: np.ndarray) -> dict:
+    """
+    잘라 낸 (계정, 법인, 기간) 배열 → 응답 dict (법인 버킷 합산, 법인 선택, 단위 변환)
+    slice_ledger 와 ledger_db.slice_db 가 같은 응답을 내도록 공유
+    """
+    if query.rules is not None:
+        entity_labels, values = ENTITY_RULES[query.rules].reduce(values, entities, axis=1)
+    else:
+        entity_labels = entities
+    e_idx = pick_labels(entity_labels, query.entities, '법인')
+    values = values[:, e_idx, :]
+
+    if query.unit == 'million':
+        values = won_to_million(values)
+
+    return {
+        'dataset': query.dataset,
+        'measure': measure,
+        'unit': query.unit,
+        'accounts': list(accounts),
+        'entities': [entity_labels[e] for e in e_idx],
+        'periods': list(periods),
+        'values': values.tolist(),
+    }
+
+
+class Dataset:
+    """데이터셋 하나의 원장 + 원본 지문 (원본 파일이 바뀌었을 때만 다시 적재)"""
+
+    def __init__(self, name: str, paths: Sequence[Path]):
+        self.name = name
+        self.paths = [Path(p).resolve() for p in paths]
+        self.ledger: Optional[Ledger] = None
+        self.fingerprint = ''
+        self._stats: Optional[tuple] = None
+        self._lock = asyncio.Lock()
+
+    def _stat(self) -> tuple:
+        out = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                out.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def _load(self) -> Tuple[Ledger, str]:
+        existing = [path for path in self.paths if path.exists()]
+        if not existing:
+            raise FileNotFoundError(f"{self.name}: 원본 CSV가 없습니다 ({', '.join(p.name for p in self.paths)})")
+        sources = ingest(existing, jobs=1).sources   # 요청 처리 중 적재: 프로세스 풀을 만들지 않고 이 스레드에서
+        builder = LedgerBuilder()
+        h = hashlib.sha256()
+        for path, source in sources.items():
+            builder.add_source(source)
+            h.update(path.name.encode('utf-8'))
+            h.update(source.digest.encode())
+        return builder.build(), h.hexdigest()
+
+    async def refresh(self) -> bool:
+        """원본이 바뀌었으면 다시 적재. 지문이 바뀌었으면 True"""
+        stats = self._stat()
+        if stats == self._stats and self.ledger is not None:
+            return False
+        async with self._lock:
+            if stats == self._stats and self.ledger is not None:
+                return False
+            ledger, fingerprint = await asyncio.to_thread(self._load)
+            changed = fingerprint != self.fingerprint
+            self.ledger, self.fingerprint, self._stats = ledger, fingerprint, stats
+            return changed
+
+    def describe(self) -> dict:
+        ledger = self.ledger
+        return {
+            'fingerprint': self.fingerprint,
+            'sources': [path.name for path in self.paths],
+            'accounts': ledger.accounts.labels,
+            'entities': ledger.entities.labels,
+            'periods': sorted(ledger.periods.labels),
+            'measures': ledger.measures.labels,
+            'rules': {name: rules.names() for name, rules in ENTITY_RULES.items()},
+        }
+
+
+class ResponseCache:
+    """응답 본문 LRU 캐시 {키: (ETag, 본문)}"""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: 'OrderedDict[tuple, Tuple[str, bytes]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[Tuple[str, bytes]]:
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item
+
+    def put(self, key: tuple, item: Tuple[str, bytes]):
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def drop(self, dataset: str):
+        """데이터셋 원본이 바뀌었을 때 그 데이터셋 항목만 비움"""
+        for key in [key for key in self._items if key[0] == dataset]:
+            del self._items[key]
+
+    def __len__(self):
+        return len(self._items)
+
+
+def make_etag(fingerprint: str, key: str) -> str:
+    return '"' + fingerprint[:16] + '-' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:16] + '"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+
+class QueryService:
+    """/slice, /datasets, /health 요청 처리 (HTTP 파싱은 serve 쪽)"""
+
+    def __init__(self, datasets: Dict[str, Sequence[str]] = DATASETS, cache_size: int = DEFAULT_CACHE_SIZE,
+                 base_dir: Path = BASE_DIR):
+        self.datasets = {name: Dataset(name, [base_dir / f for f in files]) for name, files in datasets.items()}
+        self.cache = ResponseCache(cache_size)
+
+    async def dataset(self, name: str) -> Dataset:
+        dataset = self.datasets[name]
+        if await dataset.refresh():
+            self.cache.drop(name)
+        return dataset
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """(상태 코드, 응답 헤더, 본문)"""
+        if method not in ('GET', 'HEAD'):
+            return _json(405, {'error': f"지원하지 않는 메서드: {method}"}, {'Allow': 'GET, HEAD'})
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        try:
+            if url.path == '/health':
+                return _json(200, {'status': 'ok', 'cache': {'size': len(self.cache), 'hits': self.cache.hits,
+                                                             'misses': self.cache.misses}})
+            if url.path == '/datasets':
+                described = {}
+                for name in self.datasets:
+                    described[name] = (await self.dataset(name)).describe()
+                return _json(200, described)
+            if url.path == '/slice':
+                return await self._slice(SliceQuery.parse(params), headers)
+        except QueryError as e:
+            return _json(400, {'error': str(e)})
+        except FileNotFoundError as e:
+            return _json(503, {'error': str(e)})
+        except Exception as e:
+            # 연결을 끊지 않고 500 으로 응답 (원인은 서비스 콘솔에 traceback 으로)
+            print(f"  [오류] {method} {target}", file=sys.stderr)
+            traceback.print_exc()
+            return _json(500, {'error': f"{type(e).__name__}: {e}"})
+        return _json(404, {'error': f"없는 경로: {url.path}"})
+
+    async def _slice(self, query: SliceQuery, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        dataset = await self.dataset(query.dataset)
+        key = query.key()
+        cache_key = (query.dataset, dataset.fingerprint, key)
+        item = self.cache.get(cache_key)
+        if item is None:
+            body = json.dumps(slice_ledger(dataset.ledger, query), ensure_ascii=False, separators=(',', ':'))
+            item = (make_etag(dataset.fingerprint, key), body.encode('utf-8'))
+            self.cache.put(cache_key, item)
+
+        etag, body = item
+        extra = {'ETag': etag, 'Cache-Control': 'no-cache'}   # 매번 재검증 (원본이 그대로면 304)
+        if _etag_matches(headers.get('if-none-match'), etag):
+            return 304, extra, b''
+        return 200, dict(extra, **{'Content-Type': 'application/json; charset=utf-8'}), body
+
+
+def _json(status: int, payload, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    out = {'Content-Type': 'application/json; charset=utf-8', 'Cache-Control': 'no-store'}
+    out.update(headers or {})
+    return status, out, json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error',
+           503: 'Service Unavailable'}
+
+
+async def _serve_connection(service: QueryService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """HTTP/1.1 연결 하나 (keep-alive, 본문 없는 GET/HEAD 만)"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(b'HTTP/1.1 431 Request Header Fields Too Large\r\nConnection: close\r\nContent-Length: 0\r\n\r\n')
+                break
+
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            # 경로/질의의 한글은 UTF-8 퍼센트 인코딩으로 옴 (parse_qs 가 디코딩)
+            target = target.encode('latin-1').decode('utf-8', errors='replace')
+
+            t0 = time.perf_counter()
+            status, out_headers, body = await service.handle(method, target, headers)
+            keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+            out_headers = dict(out_headers)
+            out_headers['Content-Length'] = str(len(body))
+            out_headers['Access-Control-Allow-Origin'] = '*'     # vite 개발 서버(다른 포트)에서 호출
+            out_headers['Access-Control-Expose-Headers'] = 'ETag'
+            out_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+            out_headers['Server-Timing'] = f"query;dur={(time.perf_counter() - t0) * 1000:.1f}"
+            response = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+            response += [f"{name}: {value}" for name, value in out_headers.items()]
+            writer.write(('\r\n'.join(response) + '\r\n\r\n').encode('utf-8'))
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache_size: int = DEFAULT_CACHE_SIZE):
+    service = QueryService(cache_size=cache_size)
+    for name in service.datasets:   # 첫 요청이 느리지 않도록 미리 적재 (원본이 없는 데이터셋은 건너뜀)
+        try:
+            await service.dataset(name)
+        except FileNotFoundError as e:
+            print(f"  {e}")
+    server = await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port,
+                                        limit=MAX_HEADER_BYTES)
+    print(f"원장 조회 서비스: http://{host}:{port}/datasets")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원장 조회 서비스 (로컬 HTTP)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="캐시할 응답 수")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,18 @@
 # -*- coding: utf-8 -*-
 import csv
+
+from amounts import parse_won, to_millions
+from column_layout import detect_layout
 import json
 
+# 백만원 변환: 기존 출력과 같이 음의 무한대 방향 버림 (원 단위로 계산을 끝낸 뒤 한 번만)
+ROUNDING = 'floor'
+
 # IS CSV 읽기
 with open('2025_IS.csv', 'r', encoding='cp949') as f:
     reader = csv.reader(f)
     rows = list(reader)
 
-def parse_num(s):
-    """숫자 문자열 파싱 (백만원 단위로 변환)"""
-    if not s or s.strip() == '':
-        return 0
-    s = s.strip().replace(',', '').replace(' ', '')
-    if s.startswith('(') and s.endswith(')'):
-        s = '-' + s[1:-1]
-    try:
-        return int(float(s)) // 1000000  # 백만원 단위
-    except:
-        return 0
-
 # 계정 매핑 (CSV 계정명 -> 대시보드 키)
 account_mapping = {
     'Ⅰ.매출액': '매출액',
@@ -34,12 +28,31 @@ account_mapping = {
     '무형자산상각비': '감가상각비_2',
 }
 
-# 3Q 컬럼 인덱스 (법인별)
-# 35: F&F, 36: Shanghai, 37: HK, 38: 베트남, 39: 빅텐츠, 40: 엔터, 41: 세르지오
-Q3_COLS = {'OC(국내)': 35, '중국': 36, '홍콩': 37, '기타': 41}
+# 헤더에서 분기 블록을 감지해 법인별 누적 컬럼 인덱스 계산
+layout = detect_layout(rows[0])
 
-# 4Q 컬럼 인덱스 (법인별)
-Q4_COLS = {'OC(국내)': 52, '중국': 53, '홍콩': 54, '기타': 58}
+# 대시보드 법인 → CSV 헤더 법인
+ENTITY_HEADERS = {
+    'OC(국내)': 'F&F',
+    '중국': 'F&F Shanghai',
+    '홍콩': 'FnF HONGKONG',
+    '기타': '세르지오',
+}
+
+def entity_cols(quarter):
+    """분기 블록의 법인별 컬럼 (F&F, Shanghai, HK, 세르지오). 블록이나 법인 컬럼이 없으면 ValueError"""
+    block = layout.quarter(quarter)
+    if block is None:
+        raise ValueError(f"2025_IS.csv 헤더에서 {quarter}분기 블록을 찾을 수 없습니다")
+    cols = {entity: block.entity_col(header) for entity, header in ENTITY_HEADERS.items()}
+    missing = [ENTITY_HEADERS[entity] for entity, col in cols.items() if col is None]
+    if missing:
+        found = ', '.join(name for name, _ in block.entities)
+        raise ValueError(f"2025_IS.csv {block.label} 블록에 법인 컬럼이 없습니다: {', '.join(missing)} (헤더 법인: {found})")
+    return cols
+
+Q3_COLS = entity_cols(3)
+Q4_COLS = entity_cols(4)
 
 results = {}
 
@@ -77,12 +90,12 @@ for i, row in enumerate(rows):
     # 3Q 누적
     q3_data = {}
     for entity, col in Q3_COLS.items():
-        q3_data[entity] = parse_num(row[col]) if col < len(row) else 0
+        q3_data[entity] = parse_won(row[col]) if col < len(row) else 0
     
     # 4Q 누적
     q4_data = {}
     for entity, col in Q4_COLS.items():
-        q4_data[entity] = parse_num(row[col]) if col < len(row) else 0
+        q4_data[entity] = parse_won(row[col]) if col < len(row) else 0
     
     # 4Q 당분기 = 4Q 누적 - 3Q 누적
     q4_qtr = {}
@@ -94,6 +107,9 @@ for i, row in enumerate(rows):
         '2025_Year': q4_data
     }
 
+# 원 → 백만원 (4Q 누적 - 3Q 누적을 원 단위로 계산한 뒤 한 번만 변환)
+results = to_millions(results, ROUNDING)
+
 # 출력
 print('=== IS 법인별 데이터 (정확한 계산값) ===')
 print()
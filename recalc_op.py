@@ -1,25 +1,42 @@
 # -*- coding: utf-8 -*-
 import csv
 
+from amounts import parse_won, to_millions, won_to_million
+from column_layout import detect_layout
+
+# 백만원 변환: 기존 출력과 같이 음의 무한대 방향 버림 (원 단위로 계산을 끝낸 뒤 한 번만)
+ROUNDING = 'floor'
+
 # IS CSV 읽기
 with open('2025_IS.csv', 'r', encoding='cp949') as f:
     reader = csv.reader(f)
     rows = list(reader)
 
-def parse_num(s):
-    """숫자 문자열 파싱 (백만원 단위로 변환)"""
-    if not s or s.strip() == '':
-        return 0
-    s = s.strip().replace(',', '').replace(' ', '')
-    if s.startswith('(') and s.endswith(')'):
-        s = '-' + s[1:-1]
-    try:
-        return int(float(s)) // 1000000  # 백만원 단위
-    except:
-        return 0
+# 헤더에서 분기 블록을 감지해 법인별 누적 컬럼 인덱스 계산
+layout = detect_layout(rows[0])
+
+# 대시보드 법인 → CSV 헤더 법인
+ENTITY_HEADERS = {
+    'OC(국내)': 'F&F',
+    '중국': 'F&F Shanghai',
+    '홍콩': 'FnF HONGKONG',
+    '기타': '세르지오',
+}
 
-Q3_COLS = {'OC(국내)': 35, '중국': 36, '홍콩': 37, '기타': 41}
-Q4_COLS = {'OC(국내)': 52, '중국': 53, '홍콩': 54, '기타': 58}
+def entity_cols(quarter):
+    """분기 블록의 법인별 컬럼 (F&F, Shanghai, HK, 세르지오). 블록이나 법인 컬럼이 없으면 ValueError"""
+    block = layout.quarter(quarter)
+    if block is None:
+        raise ValueError(f"2025_IS.csv 헤더에서 {quarter}분기 블록을 찾을 수 없습니다")
+    cols = {entity: block.entity_col(header) for entity, header in ENTITY_HEADERS.items()}
+    missing = [ENTITY_HEADERS[entity] for entity, col in cols.items() if col is None]
+    if missing:
+        found = ', '.join(name for name, _ in block.entities)
+        raise ValueError(f"2025_IS.csv {block.label} 블록에 법인 컬럼이 없습니다: {', '.join(missing)} (헤더 법인: {found})")
+    return cols
+
+Q3_COLS = entity_cols(3)
+Q4_COLS = entity_cols(4)
 
 # 영업이익 찾기
 for i, row in enumerate(rows):
@@ -33,8 +50,8 @@ for i, row in enumerate(rows):
         # 3Q 누적
         print('3Q 법인별 누적:')
         for entity, col in Q3_COLS.items():
-            val = parse_num(row[col]) if col < len(row) else 0
-            print(f'  {entity}: {val}백만원')
+            val = parse_won(row[col]) if col < len(row) else 0
+            print(f'  {entity}: {won_to_million(val, ROUNDING)}백만원')
         
         print()
         
@@ -42,26 +59,30 @@ for i, row in enumerate(rows):
         print('4Q 법인별 누적:')
         q4_data = {}
         for entity, col in Q4_COLS.items():
-            val = parse_num(row[col]) if col < len(row) else 0
+            val = parse_won(row[col]) if col < len(row) else 0
             q4_data[entity] = val
-            print(f'  {entity}: {val}백만원')
+            print(f'  {entity}: {won_to_million(val, ROUNDING)}백만원')
         
         print()
         
         # 4Q 당분기
         print('4Q 당분기 (4Q누적 - 3Q누적):')
         for entity, col in Q3_COLS.items():
-            q3 = parse_num(row[col]) if col < len(row) else 0
+            q3 = parse_won(row[col]) if col < len(row) else 0
             q4 = q4_data[entity]
-            print(f'  {entity}: {q4 - q3}백만원')
+            print(f'  {entity}: {won_to_million(q4 - q3, ROUNDING)}백만원')
         
         print()
         print('=== 대시보드에 입력할 값 ===')
         print("'영업이익':")
         
-        q3_vals = {e: parse_num(row[c]) for e, c in Q3_COLS.items()}
+        q3_vals = {e: parse_won(row[c]) for e, c in Q3_COLS.items()}
         q4_qtr = {e: q4_data[e] - q3_vals[e] for e in Q3_COLS.keys()}
         
+        # 원 → 백만원 (차감 후 한 번만 변환)
+        q4_qtr = to_millions(q4_qtr, ROUNDING)
+        q4_data = to_millions(q4_data, ROUNDING)
+        
         print(f"  '2025_4Q': {{ 'OC(국내)': {q4_qtr['OC(국내)']}, '중국': {q4_qtr['중국']}, '홍콩': {q4_qtr['홍콩']}, '기타': {q4_qtr['기타']} }},")
         print(f"  '2025_Year': {{ 'OC(국내)': {q4_data['OC(국내)']}, '중국': {q4_data['중국']}, '홍콩': {q4_data['홍콩']}, '기타': {q4_data['기타']} }},")
         break
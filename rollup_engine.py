@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+맵핑표 롤업 엔진
+- 손익계산서_맵핑표.csv / 재무상태표_맵핑표.csv 를 "계정 → 그룹" 희소 행렬(COO: 그룹 인덱스, 계정 인덱스)로 한 번만 컴파일합니다.
+- 컴파일 결과는 맵핑 파일 내용의 SHA-256 해시를 키로 .cache/rollup/ 에 저장하고, 파일 내용이 같으면 다시 읽지 않고 재사용합니다.
+- 데이터 행 라벨에 맞춘 그룹 × 행 행렬을 만들어, 행렬 곱 한 번으로 모든 법인/기간/측정값의 그룹 합계를 계산합니다.
+
+사용 예:
+    mapping = load_mapping("재무상태표_맵핑표.csv")
+    matrix = mapping.matrix(ledger.accounts.labels, ASSET_CATEGORIES)
+    totals = ledger.rollup(matrix)
+"""
+
+import csv
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from column_layout import SUBJECT_LABEL
+from profiling import traced
+
+# 로컬 캐시 폴더 (빌드 산출물 아님, git 제외)
+CACHE_DIR = Path(__file__).parent / ".cache"
+ROLLUP_CACHE_DIR = CACHE_DIR / "rollup"
+
+# 컴파일 형식이 바뀌면 올려서 이전 캐시를 무시
+COMPILE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CompiledMapping:
+    """컴파일된 맵핑표: accounts[k] → groups[group_index[k]]"""
+    digest: str                   # 맵핑 파일 SHA-256
+    accounts: Tuple[str, ...]     # 맵핑표 계정명 (앞뒤 공백 제거, 첫 등장 순서)
+    groups: Tuple[str, ...]       # 그룹명 (첫 등장 순서)
+    group_index: np.ndarray       # 희소 행렬의 행 (계정 k의 그룹 인덱스)
+    account_index: np.ndarray     # 희소 행렬의 열 (계정 인덱스)
+
+    def as_dict(self) -> Dict[str, str]:
+        """{계정명: 그룹명}"""
+        return {self.accounts[a]: self.groups[g] for g, a in zip(self.group_index.tolist(), self.account_index.tolist())}
+
+    def matrix(self, labels: Sequence[Optional[str]], group_order: Sequence[str],
+               group_map: Optional[Dict[str, str]] = None,
+               key: Optional[Callable[[str], str]] = None,
+               first_match: bool = False) -> np.ndarray:
+        """
+        데이터 행 라벨에 맞춘 그룹 × 행 행렬 (int64, 원소는 해당 행이 그룹에 더해지는 횟수)
+        labels: 데이터 행 라벨 (None은 집계 제외)
+        group_order: 결과 행 순서 (목록에 없는 그룹은 버림)
+        group_map: 맵핑표 그룹명 → 결과 그룹명 변환 (예: 'Ⅰ.매출액' → '매출액'). 없으면 그대로 사용
+        key: 맵핑표 계정명과 데이터 라벨 비교 키 (예: 공백 제거). 없으면 앞뒤 공백만 제거
+        first_match: True면 같은 키의 데이터 행 중 첫 행만 사용 (정산표 시트처럼 라벨이 반복되는 경우)
+        """
+        key = key or str.strip
+        out_index = {name: i for i, name in enumerate(group_order)}
+        if group_map is None:
+            targets = [out_index.get(group, -1) for group in self.groups]
+        else:
+            targets = [out_index.get(group_map.get(group.strip()), -1) for group in self.groups]
+
+        by_key: Dict[str, list] = {}
+        for g, a in zip(self.group_index.tolist(), self.account_index.tolist()):
+            if targets[g] >= 0:
+                by_key.setdefault(key(self.accounts[a]), []).append(targets[g])
+
+        rows, cols = [], []
+        seen = set()
+        for i, label in enumerate(labels):
+            if label is None:
+                continue
+            k = key(label)
+            if first_match:
+                if k in seen:
+                    continue
+                seen.add(k)
+            for target in by_key.get(k, ()):
+                rows.append(target)
+                cols.append(i)
+
+        matrix = np.zeros((len(group_order), len(labels)), dtype=np.int64)
+        np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1)
+        return matrix
+
+
+@traced('rollup')
+def rollup(matrix: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """values[행, ...] 를 그룹 × 행 행렬로 합산한 totals[그룹, ...] (행렬 곱 한 번)"""
+    flat = values.reshape(values.shape[0], -1)
+    return (matrix.astype(values.dtype, copy=False) @ flat).reshape((matrix.shape[0],) + values.shape[1:])
+
+
+def compile_mapping(data: bytes, digest: str) -> CompiledMapping:
+    """
+    맵핑 CSV 바이트 → CompiledMapping
+    - 첫 행(제목)과 '과  목' 행, 그룹이 비어 있는 행(소계/제목)은 제외
+    - 같은 계정이 여러 번 나오면 마지막 그룹을 사용 (dict 로 읽던 기존 동작과 동일)
+    """
+    reader = csv.reader(io.StringIO(data.decode('utf-8-sig')))
+    next(reader, None)
+
+    mapping: Dict[str, str] = {}
+    for row in reader:
+        if len(row) < 2:
+            continue
+        src, grp = row[0].strip(), row[1].strip()
+        if not src or not grp or SUBJECT_LABEL.match(src):
+            continue
+        mapping[src] = grp
+
+    accounts = tuple(mapping)
+    groups = tuple(dict.fromkeys(mapping.values()))
+    group_codes = {group: g for g, group in enumerate(groups)}
+    return CompiledMapping(
+        digest=digest,
+        accounts=accounts,
+        groups=groups,
+        group_index=np.array([group_codes[mapping[a]] for a in accounts], dtype=np.intp),
+        account_index=np.arange(len(accounts), dtype=np.intp),
+    )
+
+
+def _cache_path(mapping_path: Path, digest: str) -> Path:
+    return ROLLUP_CACHE_DIR / f"{mapping_path.stem}-v{COMPILE_VERSION}-{digest[:16]}.npz"
+
+
+def _load_cached(path: Path, digest: str) -> Optional[CompiledMapping]:
+    try:
+        with np.load(path) as npz:
+            if str(npz['digest']) != digest:
+                return None
+            return CompiledMapping(
+                digest=digest,
+                accounts=tuple(npz['accounts'].tolist()),
+                groups=tuple(npz['groups'].tolist()),
+                group_index=npz['group_index'].astype(np.intp),
+                account_index=npz['account_index'].astype(np.intp),
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_cached(path: Path, compiled: CompiledMapping):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            digest=np.array(compiled.digest),
+            accounts=np.array(compiled.accounts, dtype=str),
+            groups=np.array(compiled.groups, dtype=str),
+            group_index=compiled.group_index,
+            account_index=compiled.account_index,
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # 캐시는 선택 사항 (읽기 전용 환경 등)
+
+
+_compiled: Dict[str, CompiledMapping] = {}
+
+
+def load_mapping(mapping_path) -> CompiledMapping:
+    """맵핑 CSV를 컴파일해 반환 (프로세스 내 → 디스크 캐시 → 컴파일 순서로 조회)"""
+    path = Path(mapping_path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+
+    compiled = _compiled.get(digest)
+    if compiled is not None:
+        return compiled
+
+    cache_path = _cache_path(path, digest)
+    compiled = _load_cached(cache_path, digest)
+    if compiled is None:
+        compiled = compile_mapping(data, digest)
+        _save_cached(cache_path, compiled)
+
+    _compiled[digest] = compiled
+    return compiled
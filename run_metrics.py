@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+실행 지표 (JSON lines)
+- 스크립트는 기본으로 조용히 실행하고(진행 출력 없음), 단계(stage)마다 지표 한 줄을 .cache/metrics.jsonl 에 덧붙입니다.
+  {"run": 실행 ID, "script": 스크립트, "stage": 단계, "time": 시작 시각,
+   "rows_scanned": 훑은 행, "rows_matched": 계정 맵핑된 행, "cells_parsed": 숫자로 변환한 셀, "bytes_read": 읽은 원본 바이트,
+   "duration_ms": 소요 시간, "peak_rss_kb": 프로세스 최대 RSS (resource 모듈이 없는 Windows 는 null)}
+- 하위 단계의 수치는 바깥 단계에 합산되고, 실행 전체도 stage='total' 한 줄로 남습니다.
+- 같은 실행(build_pipeline 과 그 타깃들)은 같은 run ID 를 씁니다.
+- 기록할 단계가 없으면(세션 밖, 예: 다른 모듈에서 함수만 호출) stage/count 는 아무것도 하지 않고, verbose() 는 True.
+- 진행 출력은 호출하는 곳에서 verbose() 로 확인한 뒤에만 만들고(조용히 실행하면 문자열도 만들지 않음), 경고/오류는 항상 stderr 로 출력.
+
+명령줄 (run_main 을 쓰는 스크립트와 build_pipeline 공통):
+    --verbose        예전처럼 진행 상황 출력
+    --js             대시보드에 붙여 넣을 JavaScript 코드 출력 (parse_financial_data, parse_csv_to_json)
+    --metrics PATH   지표 파일 변경
+    --no-metrics     지표 파일을 쓰지 않음
+
+사용 예:
+    with stage('extract', file=path.name):
+        count(rows_scanned=len(source) - 1, rows_matched=len(rows))
+        if verbose():
+            print(f"  발견: {label}")
+
+    with counter() as counts:                     # 작업 프로세스: 지표를 기록하지 않고 모아서 돌려줌
+        source = load_source(path)
+    count(**counts)                               # 메인 프로세스: 현재 단계에 합산
+
+    python -c "import json; [print(json.loads(l)) for l in open('.cache/metrics.jsonl', encoding='utf-8')]"
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+METRICS_FILE = Path(__file__).parent / ".cache" / "metrics.jsonl"
+
+# 기록 순서 (값이 없는 항목도 0으로 남김)
+COUNTERS = ('rows_scanned', 'rows_matched', 'cells_parsed', 'bytes_read')
+
+
+class _Run:
+    """현재 실행 (스크립트 하나)"""
+    __slots__ = ('run_id', 'script', 'path', 'verbose', 'js', 'records')
+
+    def __init__(self, run_id: str, script: str, path: Optional[Path], verbose: bool, js: bool):
+        self.run_id = run_id
+        self.script = script
+        self.path = path
+        self.verbose = verbose
+        self.js = js
+        self.records = 0
+
+
+class _Stage:
+    __slots__ = ('name', 'fields', 'counts', 'record', 'start', 'started_at')
+
+    def __init__(self, name: str, fields: Optional[dict], record: bool):
+        self.name = name
+        self.fields = fields
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.record = record
+
+
+# 실행 중인 세션 (None 이면 stage 는 no-op)
+_run: Optional[_Run] = None
+# 열린 단계 (안쪽이 마지막). counter() 는 세션이 없어도 쌓임
+_stages: List[_Stage] = []
+
+
+def peak_rss_kb() -> Optional[int]:
+    """프로세스 최대 RSS (KB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak   # macOS 는 바이트 단위
+
+
+def verbose() -> bool:
+    """진행 출력 여부 (세션 밖에서는 예전처럼 출력)"""
+    return _run is None or _run.verbose
+
+
+def js() -> bool:
+    """JavaScript 코드 출력 여부"""
+    return _run is not None and _run.js
+
+
+def count(**counts: int):
+    """현재 단계에 수치 더하기 (열린 단계가 없으면 무시)"""
+    if _stages:
+        target = _stages[-1].counts
+        for key, value in counts.items():
+            target[key] = target.get(key, 0) + value
+
+
+def _write(record: Dict[str, Any]):
+    path = _run.path
+    if path is None:
+        return
+    _run.records += 1
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 한 줄을 한 번에 append (같은 파일에 쓰는 작업 프로세스끼리 줄이 섞이지 않음)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass  # 지표는 선택 사항 (읽기 전용 환경 등)
+
+
+@contextmanager
+def _open_stage(name: str, fields: Optional[dict], record: bool) -> Iterator[_Stage]:
+    current = _Stage(name, fields, record)
+    current.started_at = time.time()
+    current.start = time.perf_counter()
+    _stages.append(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - current.start
+        _stages.remove(current)
+        if record:
+            if _stages:
+                count(**current.counts)
+            if _run is not None:
+                entry = {
+                    'run': _run.run_id,
+                    'script': _run.script,
+                    'stage': name,
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(current.started_at)),
+                }
+                entry.update(current.fields or {})
+                entry.update(current.counts)
+                entry['duration_ms'] = round(duration * 1000, 3)
+                entry['peak_rss_kb'] = peak_rss_kb()
+                if error:
+                    entry['error'] = error
+                _write(entry)
+
+
+def stage(name: str, **fields):
+    """단계 하나를 지표 한 줄로 기록 (fields 는 그대로 덧붙임, 예: file=...). 세션 밖이면 no-op"""
+    if _run is None:
+        return contextlib.nullcontext()
+    return _open_stage(name, fields or None, record=True)
+
+
+@contextmanager
+def counter() -> Iterator[Dict[str, int]]:
+    """
+    수치만 모으는 구간 (기록하지 않고 바깥 단계에도 더하지 않음) → 모은 수치 dict
+    프로세스 풀 작업이 결과와 함께 돌려주고, 메인 프로세스가 count(**counts) 로 합산
+    """
+    with _open_stage('', None, record=False) as current:
+        yield current.counts
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+
+@contextmanager
+def session(script: str, verbose: bool = False, js: bool = False, path: Optional[Path] = METRICS_FILE,
+            run_id: Optional[str] = None):
+    """
+    script 이름으로 지표를 남기는 실행 구간 (전체는 stage='total')
+    verbose=False 면 스크립트가 진행 출력을 건너뜀 (호출하는 곳에서 verbose() 로 확인, 오류/경고는 stderr 로 항상 출력)
+    run_id: 없으면 바깥 세션(같은 프로세스 또는 fork 한 부모)의 ID, 그것도 없으면 새로 만듦
+    """
+    global _run
+    previous = _run
+    if run_id is None:
+        run_id = previous.run_id if previous is not None else new_run_id()
+    run = _run = _Run(run_id, script, Path(path) if path is not None else None, verbose, js)
+    t0 = time.perf_counter()
+    try:
+        with _open_stage('total', None, record=True):
+            yield run
+    finally:
+        _run = previous
+        if run.path is not None:
+            print(f"  [지표] {run.path} ({script}: {run.records}줄, {(time.perf_counter() - t0) * 1000:.1f}ms)")
+
+
+# ============================================
+# 명령줄 옵션
+# ============================================
+
+def add_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("실행 지표")
+    group.add_argument("--verbose", "-v", action="store_true", help="진행 상황 출력 (기본: 조용히 지표만 기록)")
+    group.add_argument("--js", action="store_true", help="대시보드에 붙여 넣을 JavaScript 코드 출력")
+    group.add_argument("--metrics", type=Path, default=METRICS_FILE, help="지표(JSON lines) 파일")
+    group.add_argument("--no-metrics", action="store_true", help="지표 파일을 쓰지 않음")
+
+
+def options(args: argparse.Namespace) -> Dict[str, Any]:
+    """add_arguments 로 받은 값 → session 인자 (--js 는 출력이므로 verbose 도 켬)"""
+    return {
+        'verbose': args.verbose or args.js,
+        'js': args.js,
+        'path': None if args.no_metrics else args.metrics,
+    }
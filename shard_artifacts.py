@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+기간별 데이터 조각(shard) + 목록(manifest) 생성
+- 파이프라인이 만든 대시보드 JSON(재무제표별 출력)을 분기별 조각으로 나눠 public/data/shards/ 에 씁니다.
+  대시보드는 목록(public/data/manifest.json)을 읽고, 선택 기간과 비교 기간 조각만 받아옵니다 (dataShards.js).
+- 분기 'YYYY_NQ' 조각에는 그 분기의 기간 키('YYYY_NQ', 'YYYY_NQ_Year' / 4분기는 'YYYY_Year', 'YYYY_NQ_LTM')만 남기고,
+  원본 구조(계정/법인 등 다른 단계)는 그대로 둡니다. 조각들을 깊은 병합하면 원본 JSON과 같습니다 (빌드 때 확인).
+- 조각 파일명에 내용 SHA-256을 넣어, 내용이 그대로인 조각은 이름도 그대로입니다 → CDN에서 영구 캐시 (netlify.toml / vercel.json).
+  목록 파일만 매번 재검증합니다. 목록에 없는 이전 조각은 지웁니다.
+
+사용법:
+    python shard_artifacts.py     # (build_pipeline.py 가 다른 출력 다음에 실행)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import run_metrics
+from profiling import run_main, span
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / "public" / "data"
+SHARD_DIR = DATA_DIR / "shards"
+MANIFEST_FILE = DATA_DIR / "manifest.json"
+
+# 목록/조각 형식이 바뀌면 올림 (dataShards.js 의 MANIFEST_VERSION 과 같아야 함)
+MANIFEST_VERSION = 1
+
+# 조각으로 나눌 재무제표 출력 (이름 → 스크립트 폴더 기준 경로)
+STATEMENTS = {
+    'bs_financial_data': 'bs_financial_data.json',
+    'entity_bs_data': 'entity_bs_data.json',
+    'entity_is_data': 'entity_is_data.json',
+    'financial_detail_data': 'financial_detail_data.json',
+    'is_data': 'is_data.json',
+}
+
+# 파일명에 넣을 내용 해시 길이
+HASH_CHARS = 12
+
+_PERIOD_KEY = re.compile(r'^(\d{4})_(?:([1-4])Q(?:_Year|_LTM)?|Year)$')
+
+# 조각에 없는 값 표시
+_MISSING = object()
+
+
+def quarter_of(key: str) -> Optional[str]:
+    """기간 키가 속한 분기 'YYYY_NQ' ('2025_Year' → '2025_4Q'). 기간 키가 아니면 None"""
+    m = _PERIOD_KEY.match(key)
+    if not m:
+        return None
+    return f"{m.group(1)}_{m.group(2) or 4}Q"
+
+
+def _is_period_level(node: Dict[str, Any]) -> bool:
+    return bool(node) and all(quarter_of(key) is not None for key in node)
+
+
+def quarters_in(node: Any, out: Optional[set] = None) -> set:
+    """JSON 안의 모든 기간 단계에서 나온 분기"""
+    out = set() if out is None else out
+    if isinstance(node, dict):
+        if _is_period_level(node):
+            out.update(quarter_of(key) for key in node)
+        else:
+            for value in node.values():
+                quarters_in(value, out)
+    return out
+
+
+def _filter(node: Any, quarter: str) -> Any:
+    if not isinstance(node, dict):
+        return node
+    if _is_period_level(node):
+        picked = {key: value for key, value in node.items() if quarter_of(key) == quarter}
+        return picked or _MISSING
+    out = {}
+    for key, value in node.items():
+        value = _filter(value, quarter)
+        if value is not _MISSING:
+            out[key] = value
+    return out
+
+
+def shard(data: Any, quarter: str) -> Any:
+    """분기 하나의 조각 (기간 단계는 그 분기 키만, 다른 단계는 그대로)"""
+    out = _filter(data, quarter)
+    return {} if out is _MISSING else out
+
+
+def merge(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    """깊은 병합 (dataShards.js 의 mergeShard 와 같은 규칙)"""
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_if_changed(path: Path, payload: bytes):
+    """내용이 같으면 쓰지 않음 (mtime 유지). 임시 파일에 쓰고 교체"""
+    if path.exists() and path.read_bytes() == payload:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def build_shards(statements: Dict[str, str] = STATEMENTS) -> dict:
+    """조각과 목록을 쓰고 목록 반환 (없는 출력 파일은 건너뜀)"""
+    manifest = {'version': MANIFEST_VERSION, 'periods': [], 'statements': {}}
+    keep = set()
+    periods = set()
+    for name, filename in statements.items():
+        path = BASE_DIR / filename
+        if not path.exists():
+            print(f"  건너뜀: {filename} 없음", file=sys.stderr)
+            continue
+        with run_metrics.stage('load', file=filename):
+            raw = path.read_bytes()
+            run_metrics.count(bytes_read=len(raw))
+            data = json.loads(raw)
+
+        entries = {}
+        rebuilt: Dict[str, Any] = {}
+        for quarter in sorted(quarters_in(data)):
+            part = shard(data, quarter)
+            with span('serialize', file=name, quarter=quarter):
+                payload = _dumps(part)
+            digest = hashlib.sha256(payload).hexdigest()[:HASH_CHARS]
+            shard_name = f"{name}.{quarter}.{digest}.json"
+            write_if_changed(SHARD_DIR / shard_name, payload)
+            keep.add(shard_name)
+            entries[quarter] = {'path': f"shards/{shard_name}", 'bytes': len(payload)}
+            merge(rebuilt, json.loads(payload))
+
+        # 조각을 모두 합치면 원본과 같아야 함 (기간 키 순서는 무관)
+        if _canonical(rebuilt) != _canonical(data):
+            raise ValueError(f"{filename}: 분기 조각을 합친 결과가 원본과 다릅니다")
+
+        manifest['statements'][name] = entries
+        periods.update(entries)
+        if run_metrics.verbose():
+            full = len(_dumps(data))
+            largest = max((entry['bytes'] for entry in entries.values()), default=0)
+            print(f"  {filename:<28} {full:>8,}B → 조각 {len(entries)}개 (최대 {largest:,}B)")
+
+    manifest['periods'] = sorted(periods)
+    for old in SHARD_DIR.glob('*.json') if SHARD_DIR.exists() else ():
+        if old.name not in keep:
+            old.unlink()
+    write_if_changed(MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+    return manifest
+
+
+def _canonical(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+
+def main():
+    verbose = run_metrics.verbose()
+    if verbose:
+        print("기간별 데이터 조각 생성...")
+    manifest = build_shards()
+    if verbose:
+        print(f"\n목록: {MANIFEST_FILE.relative_to(BASE_DIR)} (분기 {len(manifest['periods'])}개, "
+              f"재무제표 {len(manifest['statements'])}개)")
+
+
+if __name__ == "__main__":
+    run_main("shard_artifacts", main)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+합성 분기 블록 CSV 생성기 (성능 측정용)
+- 실제 원본과 같은 헤더/블록 구성의 CSV를 원하는 규모(연도, 분기, 법인, 계정 수)로 만듭니다.
+  계정명은 실제 원본의 계정명을 순환해 쓰므로 맵핑/라벨 인덱스도 실제와 같은 비율로 일치합니다.
+- 금액 셀은 실제 파일의 서식 분포를 흉내 냅니다 ('1,234', '-1,234', '(1,234)', '0', 빈칸, IS는 끝에 공백).
+
+레이아웃 (블록 하나 = 분기 하나):
+    bs15          2025_BS.csv           분기명 + 법인 + 단순합계 + 연결분개 DR/CR + Dr/Cr + 당기말 + 전기말 (15열)
+    bs13          2024_BS.csv           Dr/Cr 없는 BS (13열)
+    is17          2025_IS.csv           분기명 + 법인 + 단순합계 + 연결조정분개 2열 + 누적/전분기 누적/당분기 × 당해/전년 (17열)
+    entity_is14   2025_분기IS_법인별.csv  분기명 + 법인 + 단순합계 + 연결조정분개 2열 + 누적/전분기 누적/당분기 연결 (14열)
+    is_settlement 정산표 IS 내보내기      제목 행 + '과  목' 블록 헤더 (extract_entity_is_data 입력)
+
+사용법:
+    python synthetic_csv.py out/ --layouts bs15 is17 --years 2 --accounts 5000 --encoding cp949
+"""
+
+import argparse
+import csv
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from csv_source import read_rows
+
+BASE_DIR = Path(__file__).parent
+
+LAYOUTS = ('bs15', 'bs13', 'is17', 'entity_is14', 'is_settlement')
+ENCODINGS = ('cp949', 'utf-8-sig')
+
+# 계정명을 빌려올 실제 원본 (레이아웃 → 파일)
+LABEL_SOURCES = {
+    'bs15': BASE_DIR / "2025_BS.csv",
+    'bs13': BASE_DIR / "2024_BS.csv",
+    'is17': BASE_DIR / "2025_IS.csv",
+    'entity_is14': BASE_DIR / "2025_분기IS_법인별.csv",
+    'is_settlement': BASE_DIR / "2025_IS.csv",
+}
+
+# 실제 헤더의 법인 표기 (법인 수를 늘리면 '신규법인NN' 을 뒤에 추가)
+ENTITY_HEADERS = ['F&F', 'F&F Shanghai', 'FnF HONGKONG', 'F&F 베트남', '빅텐츠', '엔터테인먼트', '세르지오']
+IS_ENTITY_HEADERS = ['F&F', 'F&F Shanghai', 'FnF HONGKONG', 'F&F 베트남', '빅텐츠', '엔터테인머트', '세르지오']
+SETTLEMENT_ENTITY_HEADERS = ['별도재무제표', 'IFRS(F&F)', 'IFRS(Shanghai)', 'IFRS(HK)', 'IFRS(베트남)',
+                             'IFRS(빅텐츠)', 'IFRS(엔터)', 'STIP', 'STO']
+
+QUARTER_END = {1: '03월 31일', 2: '06월 30일', 3: '09월 30일', 4: '12월 31일'}
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """합성 CSV 한 파일 (한 연도)"""
+    layout: str
+    year: int
+    quarters: int = 4                  # 블록 수 (1Q부터)
+    entities: Optional[int] = None     # 법인 컬럼 수 (None: 실제 헤더와 같음)
+    accounts: Optional[int] = None     # 계정 행 수 (None: 실제 원본과 같음)
+    encoding: str = 'cp949'
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.layout not in LAYOUTS:
+            raise ValueError(f"알 수 없는 레이아웃: {self.layout} (가능: {', '.join(LAYOUTS)})")
+        if self.encoding not in ENCODINGS:
+            raise ValueError(f"지원하지 않는 인코딩: {self.encoding} (가능: {', '.join(ENCODINGS)})")
+        if not 1 <= self.quarters <= 4:
+            raise ValueError(f"분기 수는 1~4: {self.quarters}")
+
+
+def _entity_headers(layout: str, count: Optional[int]) -> List[str]:
+    if layout == 'is_settlement':
+        base = SETTLEMENT_ENTITY_HEADERS
+    elif layout in ('is17', 'entity_is14'):
+        base = IS_ENTITY_HEADERS
+    else:
+        base = ENTITY_HEADERS
+    if count is None:
+        return list(base)
+    return list(base[:count]) + [f"신규법인{n:02d}" for n in range(len(base) + 1, count + 1)]
+
+
+def _block_header(layout: str, year: int, quarter: int, entities: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """(블록 헤더 셀들, 법인 뒤 컬럼 종류들) - 종류: sum / adj / blank / total"""
+    label = f"{year % 100:02d}.{quarter}Q"
+    if layout in ('bs15', 'bs13'):
+        tail = [' 단순합계 ', '연결분개 DR', '연결분개 CR'] + (['Dr', 'Cr'] if layout == 'bs15' else []) + [
+            f"{year}년 {QUARTER_END[quarter]}", f"{year - 1}년 12월 31일"]
+        kinds = ['sum', 'adj', 'adj'] + (['blank', 'blank'] if layout == 'bs15' else []) + ['total', 'total']
+        return [label] + [f" {e} " for e in entities] + tail, kinds
+    if layout == 'is17':
+        tail = [' 단순합계 ', '연결조정분개', '', f"{year}년 누적", f"{year}년 전분기 누적", f"{year}년 {quarter}분기",
+                f"{year - 1}년 누적", f"{year - 1}년 전분기 누적", f"{year - 1}년 당분기"]
+        kinds = ['sum', 'adj', 'blank'] + ['total'] * 6
+        return [label] + [f" {e} " for e in entities] + tail, kinds
+    if layout == 'entity_is14':
+        tail = [' 단순합계 ', '연결조정분개', '연결조정분개', f"{year}년 누적", f"{year}년 전분기 누적",
+                f"{year}년 {quarter}분기 연결"]
+        kinds = ['sum', 'adj', 'blank', 'total', 'total', 'total']
+        return [label] + [f" {e} " for e in entities] + tail, kinds
+    # is_settlement: '과  목' 블록 (연도는 누적 컬럼에서, 분기는 블록 순서로 결정)
+    tail = ['Dr', 'Cr', 'IFRS(단순합계)', 'Dr', 'Cr', f"{year}년 누적", f"{year}년 전분기 누적", f"{year}년 당분기"]
+    kinds = ['adj', 'adj', 'sum', 'adj', 'adj', 'total', 'total', 'total']
+    return ['과  목'] + list(entities) + tail, kinds
+
+
+def _account_labels(layout: str, count: Optional[int]) -> List[str]:
+    """실제 원본의 계정명 (count 만큼 순환)"""
+    rows, _ = read_rows(LABEL_SOURCES[layout])
+    labels = [row[0] for row in rows[1:] if row and row[0].strip()]
+    if count is None:
+        return labels
+    return [labels[i % len(labels)] for i in range(count)]
+
+
+def _format_cells(values: np.ndarray, styles: np.ndarray, trailing: str) -> List[str]:
+    """금액 → 회계 서식 문자열 (styles: 0 양수, 1 '-' 음수, 2 괄호 음수, 3 '0', 4 빈칸)"""
+    out = []
+    for value, style in zip(values.tolist(), styles.tolist()):
+        if style == 4:
+            out.append('')
+        elif style == 3:
+            out.append('0' + trailing)
+        elif style == 2:
+            out.append(f"({value:,})" + trailing)
+        elif style == 1:
+            out.append(f"-{value:,}" + trailing)
+        else:
+            out.append(f"{value:,}" + trailing)
+    return out
+
+
+def generate_rows(spec: SyntheticSpec) -> List[List[str]]:
+    """합성 CSV 행 목록 (헤더 포함)"""
+    rng = np.random.default_rng(spec.seed + spec.year)
+    entities = _entity_headers(spec.layout, spec.entities)
+    labels = _account_labels(spec.layout, spec.accounts)
+    trailing = ' ' if spec.layout != 'bs15' and spec.layout != 'bs13' else ''
+
+    header: List[str] = []
+    kinds_by_block = []
+    for quarter in range(1, spec.quarters + 1):
+        cells, kinds = _block_header(spec.layout, spec.year, quarter, entities)
+        header.extend(cells)
+        kinds_by_block.append(kinds)
+
+    # 셀 서식 비율 (실제 BS/IS 파일 기준): 양수 60%, '-' 음수 7%, 괄호 음수 3%, '0' 30%
+    n_rows, n_entities = len(labels), len(entities)
+    rows = []
+    for label in labels:
+        row = []
+        for kinds in kinds_by_block:
+            amounts = (10 ** rng.uniform(5, 12, size=n_entities)).astype(np.int64)
+            styles = rng.choice(4, size=n_entities, p=[0.6, 0.07, 0.03, 0.3])
+            signed = np.where(styles == 3, 0, np.where(styles == 0, amounts, -amounts))
+            total = int(signed.sum())
+            tail_values, tail_styles = [], []
+            for kind in kinds:
+                if kind == 'blank' or (kind == 'adj' and rng.random() < 0.7):
+                    tail_values.append(0)
+                    tail_styles.append(4)
+                    continue
+                value = total if kind == 'sum' else int(total * rng.uniform(0.6, 1.0)) if kind == 'total' \
+                    else int(amounts[0] * rng.uniform(0, 0.2))
+                tail_values.append(abs(value))
+                tail_styles.append(3 if value == 0 else 1 if value < 0 else 0)
+            row.append(label)
+            row.extend(_format_cells(amounts, styles, trailing))
+            row.extend(_format_cells(np.array(tail_values, dtype=np.int64), np.array(tail_styles), trailing))
+        rows.append(row)
+
+    if spec.layout == 'is_settlement':
+        # 정산표 내보내기는 제목 행 다음 줄이 블록 헤더
+        title = [f"{spec.year}년 손익계산서 정산표"] + [''] * (len(header) - 1)
+        return [title, header] + rows
+    return [header] + rows
+
+
+def write_csv(path, spec: SyntheticSpec) -> int:
+    """spec 대로 CSV를 써서 계정 행 수 반환"""
+    rows = generate_rows(spec)
+    out = io.StringIO()
+    csv.writer(out).writerows(rows)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(out.getvalue().encode(spec.encoding))
+    return len(rows) - (2 if spec.layout == 'is_settlement' else 1)
+
+
+def write_dataset(out_dir, layouts: Sequence[str] = LAYOUTS, years: int = 2, quarters: int = 4,
+                  entities: Optional[int] = None, accounts: Optional[int] = None,
+                  encoding: str = 'cp949', seed: int = 0, last_year: int = 2025) -> Dict[str, List[Path]]:
+    """레이아웃별로 연도마다 한 파일씩 (<연도>_<레이아웃>.csv) 써서 {레이아웃: 경로들} 반환"""
+    out_dir = Path(out_dir)
+    written: Dict[str, List[Path]] = {}
+    for layout in layouts:
+        for year in range(last_year - years + 1, last_year + 1):
+            path = out_dir / f"{year}_{layout}.csv"
+            write_csv(path, SyntheticSpec(layout, year, quarters, entities, accounts, encoding, seed))
+            written.setdefault(layout, []).append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 분기 블록 CSV 생성")
+    parser.add_argument("out_dir", help="출력 폴더")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--years", type=int, default=2, help="연도 수 (마지막 연도 2025)")
+    parser.add_argument("--quarters", type=int, default=4, help="연도별 분기 블록 수 (1~4)")
+    parser.add_argument("--entities", type=int, default=None, help="법인 컬럼 수 (기본: 실제 헤더와 같음)")
+    parser.add_argument("--accounts", type=int, default=None, help="계정 행 수 (기본: 실제 원본과 같음)")
+    parser.add_argument("--encoding", choices=ENCODINGS, default='cp949')
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    written = write_dataset(args.out_dir, args.layouts, args.years, args.quarters, args.entities,
+                            args.accounts, args.encoding, args.seed)
+    for layout, paths in written.items():
+        for path in paths:
+            print(f"  {layout:<14} {path} ({path.stat().st_size:,}B)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""테스트에서 저장소 루트의 스크립트 모듈을 import 할 수 있게 경로 추가"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
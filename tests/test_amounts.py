@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""amounts.parse_won_array 가 셀 단위 parse_won 과 같은 결과를 내는지 확인"""
+import random
+
+import numpy as np
+import pytest
+
+from amounts import ROUNDING_MODES, parse_won, parse_won_array
+
+CELLS = ['', ' ', ',', '"', '-', '(', ')', '0', '1,234', '(1,234)', '-1,234', ' 12 ', '"3,000"', '1.5', '(2.5)',
+         '#REF!', '1-2', '((1))', '9' * 19, '-' + '9' * 18, 1234, 12.7, -0.5, None]
+
+
+@pytest.mark.parametrize('cell', CELLS)
+def test_single_cell(cell):
+    assert parse_won_array([cell]).tolist() == [parse_won(cell)]
+
+
+def test_empty():
+    assert parse_won_array([]).dtype == np.int64
+    assert parse_won_array([]).size == 0
+
+
+@pytest.mark.parametrize('rounding', ROUNDING_MODES)
+def test_random_batches(rounding):
+    rng = random.Random(0)
+    text_cells = [c for c in CELLS if isinstance(c, str)]
+    for _ in range(500):
+        batch = [rng.choice(text_cells) for _ in range(rng.randint(1, 8))]
+        assert parse_won_array(batch, rounding).tolist() == [parse_won(c, rounding) for c in batch]
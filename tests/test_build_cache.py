@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""build_cache: 블록 지문 무효화, 스냅샷 위치 지문, 프로세스 내 LRU, 쓰지 않는 블록 정리"""
+import pytest
+
+import build_cache
+
+HEADER = ('25.1Q, F&F , F&F Shanghai , 단순합계 ,연결분개 DR,연결분개 CR,2025년 03월 31일,2024년 12월 31일,'
+          '25.2Q, F&F , F&F Shanghai , 단순합계 ,연결분개 DR,연결분개 CR,2025년 06월 30일,2024년 12월 31일')
+
+
+def write_csv(path, cash_2q):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('\n'.join([
+        HEADER,
+        '현금및현금성자산,"1,000",200,"1,200",0,0,"1,200",900,'
+        f'현금및현금성자산,{cash_2q},300,0,0,0,{cash_2q},900',
+    ]) + '\n', encoding='utf-8')
+    return path
+
+
+@pytest.fixture(autouse=True)
+def cache_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_cache, 'SOURCE_CACHE_DIR', tmp_path / 'cache' / 'sources')
+    monkeypatch.setattr(build_cache, 'BLOCK_CACHE_DIR', tmp_path / 'cache' / 'blocks')
+    build_cache.clear_cache()
+    yield
+    build_cache.clear_cache()
+
+
+def cash(source, col):
+    return int(source.row('현금및현금성자산')[col])
+
+
+def test_unchanged_file_reuses_snapshot(tmp_path):
+    path = write_csv(tmp_path / 'bs.csv', 2_000)
+    first = build_cache.load_source(path)
+    assert first.reparsed == ('25.1Q', '25.2Q')
+
+    build_cache._loaded.clear()   # 새 프로세스처럼 파일 스냅샷에서 재조립
+    again = build_cache.load_source(path)
+    assert again.reparsed == ()
+    assert again.block_digests == first.block_digests
+    assert (again.values == first.values).all()
+
+
+def test_changed_block_is_reparsed_alone(tmp_path):
+    path = write_csv(tmp_path / 'bs.csv', 2_000)
+    first = build_cache.load_source(path)
+
+    write_csv(path, 2_500)
+    changed = build_cache.load_source(path)
+    assert changed.reparsed == ('25.2Q',)
+    assert changed.block_digests[0] == first.block_digests[0]
+    assert changed.block_digests[1] != first.block_digests[1]
+    assert cash(changed, 9) == 2_500
+    assert cash(changed, 1) == cash(first, 1) == 1_000
+
+
+def test_same_block_content_is_shared_across_files(tmp_path):
+    build_cache.load_source(write_csv(tmp_path / 'a.csv', 2_000))
+    other = build_cache.load_source(write_csv(tmp_path / 'b.csv', 7_000))
+    assert other.reparsed == ('25.2Q',)   # 1분기 블록은 a.csv 가 저장한 블록 사용
+    assert cash(other, 9) == 7_000
+
+
+def test_corrupt_block_falls_back_to_parse(tmp_path):
+    path = write_csv(tmp_path / 'bs.csv', 2_000)
+    first = build_cache.load_source(path)
+    build_cache._block_path(first.block_digests[1]).write_bytes(b'not a npy file')
+
+    build_cache._loaded.clear()
+    again = build_cache.load_source(path)
+    assert again.reparsed == ('25.2Q',)   # 스냅샷 재조립이 실패하면 CSV를 다시 읽고, 읽을 수 있는 블록은 그대로 사용
+    assert (again.values == first.values).all()
+
+
+def test_same_name_in_two_folders_keeps_both_snapshots(tmp_path):
+    first = write_csv(tmp_path / 'a' / 'bs.csv', 2_000)
+    second = write_csv(tmp_path / 'b' / 'bs.csv', 3_000)
+    sources = [build_cache.load_source(path) for path in (first, second)]
+
+    assert len(list(build_cache.SOURCE_CACHE_DIR.glob('bs-*.npz'))) == 2
+    for path, source in zip((first, second), sources):
+        assert build_cache._load_snapshot(path.resolve(), source.digest) is not None
+
+
+def test_prune_drops_blocks_no_snapshot_uses(tmp_path):
+    path = write_csv(tmp_path / 'bs.csv', 2_000)
+    build_cache.load_source(path)
+    before = {block.name for block in build_cache.BLOCK_CACHE_DIR.glob('*.npy')}
+
+    write_csv(path, 2_500)   # 2분기 블록만 바뀜
+    source = build_cache.load_source(path)
+    assert source.reparsed == ('25.2Q',)
+    assert build_cache.prune_blocks() == 1
+
+    after = {block.name for block in build_cache.BLOCK_CACHE_DIR.glob('*.npy')}
+    assert after == {build_cache._block_path(digest).name for digest in source.block_digests}
+    assert len(before & after) == 1   # 1분기 블록은 그대로 재사용
+
+
+def test_loaded_sources_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_cache, 'MAX_LOADED', 2)
+    paths = [write_csv(tmp_path / f'bs{i}.csv', 2_000 + i) for i in range(3)]
+    for path in paths:
+        build_cache.load_source(path)
+    assert list(build_cache._loaded) == [str(p.resolve()) for p in paths[1:]]
+
+    write_csv(paths[2], 9_000)   # 내용이 바뀐 경로는 항목을 교체
+    build_cache.load_source(paths[2])
+    assert len(build_cache._loaded) == 2
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""build_pipeline: 타깃별 코드 지문 (import 하는 로컬 모듈), 입력/코드가 바뀔 때만 다시 빌드"""
+import sys
+
+import pytest
+
+import build_pipeline
+from build_pipeline import Target
+
+
+def write_modules(base, sources):
+    for name, text in sources.items():
+        (base / f"{name}.py").write_text(text, encoding='utf-8')
+
+
+def test_local_imports_follow_lazy_and_from_imports(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_pipeline, 'BASE_DIR', tmp_path)
+    write_modules(tmp_path, {
+        'target': 'import json\nfrom helper import VALUE\n\ndef main():\n    import lazy   # 지연 import\n',
+        'helper': 'from shared import write\nVALUE = 1\n',
+        'lazy': 'import os.path\n',
+        'shared': 'def write():\n    pass\n',
+        'unrelated': 'X = 1\n',
+    })
+    assert build_pipeline.local_imports('target') == ['helper', 'lazy', 'shared', 'target']
+
+
+def test_code_digest_changes_with_imported_module_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_pipeline, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(build_pipeline, 'INGEST_MODULES', ())
+    write_modules(tmp_path, {
+        'columnar': 'from shards import STATEMENTS\n',
+        'shards': "STATEMENTS = {'bs': 'bs.json'}\n",
+        'other': 'Y = 2\n',
+    })
+    before = build_pipeline.code_digest('columnar')
+
+    write_modules(tmp_path, {'other': 'Y = 3\n'})
+    assert build_pipeline.code_digest('columnar') == before
+
+    write_modules(tmp_path, {'shards': "STATEMENTS = {'bs': 'bs.json', 'is': 'is.json'}\n"})
+    assert build_pipeline.code_digest('columnar') != before
+
+
+def test_columnar_target_tracks_shard_artifacts():
+    assert 'shard_artifacts' in build_pipeline.local_imports('columnar_artifact')
+
+
+# 입력 a.txt → 첫 타깃 → first.json → 둘째 타깃 → second.json
+PIPELINE_MODULES = {
+    'pipe_first': (
+        'import json\nfrom pipe_helper import SCALE\n\n'
+        'def main():\n'
+        '    value = int(open("a.txt", encoding="utf-8").read())\n'
+        '    json.dump({"value": value * SCALE}, open("first.json", "w", encoding="utf-8"))\n'
+    ),
+    'pipe_second': (
+        'import json\n\n'
+        'def main():\n'
+        '    data = json.load(open("first.json", encoding="utf-8"))\n'
+        '    json.dump({"double": data["value"] * 2}, open("second.json", "w", encoding="utf-8"))\n'
+    ),
+    'pipe_helper': 'SCALE = 10\n',
+}
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_pipeline, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(build_pipeline, 'INGEST_MODULES', ())
+    monkeypatch.setattr(build_pipeline, 'LOG_DIR', tmp_path / 'logs')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    write_modules(tmp_path, PIPELINE_MODULES)
+    (tmp_path / 'a.txt').write_text('4', encoding='utf-8')
+    targets = [
+        Target('second', 'pipe_second', lambda: ([tmp_path / 'first.json'], tmp_path / 'second.json')),
+        Target('first', 'pipe_first', lambda: ([tmp_path / 'a.txt'], tmp_path / 'first.json')),
+    ]
+    stamps = {}
+
+    def build(force=False):
+        for name in PIPELINE_MODULES:   # 빌드마다 새 프로세스처럼 스크립트를 다시 import
+            sys.modules.pop(name, None)
+        waves = build_pipeline.make_plan(targets, stamps, force)
+        status = {plan.target.name: plan.status for wave in waves for plan in wave}
+        times = build_pipeline.execute(waves, stamps, 1, metrics={'path': None})
+        assert not [t for t in times if t.status == '실패'], times
+        return status
+
+    return tmp_path, build
+
+
+def test_pipeline_skips_until_input_changes(pipeline):
+    base, build = pipeline
+    assert build() == {'first': '빌드', 'second': '빌드'}
+    assert (base / 'second.json').read_text(encoding='utf-8') == '{"double": 80}'
+
+    assert build() == {'first': '최신', 'second': '최신'}
+
+    (base / 'a.txt').write_text('5', encoding='utf-8')
+    assert build() == {'first': '빌드', 'second': '빌드'}   # 뒤 타깃도 앞 타깃 출력이 바뀌어 다시 빌드
+    assert (base / 'second.json').read_text(encoding='utf-8') == '{"double": 100}'
+    assert build() == {'first': '최신', 'second': '최신'}
+
+    assert build(force=True) == {'first': '빌드', 'second': '빌드'}
+
+
+def test_pipeline_rebuilds_when_code_or_output_changes(pipeline):
+    base, build = pipeline
+    build()
+
+    write_modules(base, {'pipe_helper': 'SCALE = 100\n'})   # 첫 타깃이 import 하는 모듈만 바뀜
+    assert build() == {'first': '빌드', 'second': '빌드'}
+    assert (base / 'second.json').read_text(encoding='utf-8') == '{"double": 800}'
+    assert build() == {'first': '최신', 'second': '최신'}   # 뒤 타깃은 다시 만든 first.json 지문으로 기록됨
+
+    (base / 'second.json').write_text('{}', encoding='utf-8')   # 출력을 손으로 고치면 다시 만듦
+    assert build() == {'first': '최신', 'second': '빌드'}
+
+    (base / 'a.txt').unlink()
+    assert build()['first'] == '입력 없음'
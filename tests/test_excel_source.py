@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+extract_is_data.extract_year_cumulative (openpyxl 스트리밍 + excel_source) 가
+이전 pandas 경로(read_excel + 헤더 텍스트 검색 + float 합산)와 같은 누적 금액을 내는지 확인
+- 작은 정산표(.xlsx)를 openpyxl 로 만들어 양쪽으로 읽습니다 (openpyxl 이 없으면 건너뜀).
+- 두 경로가 다르게 동작하는 입력(헤더가 여러 행에 나뉜 경우, 소수 금액)은 넣지 않습니다.
+"""
+from pathlib import Path
+
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+pd = pytest.importorskip('pandas')
+
+import excel_source
+import extract_is_data
+import rollup_engine
+
+ROOT = Path(__file__).resolve().parent.parent
+MAPPING_CSV = ROOT / extract_is_data.MAPPING_CSV
+
+# (계정명, 연결IS 금액) - 공백이 다른 계정명, 반복 계정명(첫 행 사용), 맵핑 없는 행, 문자열/빈 금액 포함
+ROWS = [
+    ('Ⅰ.매출액', 1_500_000_000),
+    ('제품매출', '1,200,000,000'),
+    ('상품 매출', 300_000_000.0),
+    ('Ⅱ.매출원가', '(700,000,000)'),
+    ('제품매출', 999),
+    ('맵핑에 없는 계정', 123_456_789),
+    ('Ⅴ.영업이익', None),
+    ('Ⅹ.당기순이익', -41_234_567),
+]
+
+
+def write_workbook(path: Path):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for q, sheet_name in extract_is_data.SHEET_NAMES.items():
+        ws = workbook.create_sheet(sheet_name)
+        ws.append(['2025년 손익계산서 정산표'])
+        ws.append(['과  목', 'F&F IS', '연결 IS', '비고'])
+        for label, value in ROWS:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = value * q
+            ws.append([label, 1, value, None])
+    workbook.save(path)
+
+
+def baseline_year_cumulative(path: Path):
+    """이전 구현 (pandas): 헤더 행 텍스트를 이어 붙여 '연결IS' 컬럼 검색, 계정별 float 합산"""
+    df_map = pd.read_csv(MAPPING_CSV, encoding='utf-8')
+    mapping = {}
+    for _, row in df_map.iterrows():
+        src, grp = str(row[df_map.columns[0]]).strip(), str(row[df_map.columns[1]]).strip()
+        if src and src != 'nan' and src != '과  목' and grp and grp != 'nan':
+            mapping[src] = grp
+
+    def norm(s):
+        return str(s).replace(' ', '').replace('　', '')
+
+    result = {}
+    for q, sheet_name in extract_is_data.SHEET_NAMES.items():
+        df = pd.read_excel(path, sheet_name=sheet_name, header=None).fillna('')
+        col = df.shape[1] - 1
+        for j in range(df.shape[1]):
+            head = ''.join(str(df.iat[r, j]) for r in range(min(8, df.shape[0])))
+            if '연결IS' in head or '연결 IS' in head:
+                col = j
+                break
+        label_to_row = {}
+        for i in range(df.shape[0]):
+            label = str(df.iat[i, 0]).strip()
+            if label:
+                label_to_row.setdefault(norm(label), i)
+        quarter = {}
+        for src, group in mapping.items():
+            target = extract_is_data.GROUP_TO_ACCOUNT.get(group.strip())
+            row_idx = label_to_row.get(norm(src))
+            if not target or row_idx is None:
+                continue
+            v = df.iat[row_idx, col]
+            if isinstance(v, str):
+                v = v.replace(',', '').replace('(', '-').replace(')', '')
+            try:
+                num = float(v)
+            except ValueError:
+                num = 0.0
+            quarter[target] = quarter.get(target, 0.0) + num
+        result[q] = quarter
+    return result
+
+
+def test_matches_pandas_route(tmp_path, monkeypatch):
+    write_workbook(tmp_path / '2025 정산표(IS).xlsx')
+    monkeypatch.setattr(extract_is_data, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(extract_is_data, 'IS_FILES', {2025: '2025 정산표(IS).xlsx'})
+    monkeypatch.setattr(excel_source, 'EXCEL_CACHE_DIR', tmp_path / 'excel')
+    monkeypatch.setattr(rollup_engine, 'ROLLUP_CACHE_DIR', tmp_path / 'rollup')
+
+    mapping = extract_is_data.load_mapping(str(MAPPING_CSV))
+    current = extract_is_data.extract_year_cumulative(2025, mapping)
+    cached = extract_is_data.extract_year_cumulative(2025, mapping)   # 두 번째는 스냅샷 캐시
+    expected = baseline_year_cumulative(tmp_path / '2025 정산표(IS).xlsx')
+
+    assert current == cached
+    assert current == {q: {acc: int(v) for acc, v in accounts.items()} for q, accounts in expected.items()}
+    assert current[4]['매출액'] == 4 * (1_500_000_000 + 300_000_000) + 1_200_000_000   # 문자열 셀은 분기 배수 없음
+    assert current[4]['매출원가'] == -700_000_000
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""parse_bs_data.parse_bs_csv: csv.reader 하나로 한 번 스트리밍 (따옴표 안 줄바꿈, 짧은 행)"""
+import build_cache
+import parse_bs_data
+from ledger_store import CONSOLIDATED, LedgerBuilder
+
+HEADER = ('25.1Q, F&F , F&F Shanghai , 단순합계 ,연결분개 DR,연결분개 CR,2025년 03월 31일,2024년 12월 31일,'
+          '25.2Q, F&F , F&F Shanghai , 단순합계 ,연결분개 DR,연결분개 CR,2025년 06월 30일,2024년 12월 31일')
+
+
+def write_csv(path, lines):
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def load(path):
+    builder = LedgerBuilder()
+    parse_bs_data.parse_bs_csv(path, builder)
+    return builder.build()
+
+
+def balance(ledger, account, entity, period):
+    a, e, p = ledger.accounts.code(account), ledger.entities.code(entity), ledger.periods.code(period)
+    return int(ledger.measure('balance')[a, e, p])
+
+
+def test_quoted_newline_stays_in_one_cell(tmp_path):
+    path = write_csv(tmp_path / 'bs.csv', [
+        HEADER,
+        '현금및현금성자산,"1,000",200,"1,200",0,0,"1,200",900,'
+        '현금및현금성자산,"2,000",300,"2,300",0,0,"2,300",900',
+        '"매출채권\n(비고)","3,000",0,"3,000",0,0,"3,000",0,'
+        '"매출채권\n(비고)","4,000",0,"4,000",0,0,"4,000",0',
+        '재고자산,"(500)",50,"(450)",0,0,"(450)",0,'
+        '재고자산,600,"60",660,0,0,660,0',
+    ])
+    ledger = load(path)
+
+    assert ledger.accounts.labels == ['현금및현금성자산', '매출채권\n(비고)', '재고자산']
+    assert ledger.periods.labels == ['2025_1Q', '2025_2Q']
+    assert balance(ledger, '매출채권\n(비고)', 'F&F', '2025_2Q') == 4_000
+    assert balance(ledger, '재고자산', 'F&F', '2025_1Q') == -500
+    assert balance(ledger, '재고자산', CONSOLIDATED, '2025_2Q') == 660
+    assert balance(ledger, '현금및현금성자산', 'F&F Shanghai', '2025_2Q') == 300
+
+
+def test_short_row_and_blank_label(tmp_path):
+    path = write_csv(tmp_path / 'bs.csv', [
+        HEADER,
+        ',1,1,1,0,0,1,0,,1,1,1,0,0,1,0',      # 계정명 없는 행은 건너뜀
+        '미수금,10,20,30,0,0,30,0,미수금,11',    # 뒤 컬럼이 잘린 행은 0
+    ])
+    ledger = load(path)
+
+    assert ledger.accounts.labels == ['미수금']
+    assert balance(ledger, '미수금', 'F&F', '2025_2Q') == 11
+    assert balance(ledger, '미수금', 'F&F Shanghai', '2025_2Q') == 0
+    assert balance(ledger, '미수금', CONSOLIDATED, '2025_1Q') == 30
+
+
+def test_same_ledger_as_preloaded_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_cache, 'SOURCE_CACHE_DIR', tmp_path / 'sources')
+    monkeypatch.setattr(build_cache, 'BLOCK_CACHE_DIR', tmp_path / 'blocks')
+    paths = ['2024_BS.csv', '2025_BS.csv']
+    monkeypatch.chdir(build_cache.BASE_DIR)
+    streamed = parse_bs_data.load_bs_ledger(paths)
+    try:
+        build_cache.preload([build_cache.load_source(path) for path in paths])
+        shared = parse_bs_data.load_bs_ledger(paths)
+    finally:
+        build_cache.clear_cache()
+
+    assert streamed.accounts.labels == shared.accounts.labels
+    assert streamed.entities.labels == shared.entities.labels
+    assert (streamed.values == shared.values).all()
+    assert (streamed.present == shared.present).all()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""period_engine: 당분기 ↔ 누적 왕복, LTM(최근 4개 분기 합)과 기간 키 확장"""
+import numpy as np
+import pytest
+
+from period_engine import N_QUARTERS, PeriodAxis, expand, ltm, qtd_to_ytd, ytd_to_qtd
+from shard_artifacts import quarter_of
+
+PERIODS = PeriodAxis((2023, 2024, 2025))
+
+
+@pytest.fixture
+def qtd():
+    rng = np.random.default_rng(0)
+    return rng.integers(-10 ** 9, 10 ** 9, size=(3, 2, len(PERIODS)), dtype=np.int64)
+
+
+def hand_ltm(qtd, i):
+    """분기 i 까지 최근 4개 분기 (처음 3개 분기는 있는 분기까지만) 직접 합산"""
+    return sum(qtd[..., j] for j in range(max(0, i - N_QUARTERS + 1), i + 1))
+
+
+def test_qtd_ytd_round_trip(qtd):
+    ytd = qtd_to_ytd(qtd)
+    assert (ytd_to_qtd(ytd) == qtd).all()
+    assert (qtd_to_ytd(ytd_to_qtd(ytd)) == ytd).all()
+
+
+def test_ytd_resets_each_year(qtd):
+    ytd = qtd_to_ytd(qtd)
+    for i in range(len(PERIODS)):
+        year, _ = PERIODS.year_quarter(i)
+        first = PERIODS.index(year, 1)
+        assert (ytd[..., i] == qtd[..., first:i + 1].sum(axis=-1)).all(), PERIODS.ytd_key(i)
+
+
+def test_round_trip_other_axis(qtd):
+    moved = np.moveaxis(qtd, -1, 1)
+    ytd = qtd_to_ytd(moved, axis=1)
+    assert (np.moveaxis(ytd, 1, -1) == qtd_to_ytd(qtd)).all()
+    assert (ytd_to_qtd(ytd, axis=1) == moved).all()
+
+
+def test_partial_year_is_rejected():
+    with pytest.raises(ValueError):
+        qtd_to_ytd(np.zeros((2, 6), dtype=np.int64))
+
+
+def test_ltm_matches_hand_sum(qtd):
+    out = ltm(qtd)
+    for i in range(len(PERIODS)):
+        assert (out[..., i] == hand_ltm(qtd, i)).all(), PERIODS.quarter_key(i)
+
+
+def test_ltm_partial_window(qtd):
+    out = ltm(qtd)
+    assert (out[..., 0] == qtd[..., 0]).all()
+    assert (out[..., 2] == qtd[..., :3].sum(axis=-1)).all()
+    assert (out[..., 3] == qtd[..., :4].sum(axis=-1)).all()
+
+
+def test_ltm_other_axis(qtd):
+    moved = np.moveaxis(qtd, -1, 0)
+    assert (np.moveaxis(ltm(moved, axis=0), 0, -1) == ltm(qtd)).all()
+
+
+def test_expand_ltm_keys(qtd):
+    keys, values = expand(qtd, PERIODS, ltm_keys=True)
+    ltm_keys = [key for key in keys if key.endswith('_LTM')]
+    # 4개 분기가 채워진 2023_4Q 부터 LTM 키
+    assert ltm_keys[0] == '2023_4Q_LTM'
+    assert len(ltm_keys) == len(PERIODS) - (N_QUARTERS - 1)
+    assert keys[:8] == ['2023_1Q', '2023_1Q_Year', '2023_2Q', '2023_2Q_Year',
+                        '2023_3Q', '2023_3Q_Year', '2023_4Q', '2023_Year']
+    i = PERIODS.index(2025, 2)
+    assert (values[..., keys.index('2025_2Q_LTM')] == hand_ltm(qtd, i)).all()
+
+    plain_keys, plain = expand(qtd, PERIODS)
+    assert plain_keys == [key for key in keys if not key.endswith('_LTM')]
+    assert (plain == values[..., [keys.index(key) for key in plain_keys]]).all()
+
+
+def test_ltm_key_goes_to_its_quarter_shard():
+    assert quarter_of('2025_3Q_LTM') == '2025_3Q'
+    assert quarter_of('2025_Year') == '2025_4Q'
+    assert quarter_of('2025_LTM') is None
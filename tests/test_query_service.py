@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""query_service.QueryService.handle: 상태 코드별 응답"""
+import asyncio
+import json
+from urllib.parse import quote
+
+import pytest
+
+import build_cache
+import query_service
+from query_service import DATASETS, QueryService
+
+
+def get(service, target, headers=None):
+    return asyncio.run(service.handle('GET', target, headers or {}))
+
+
+def test_unexpected_error_is_500_json(tmp_path, monkeypatch, capsys):
+    (tmp_path / 'bs.csv').write_text('', encoding='utf-8')
+
+    def broken(self):
+        raise RuntimeError('적재 실패')
+
+    monkeypatch.setattr(query_service.Dataset, '_load', broken)
+    service = QueryService({'bs': ('bs.csv',)}, base_dir=tmp_path)
+    status, headers, body = get(service, '/slice?dataset=bs')
+
+    assert status == 500
+    assert headers['Content-Type'].startswith('application/json')
+    assert json.loads(body) == {'error': 'RuntimeError: 적재 실패'}
+    assert 'RuntimeError' in capsys.readouterr().err
+
+
+def test_load_ingests_in_process(tmp_path, monkeypatch):
+    (tmp_path / 'bs.csv').write_text('', encoding='utf-8')
+    calls = []
+
+    def fake_ingest(paths, jobs=None):
+        calls.append(jobs)
+        raise RuntimeError('중단')
+
+    monkeypatch.setattr(query_service, 'ingest', fake_ingest)
+    service = QueryService({'bs': ('bs.csv',)}, base_dir=tmp_path)
+    status, _, _ = get(service, '/datasets')
+
+    assert status == 500
+    assert calls == [1]
+
+
+@pytest.fixture
+def bs_service(tmp_path, monkeypatch):
+    """저장소의 2024/2025 BS 원본 (캐시는 tmp_path 로)"""
+    monkeypatch.setattr(build_cache, 'SOURCE_CACHE_DIR', tmp_path / 'sources')
+    monkeypatch.setattr(build_cache, 'BLOCK_CACHE_DIR', tmp_path / 'blocks')
+    yield QueryService({'bs': DATASETS['bs']}, base_dir=query_service.BASE_DIR)
+    build_cache.clear_cache()
+
+
+SLICE = '/slice?dataset=bs&account=' + quote('자산총계') + '&from=2025_1Q&to=2025_4Q&unit=million'
+
+
+def test_bad_queries_are_400(bs_service):
+    for target in ('/slice?dataset=nope',
+                   '/slice?dataset=bs&unit=usd',
+                   '/slice?dataset=bs&rules=nope',
+                   '/slice?dataset=bs&account=' + quote('없는계정'),
+                   '/slice?dataset=bs&measure=nope'):
+        status, headers, body = get(bs_service, target)
+        assert status == 400, target
+        assert 'error' in json.loads(body)
+        assert headers['Cache-Control'] == 'no-store'
+
+
+def test_unknown_path_is_404_and_post_is_405(bs_service):
+    status, _, body = get(bs_service, '/nope')
+    assert status == 404
+    assert json.loads(body) == {'error': '없는 경로: /nope'}
+
+    status, headers, _ = asyncio.run(bs_service.handle('POST', '/slice', {}))
+    assert status == 405
+    assert headers['Allow'] == 'GET, HEAD'
+
+
+def test_matching_etag_is_304(bs_service):
+    status, headers, body = get(bs_service, SLICE)
+    assert status == 200
+    etag = headers['ETag']
+    assert json.loads(body)
+
+    status, headers, body = get(bs_service, SLICE, {'if-none-match': etag})
+    assert (status, body) == (304, b'')
+    assert headers['ETag'] == etag
+    assert get(bs_service, SLICE, {'if-none-match': 'W/' + etag})[0] == 304
+    assert get(bs_service, SLICE, {'if-none-match': '"other", ' + etag})[0] == 304
+
+    other = get(bs_service, SLICE.replace('unit=million', 'unit=won'), {'if-none-match': etag})
+    assert other[0] == 200 and other[1]['ETag'] != etag
+    assert bs_service.cache.hits >= 3
+
+
+def test_missing_sources_are_503(tmp_path):
+    service = QueryService({'bs': ('no_such.csv',)}, base_dir=tmp_path)
+    status, _, body = get(service, '/slice?dataset=bs')
+    assert status == 503
+    assert 'no_such.csv' in json.loads(body)['error']
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""run_metrics.session: 조용히 실행하면 진행 출력은 만들지 않고, 경고는 stderr 로 그대로"""
+import run_metrics
+import shard_artifacts
+
+
+def build_missing(tmp_path, monkeypatch, verbose):
+    monkeypatch.setattr(shard_artifacts, 'SHARD_DIR', tmp_path / 'shards')
+    monkeypatch.setattr(shard_artifacts, 'MANIFEST_FILE', tmp_path / 'shards' / 'manifest.json')
+    with run_metrics.session('test', verbose=verbose, path=None):
+        shard_artifacts.build_shards({'bs': 'no_such_output.json'})
+
+
+def test_quiet_session_keeps_warnings_on_stderr(tmp_path, monkeypatch, capsys):
+    build_missing(tmp_path, monkeypatch, verbose=False)
+    out, err = capsys.readouterr()
+    assert out == ''
+    assert '건너뜀: no_such_output.json 없음' in err
+
+
+def test_verbose_outside_session():
+    assert run_metrics.verbose()
+    with run_metrics.session('test', verbose=False, path=None):
+        assert not run_metrics.verbose()
+    assert run_metrics.verbose()